@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Load Test and Regression Gate
+Drives the HTTP server's /mcp endpoint with hundreds of simulated clients,
+each running sessions of initialize, notifications/initialized, tools/list
+(revalidated with its ETag after the first one) and a weighted mix of
+tools/call, with think time in between, against the mock Scaleway API.
+Records p50/p95/p99 latency and error rates per operation, saves them as a
+JSON baseline, and compares a run with a baseline, failing on regressions:
+
+  python benchmarks/loadtest.py run --clients 200 --duration 30 --save benchmarks/baselines/main.json
+  python benchmarks/loadtest.py run --clients 200 --duration 30 --baseline benchmarks/baselines/main.json
+  python benchmarks/loadtest.py compare benchmarks/baselines/main.json results.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_api import Fleet, MockScalewayAPI  # noqa: E402
+from startup import ROOT  # noqa: E402
+from suite import REGION, SCENARIOS, ZONE, ServerUnderTest, parse_env, percentiles, tool_failed  # noqa: E402
+
+# Default tools/call mix: scenario name -> weight
+DEFAULT_MIX = {
+    "get_instance": 4,
+    "list_instances": 3,
+    "list_instances_page": 2,
+    "list_k8s_clusters": 1,
+    "describe_k8s_cluster": 1,
+    "get_network_members": 1,
+}
+
+# Percentiles a comparison checks
+GATED_PERCENTILES = ("p50", "p95", "p99")
+
+
+class McpConnection:
+    """A keep-alive HTTP/1.1 connection posting JSON-RPC messages to /mcp, on the event loop."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def post(self, message: dict, headers: Optional[dict] = None) -> tuple[int, dict, bytes]:
+        """Send one message and return the status, the (lower-cased) headers and the body."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            return await asyncio.wait_for(self._exchange(message, headers or {}), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _exchange(self, message: dict, headers: dict) -> tuple[int, dict, bytes]:
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        head = (
+            f"POST /mcp HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nAccept: application/json\r\nContent-Length: {len(body)}\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            + "\r\n"
+        )
+        self._writer.write(head.encode("latin-1") + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while (line := await self._reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while (size := int((await self._reader.readline()).split(b";")[0], 16)):
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            await self._reader.readline()
+            payload = b"".join(chunks)
+        else:
+            payload = await self._reader.readexactly(int(response_headers.get("content-length", 0)))
+
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, payload
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+
+class Recorder:
+    """Latency samples and errors per operation, once the warm-up is over."""
+
+    def __init__(self, record_after: float):
+        self.record_after = record_after
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.error_kinds: dict[str, int] = defaultdict(int)
+
+    def add(self, operation: str, started: float, latency: float, error: Optional[str] = None) -> None:
+        if started < self.record_after:
+            return
+        self.latencies[operation].append(latency)
+        if error is not None:
+            self.errors[operation] += 1
+            self.error_kinds[error] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        operations = {}
+        for operation in sorted(self.latencies):
+            samples = self.latencies[operation]
+            operations[operation] = {
+                "count": len(samples),
+                "errors": self.errors[operation],
+                "error_rate": round(self.errors[operation] / len(samples), 4),
+                "latency_ms": percentiles(samples),
+            }
+        samples = [latency for latencies in self.latencies.values() for latency in latencies]
+        errors = sum(self.errors.values())
+        operations["all"] = {
+            "count": len(samples),
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "latency_ms": percentiles(samples),
+        }
+        return {
+            "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else None,
+            "operations": operations,
+            "error_kinds": dict(sorted(self.error_kinds.items())),
+        }
+
+
+def classify(operation: str, status: int, payload: bytes) -> Optional[str]:
+    """Why a response counts as an error, or None if it does not."""
+    if status in (202, 304) or (status == 200 and not payload and operation.startswith("notifications/")):
+        return None
+    if status != 200:
+        return f"http_{status}"
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        return "invalid_json"
+    if "error" in message:
+        return "jsonrpc_error"
+    if operation.startswith("tools/call") and tool_failed(message):
+        return "tool_error"
+    return None
+
+
+class SimulatedClient:
+    """One MCP client running sessions until the load test ends."""
+
+    def __init__(self, index: int, args: argparse.Namespace, fleet: Fleet, recorder: Recorder, deadline: float):
+        self.index = index
+        self.args = args
+        self.fleet = fleet
+        self.recorder = recorder
+        self.deadline = deadline
+        self.random = random.Random(args.seed * 100003 + index)
+        self.catalog_etag: Optional[str] = None
+        self.next_id = 1
+
+    async def request(self, connection: McpConnection, operation: str, method: str, params: Optional[dict] = None, headers: Optional[dict] = None) -> Optional[dict]:
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        if not method.startswith("notifications/"):
+            message["id"] = self.next_id
+            self.next_id += 1
+        started = time.perf_counter()
+        try:
+            status, response_headers, payload = await connection.post(message, headers)
+        except asyncio.TimeoutError:
+            self.recorder.add(operation, started, time.perf_counter() - started, "timeout")
+            return None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            self.recorder.add(operation, started, time.perf_counter() - started, "connection")
+            return None
+        self.recorder.add(operation, started, time.perf_counter() - started, classify(operation, status, payload))
+        return {"status": status, "headers": response_headers}
+
+    async def think(self) -> None:
+        if self.args.think > 0:
+            await asyncio.sleep(self.random.expovariate(1 / self.args.think))
+
+    async def session(self, connection: McpConnection, mix: list[str], weights: list[int]) -> None:
+        await self.request(connection, "initialize", "initialize", {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": f"loadtest-{self.index}", "version": "1.0"},
+        })
+        await self.request(connection, "notifications/initialized", "notifications/initialized")
+        headers = {"If-None-Match": self.catalog_etag} if self.catalog_etag else None
+        response = await self.request(connection, "tools/list", "tools/list", headers=headers)
+        if response and response["headers"].get("etag"):
+            self.catalog_etag = response["headers"]["etag"]
+
+        for _ in range(self.args.calls_per_session):
+            if time.perf_counter() >= self.deadline:
+                return
+            await self.think()
+            scenario = self.random.choices(mix, weights)[0]
+            name, arguments = SCENARIOS[scenario](self.random.randrange(1 << 30), self.fleet)
+            await self.request(connection, f"tools/call:{scenario}", "tools/call", {"name": name, "arguments": arguments})
+
+    async def run(self, host: str, port: int, mix: list[str], weights: list[int]) -> None:
+        # Spread client arrivals over the ramp-up
+        await asyncio.sleep(self.args.ramp_up * self.index / max(self.args.clients, 1))
+        while time.perf_counter() < self.deadline:
+            # A new connection per session, as separate client processes would open
+            connection = McpConnection(host, port, self.args.timeout)
+            try:
+                await self.session(connection, mix, weights)
+            finally:
+                await connection.close()
+            await self.think()
+
+
+async def drive(args: argparse.Namespace, url: str, fleet: Fleet, mix: dict) -> dict:
+    target = urlparse(url)
+    start = time.perf_counter()
+    deadline = start + args.ramp_up + args.warm_up + args.duration
+    recorder = Recorder(record_after=start + args.ramp_up + args.warm_up)
+    clients = [SimulatedClient(index, args, fleet, recorder, deadline) for index in range(args.clients)]
+    names, weights = list(mix), list(mix.values())
+    await asyncio.gather(*(client.run(target.hostname, target.port, names, weights) for client in clients))
+    elapsed = time.perf_counter() - recorder.record_after
+    return recorder.summary(elapsed)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Start the mock API and the HTTP server (unless --url is given), apply the load and return the results."""
+    config = {
+        "clients": args.clients,
+        "duration": args.duration,
+        "warm_up": args.warm_up,
+        "ramp_up": args.ramp_up,
+        "think": args.think,
+        "calls_per_session": args.calls_per_session,
+        "mix": args.mix,
+        "seed": args.seed,
+        "fleet": args.fleet,
+        "latency": args.latency,
+        "page_size": args.page_size,
+        "env": parse_env(args.env),
+        "url": args.url,
+    }
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": config,
+    }
+
+    if args.url:
+        # Only the IDs the scenarios pick come from the fleet, which the server is assumed to hold
+        fleet = Fleet(args.fleet, networks=10, clusters=2, nodes_per_cluster=50)
+        results.update(asyncio.run(drive(args, args.url, fleet, args.mix)))
+        return results
+
+    api = MockScalewayAPI(
+        servers=args.fleet,
+        latency=args.latency,
+        max_page_size=args.page_size,
+        zones=(ZONE,),
+        regions=(REGION,),
+    ).start()
+    try:
+        with ServerUnderTest("http", api.url, config["env"], args.timeout, args.command) as server:
+            missing = sorted({SCENARIOS[scenario](0, api.fleet)[0] for scenario in args.mix} - server.tool_names())
+            if missing:
+                raise SystemExit(f"The HTTP server has no {', '.join(missing)} tool")
+            url = f"http://127.0.0.1:{server.client.port}/mcp"
+            api.reset_calls()
+            results.update(asyncio.run(drive(args, url, api.fleet, args.mix)))
+            results["peak_rss_mb"] = round(rss / 1024, 1) if (rss := server.peak_rss_kb()) is not None else None
+        upstream = api.reset_calls()
+        results["upstream_calls"] = sum(upstream.values())
+        results["upstream_by_endpoint"] = dict(sorted(upstream.items()))
+    finally:
+        api.stop()
+    return results
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.10,
+    min_delta_ms: float = 2.0,
+    max_error_rate_increase: float = 0.01,
+) -> list[str]:
+    """The regressions of ``current`` against ``baseline``, as messages (empty if none).
+
+    A percentile regresses when it grows by more than ``threshold`` (relative)
+    and by more than ``min_delta_ms``, so that noise on sub-millisecond
+    operations does not fail the gate; an error rate regresses when it grows by
+    more than ``max_error_rate_increase``.
+    """
+    regressions = []
+    for operation, before in baseline["operations"].items():
+        after = current["operations"].get(operation)
+        if after is None:
+            regressions.append(f"{operation}: missing from the current run")
+            continue
+        for name in GATED_PERCENTILES:
+            old, new = before["latency_ms"].get(name), after["latency_ms"].get(name)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta_ms:
+                regressions.append(f"{operation}: {name} {old}ms -> {new}ms (+{(new - old) / old:.0%})" if old else f"{operation}: {name} {old}ms -> {new}ms")
+        if after["error_rate"] - before["error_rate"] > max_error_rate_increase:
+            regressions.append(f"{operation}: error rate {before['error_rate']:.2%} -> {after['error_rate']:.2%}")
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    lines = [f"{'operation':<36} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for operation, stats in results["operations"].items():
+        latency = stats["latency_ms"]
+        lines.append(
+            f"{operation:<36} {stats['count']:>7} {stats['errors']:>7} {latency.get('p50', 0):>9.2f} "
+            f"{latency.get('p95', 0):>9.2f} {latency.get('p99', 0):>9.2f} {latency.get('max', 0):>9.2f}"
+        )
+    lines.append(f"throughput: {results['throughput_rps']} req/s")
+    if results.get("error_kinds"):
+        lines.append("errors: " + ", ".join(f"{kind} {count}" for kind, count in results["error_kinds"].items()))
+    if "upstream_calls" in results:
+        lines.append(f"upstream requests: {results['upstream_calls']}, peak RSS: {results.get('peak_rss_mb')} MB")
+    return "\n".join(lines)
+
+
+def format_comparison(baseline: dict, current: dict) -> str:
+    lines = [f"{'operation':<36} " + " ".join(f"{name + ' ms':>22}" for name in GATED_PERCENTILES) + f" {'error rate':>18}"]
+    for operation, before in baseline["operations"].items():
+        after = current["operations"].get(operation)
+        if after is None:
+            continue
+        cells = [
+            f"{before['latency_ms'].get(name, 0):>9.2f} -> {after['latency_ms'].get(name, 0):<9.2f}" for name in GATED_PERCENTILES
+        ]
+        lines.append(
+            f"{operation:<36} " + " ".join(f"{cell:>22}" for cell in cells)
+            + f" {before['error_rate']:>7.2%} -> {after['error_rate']:<7.2%}"
+        )
+    return "\n".join(lines)
+
+
+def gate(baseline: dict, current: dict, args: argparse.Namespace) -> int:
+    print(format_comparison(baseline, current))
+    regressions = compare(baseline, current, args.threshold, args.min_delta_ms, args.max_error_rate_increase)
+    if baseline.get("config") != current.get("config"):
+        print("\nNote: the baseline was recorded with a different configuration")
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\n✓ No regression beyond {args.threshold:.0%}")
+    return 0
+
+
+def add_gate_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative percentile increase counted as a regression (default 0.10)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Smallest absolute increase counted as a regression (default 2ms)")
+    parser.add_argument(
+        "--max-error-rate-increase",
+        type=float,
+        default=0.01,
+        help="Error rate increase counted as a regression (default 0.01)",
+    )
+
+
+def load(path: str) -> dict:
+    with open(path) as source:
+        return json.load(source)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Apply the load and report (and optionally save or gate) the results")
+    run_parser.add_argument("--clients", type=int, default=200, help="Simulated clients (default 200)")
+    run_parser.add_argument("--duration", type=float, default=20.0, help="Seconds measured (default 20)")
+    run_parser.add_argument("--warm-up", type=float, default=3.0, help="Seconds of load before measuring (default 3)")
+    run_parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds over which the clients arrive (default 2)")
+    run_parser.add_argument("--think", type=float, default=0.1, help="Mean think time in seconds between calls (default 0.1)")
+    run_parser.add_argument("--calls-per-session", type=int, default=10, help="tools/call messages per session (default 10)")
+    run_parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="Weighted tools/call scenarios, e.g. get_instance=4,list_instances=1 (default: "
+        + ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()) + ")",
+    )
+    run_parser.add_argument("--seed", type=int, default=1, help="Random seed of the traffic (default 1)")
+    run_parser.add_argument("--fleet", type=int, default=100, help="Servers in the mock API's zone (default 100)")
+    run_parser.add_argument("--latency", type=float, default=0.01, help="Seconds the mock API adds to every request (default 0.01)")
+    run_parser.add_argument("--page-size", type=int, default=100, help="Largest page the mock API returns (default 100)")
+    run_parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="Extra environment variable for the server (repeatable)")
+    run_parser.add_argument("--command", help="Command starting the HTTP server; {port} is replaced by the port")
+    run_parser.add_argument("--url", help="Load an already running server's /mcp instead of starting one against the mock API")
+    run_parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for startup and for each response (default 60)")
+    run_parser.add_argument("--save", metavar="FILE", help="Write the results to FILE as a JSON baseline")
+    run_parser.add_argument("--baseline", metavar="FILE", help="Compare the results with a saved baseline and fail on regressions")
+    run_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    add_gate_arguments(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved results and fail on regressions")
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument("current", help="Results file to check")
+    add_gate_arguments(compare_parser)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return gate(load(args.baseline), load(args.current), args)
+
+    results = run(args)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as target:
+            json.dump(results, target, indent=2)
+            target.write("\n")
+    if args.baseline:
+        print()
+        return gate(load(args.baseline), results, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
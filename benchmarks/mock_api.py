@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Mock Scaleway API
+A local stand-in for the Instance, VPC and Kubernetes APIs serving a
+synthetic fleet of any size, with configurable latency and maximum page
+size, and counting the requests it receives. Point the servers at it with
+SCW_API_URL. Run it on its own with e.g.
+``python benchmarks/mock_api.py --servers 5000 --latency 0.02 --port 8900``.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000000"
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def server_id(index: int) -> str:
+    return f"11111111-0000-4000-8000-{index:012d}"
+
+
+def network_id(index: int) -> str:
+    return f"22222222-0000-4000-8000-{index:012d}"
+
+
+def cluster_id(index: int) -> str:
+    return f"33333333-0000-4000-8000-{index:012d}"
+
+
+def _date(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+class Fleet:
+    """A synthetic fleet, generated on demand so that 50,000 servers cost nothing until listed."""
+
+    def __init__(self, servers: int, networks: int, clusters: int, nodes_per_cluster: int, pools_per_cluster: int = 2):
+        self.servers = servers
+        self.networks = networks
+        self.clusters = clusters
+        self.nodes_per_cluster = nodes_per_cluster
+        self.pools_per_cluster = pools_per_cluster
+
+    def server(self, index: int, zone: str) -> dict:
+        ident = server_id(index)
+        nics = []
+        if self.networks:
+            nics.append({
+                "id": f"44444444-0000-4000-8000-{index:012d}",
+                "server_id": ident,
+                "private_network_id": network_id(index % self.networks),
+                "mac_address": f"02:00:00:{(index >> 16) & 255:02x}:{(index >> 8) & 255:02x}:{index & 255:02x}",
+                "state": "available",
+                "tags": [],
+                "creation_date": _date(index),
+            })
+        return {
+            "id": ident,
+            "name": f"bench-{index:05d}",
+            "organization": PROJECT_ID,
+            "project": PROJECT_ID,
+            "state": "stopped" if index % 5 == 0 else "running",
+            "commercial_type": ("DEV1-S", "GP1-XS", "PRO2-S")[index % 3],
+            "arch": "x86_64",
+            "zone": zone,
+            "tags": [f"team-{index % 10}", "bench"],
+            "creation_date": _date(index),
+            "modification_date": _date(index + 3600),
+            "public_ip": {"id": f"55555555-0000-4000-8000-{index:012d}", "address": f"51.15.{(index >> 8) & 255}.{index & 255}"},
+            "private_ip": None,
+            "private_nics": nics,
+            "volumes": {},
+            "protected": False,
+        }
+
+    def network(self, index: int, region: str) -> dict:
+        return {
+            "id": network_id(index),
+            "name": f"bench-net-{index}",
+            "organization_id": PROJECT_ID,
+            "project_id": PROJECT_ID,
+            "region": region,
+            "vpc_id": "66666666-0000-4000-8000-000000000000",
+            "tags": ["bench"],
+            "subnets": [],
+            "dhcp_enabled": True,
+            "created_at": _date(index),
+            "updated_at": _date(index),
+        }
+
+    def cluster(self, index: int, region: str) -> dict:
+        return {
+            "id": cluster_id(index),
+            "name": f"bench-k8s-{index}",
+            "type": "kapsule",
+            "status": "ready",
+            "version": "1.30.2",
+            "region": region,
+            "organization_id": PROJECT_ID,
+            "project_id": PROJECT_ID,
+            "tags": ["bench"],
+            "cni": "cilium",
+            "private_network_id": network_id(index % self.networks) if self.networks else None,
+            "created_at": _date(index),
+            "updated_at": _date(index),
+        }
+
+    def pool(self, cluster_index: int, index: int, region: str) -> dict:
+        size = self._pool_size(index)
+        return {
+            "id": f"77777777-{cluster_index:04d}-4000-8000-{index:012d}",
+            "cluster_id": cluster_id(cluster_index),
+            "name": f"pool-{index}",
+            "status": "ready",
+            "version": "1.30.2",
+            "node_type": "DEV1-M",
+            "autoscaling": index == 0,
+            "size": size,
+            "min_size": 1,
+            "max_size": size,
+            "autohealing": True,
+            "zone": f"{region}-1",
+            "region": region,
+            "created_at": _date(index),
+            "updated_at": _date(index),
+        }
+
+    def node(self, cluster_index: int, index: int, region: str) -> dict:
+        pool_index = min(index * self.pools_per_cluster // max(self.nodes_per_cluster, 1), self.pools_per_cluster - 1)
+        ready = index % 50 != 49
+        return {
+            "id": f"88888888-{cluster_index:04d}-4000-8000-{index:012d}",
+            "pool_id": self.pool(cluster_index, pool_index, region)["id"],
+            "cluster_id": cluster_id(cluster_index),
+            "region": region,
+            "name": f"node-{cluster_index}-{index}",
+            "status": "ready" if ready else "not_ready",
+            "conditions": {"Ready": "True" if ready else "False"},
+            "created_at": _date(index),
+            "updated_at": _date(index),
+        }
+
+    def _pool_size(self, index: int) -> int:
+        base, extra = divmod(self.nodes_per_cluster, self.pools_per_cluster)
+        return base + (1 if index < extra else 0)
+
+
+class MockScalewayAPI:
+    """The mock API served from a background thread."""
+
+    def __init__(
+        self,
+        servers: int = 100,
+        latency: float = 0.0,
+        max_page_size: int = 100,
+        networks: int = 10,
+        clusters: int = 2,
+        nodes_per_cluster: int = 50,
+        zones: tuple = ("fr-par-1",),
+        regions: tuple = ("fr-par",),
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.fleet = Fleet(servers, networks, clusters, nodes_per_cluster)
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.zones = set(zones)
+        self.regions = set(regions)
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = [
+            ("GET", re.compile(r"/instance/v1/zones/([^/]+)/servers"), self.list_servers),
+            ("GET", re.compile(r"/instance/v1/zones/([^/]+)/servers/([^/]+)"), self.get_server),
+            ("POST", re.compile(r"/instance/v1/zones/([^/]+)/servers/([^/]+)/action"), self.server_action),
+            ("GET", re.compile(r"/instance/v1/zones/([^/]+)/images"), self.list_images),
+            ("GET", re.compile(r"/vpc/v2/regions/([^/]+)/private-networks"), self.list_private_networks),
+            ("GET", re.compile(r"/k8s/v1/regions/([^/]+)/clusters"), self.list_clusters),
+            ("GET", re.compile(r"/k8s/v1/regions/([^/]+)/clusters/([^/]+)"), self.get_cluster),
+            ("GET", re.compile(r"/k8s/v1/regions/([^/]+)/clusters/([^/]+)/pools"), self.list_pools),
+            ("GET", re.compile(r"/k8s/v1/regions/([^/]+)/clusters/([^/]+)/nodes"), self.list_nodes),
+        ]
+        # Hundreds of clients may connect at once; the default backlog of 5 would reset them
+        ThreadingHTTPServer.request_queue_size = 1024
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockScalewayAPI":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-scaleway-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset_calls(self) -> Counter:
+        """Return the request counts so far and start counting from zero."""
+        with self._lock:
+            calls, self.calls = self.calls, Counter()
+        return calls
+
+    # -- routing ------------------------------------------------------------
+
+    def _handler(self) -> type:
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle's algorithm the
+            # client's delayed ACK would add ~40ms to every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                api._dispatch(self, "GET")
+
+            def do_POST(self) -> None:
+                api._dispatch(self, "POST")
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def _dispatch(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        # The SDK sends a body even with GET; leaving it unread would corrupt the next keep-alive request
+        length = int(request.headers.get("Content-Length") or 0)
+        if length:
+            request.rfile.read(length)
+        url = urlparse(request.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                with self._lock:
+                    self.calls[handler.__name__] += 1
+                if self.latency:
+                    time.sleep(self.latency)
+                status, body = handler(query, *match.groups())
+                break
+        else:
+            status, body = 404, {"message": "resource is not found", "type": "not_found"}
+        self._reply(request, status, body)
+
+    @staticmethod
+    def _reply(request: BaseHTTPRequestHandler, status: int, body: dict) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _page(self, query: dict, total: int, size_param: str) -> range:
+        page = max(1, int(query.get("page", 1)))
+        size = max(1, min(int(query.get(size_param, self.max_page_size)), self.max_page_size))
+        start = (page - 1) * size
+        return range(min(start, total), min(start + size, total))
+
+    @staticmethod
+    def _not_found(kind: str) -> tuple[int, dict]:
+        return 404, {"message": f"{kind} is not found", "type": "not_found", "resource": kind}
+
+    # -- Instance -----------------------------------------------------------
+
+    def list_servers(self, query: dict, zone: str) -> tuple[int, dict]:
+        total = self.fleet.servers if zone in self.zones else 0
+        servers = [self.fleet.server(i, zone) for i in self._page(query, total, "per_page")]
+        return 200, {"servers": servers, "total_count": total}
+
+    def get_server(self, query: dict, zone: str, ident: str) -> tuple[int, dict]:
+        index = int(ident.rsplit("-", 1)[-1]) if ident.startswith("11111111-") else -1
+        if zone not in self.zones or not 0 <= index < self.fleet.servers:
+            return self._not_found("instance_server")
+        return 200, {"server": self.fleet.server(index, zone)}
+
+    def server_action(self, query: dict, zone: str, ident: str) -> tuple[int, dict]:
+        return 202, {"task": {"id": "99999999-0000-4000-8000-000000000000", "status": "pending", "zone": zone}}
+
+    def list_images(self, query: dict, zone: str) -> tuple[int, dict]:
+        return 200, {"images": [], "total_count": 0}
+
+    # -- VPC ----------------------------------------------------------------
+
+    def list_private_networks(self, query: dict, region: str) -> tuple[int, dict]:
+        total = self.fleet.networks if region in self.regions else 0
+        networks = [self.fleet.network(i, region) for i in self._page(query, total, "page_size")]
+        return 200, {"private_networks": networks, "total_count": total}
+
+    # -- Kubernetes ---------------------------------------------------------
+
+    def _cluster_index(self, region: str, ident: str) -> int:
+        index = int(ident.rsplit("-", 1)[-1]) if ident.startswith("33333333-") else -1
+        return index if region in self.regions and 0 <= index < self.fleet.clusters else -1
+
+    def list_clusters(self, query: dict, region: str) -> tuple[int, dict]:
+        total = self.fleet.clusters if region in self.regions else 0
+        clusters = [self.fleet.cluster(i, region) for i in self._page(query, total, "page_size")]
+        return 200, {"clusters": clusters, "total_count": total}
+
+    def get_cluster(self, query: dict, region: str, ident: str) -> tuple[int, dict]:
+        index = self._cluster_index(region, ident)
+        if index < 0:
+            return self._not_found("k8s_cluster")
+        return 200, self.fleet.cluster(index, region)
+
+    def list_pools(self, query: dict, region: str, ident: str) -> tuple[int, dict]:
+        index = self._cluster_index(region, ident)
+        if index < 0:
+            return self._not_found("k8s_cluster")
+        total = self.fleet.pools_per_cluster
+        pools = [self.fleet.pool(index, i, region) for i in self._page(query, total, "page_size")]
+        return 200, {"pools": pools, "total_count": total}
+
+    def list_nodes(self, query: dict, region: str, ident: str) -> tuple[int, dict]:
+        index = self._cluster_index(region, ident)
+        if index < 0:
+            return self._not_found("k8s_cluster")
+        total = self.fleet.nodes_per_cluster
+        nodes = [self.fleet.node(index, i, region) for i in self._page(query, total, "page_size")]
+        return 200, {"nodes": nodes, "total_count": total}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", type=int, default=100, help="Servers per zone (default 100)")
+    parser.add_argument("--networks", type=int, default=10, help="Private networks per region (default 10)")
+    parser.add_argument("--clusters", type=int, default=2, help="Kubernetes clusters per region (default 2)")
+    parser.add_argument("--nodes", type=int, default=50, help="Nodes per cluster (default 50)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request (default 0)")
+    parser.add_argument("--max-page-size", type=int, default=100, help="Largest page returned (default 100)")
+    parser.add_argument("--zones", default="fr-par-1", help="Comma-separated zones holding servers")
+    parser.add_argument("--regions", default="fr-par", help="Comma-separated regions holding networks and clusters")
+    parser.add_argument("--port", type=int, default=8900, help="Port to listen on (default 8900)")
+    args = parser.parse_args(argv)
+
+    api = MockScalewayAPI(
+        servers=args.servers,
+        latency=args.latency,
+        max_page_size=args.max_page_size,
+        networks=args.networks,
+        clusters=args.clusters,
+        nodes_per_cluster=args.nodes,
+        zones=tuple(args.zones.split(",")),
+        regions=tuple(args.regions.split(",")),
+        port=args.port,
+    )
+    print(f"Mock Scaleway API listening on {api.url} (SCW_API_URL={api.url})")
+    try:
+        api._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
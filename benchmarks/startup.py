@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Startup Benchmark
+Starts the HTTP server repeatedly against a local stub of the Scaleway API
+and reports, from process spawn, the time to the first successful /health
+and to the first completed tools/call. Compare launch paths with --command,
+e.g. ``--command "uv run scaleway_http_server.py"``.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POLL_INTERVAL = 0.005
+
+TOOL_CALL = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "tools/call",
+    "params": {"name": "list_instances", "arguments": {"zone": "fr-par-1"}},
+}
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Answers Instance server listings with an empty page, and 404 for anything else."""
+
+    def do_GET(self) -> None:
+        if "/instance/v1/zones/" in self.path and self.path.split("?")[0].endswith("/servers"):
+            self._reply(200, {"servers": [], "total_count": 0})
+        else:
+            self._reply(404, {"message": "not found", "type": "not_found"})
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_health(url: str, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"{url} did not answer in time")
+
+
+def call_tool(url: str) -> dict:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(TOOL_CALL).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def run_once(command: list[str], api_url: str, timeout: float) -> dict:
+    """Start the server once and time its first /health and its first tools/call."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "SCW_ACCESS_KEY": "SCWXXXXXXXXXXXXXXXXX",
+        "SCW_SECRET_KEY": "00000000-0000-0000-0000-000000000000",
+        "SCW_PROJECT_ID": "00000000-0000-0000-0000-000000000000",
+        "SCW_API_URL": api_url,
+    }
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [part.replace("{port}", str(port)) for part in command],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_health(f"{base}/health", start + timeout)
+        health = time.perf_counter() - start
+        response = call_tool(f"{base}/mcp")
+        first_call = time.perf_counter() - start
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    text = response.get("result", {}).get("content", [{}])[0].get("text", "")
+    return {"health": health, "first_call": first_call, "ok": not text.startswith("Error")}
+
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "min": round(min(values), 3),
+        "median": round(statistics.median(values), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts (default 5)")
+    parser.add_argument(
+        "--command",
+        default=f"{shlex.quote(sys.executable)} scaleway_http_server.py",
+        help="Command starting the server from the repository root; {port} is replaced by the port",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for /health (default 60)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    command = shlex.split(args.command)
+    runs = []
+    try:
+        for i in range(args.runs):
+            runs.append(run_once(command, api_url, args.timeout))
+            if not args.json:
+                run = runs[-1]
+                print(
+                    f"run {i + 1}: /health {run['health']:.3f}s, first tools/call {run['first_call']:.3f}s"
+                    + ("" if run["ok"] else " (tool returned an error)")
+                )
+    finally:
+        stub.shutdown()
+
+    results = {
+        "command": args.command,
+        "runs": len(runs),
+        "time_to_first_health": summarize([run["health"] for run in runs]),
+        "time_to_first_tool_call": summarize([run["first_call"] for run in runs]),
+        "failed_tool_calls": sum(1 for run in runs if not run["ok"]),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name in ("time_to_first_health", "time_to_first_tool_call"):
+            stats = results[name]
+            print(f"{name}: min {stats['min']}s, median {stats['median']}s, max {stats['max']}s")
+    return 0 if results["failed_tool_calls"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Offline Benchmark Suite
+Runs the STDIO server (scaleway_server.py) and/or the HTTP server
+(scaleway_http_server.py) against the local mock Scaleway API
+(benchmarks/mock_api.py) and reports, per transport, fleet size and
+scenario: tool latency percentiles, throughput, peak RSS of the server
+process and the number of requests it sent upstream. No network access or
+real credentials needed, e.g.
+``python benchmarks/suite.py --fleet 10,1000,50000 --latency 0.02 --scenario list_instances,get_instance``.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_api import Fleet, MockScalewayAPI, cluster_id, network_id, server_id  # noqa: E402
+from startup import ROOT, free_port, wait_for_health  # noqa: E402
+
+ZONE = "fr-par-1"
+REGION = "fr-par"
+
+SERVER_ENV = {
+    "SCW_ACCESS_KEY": "SCWXXXXXXXXXXXXXXXXX",
+    "SCW_SECRET_KEY": "00000000-0000-0000-0000-000000000000",
+    "SCW_PROJECT_ID": "00000000-0000-0000-0000-000000000000",
+    "SCW_DEFAULT_REGION": REGION,
+    "SCW_DEFAULT_ZONE": ZONE,
+}
+
+# Scenario name -> function of (request number, mock fleet) returning the tool name and its arguments
+SCENARIOS: dict[str, Callable[[int, Fleet], tuple[str, dict]]] = {
+    "list_instances": lambda i, fleet: ("list_instances", {"zone": ZONE}),
+    "list_instances_page": lambda i, fleet: ("list_instances", {"zone": ZONE, "page_size": 50}),
+    "list_instances_json": lambda i, fleet: ("list_instances", {"zone": ZONE, "format": "json"}),
+    "get_instance": lambda i, fleet: (
+        "get_instance",
+        {"zone": ZONE, "instance_id": server_id(i % max(fleet.servers, 1))},
+    ),
+    "list_private_networks": lambda i, fleet: ("list_private_networks", {"region": REGION}),
+    "list_k8s_clusters": lambda i, fleet: ("list_k8s_clusters", {"region": REGION}),
+    "describe_k8s_cluster": lambda i, fleet: (
+        "describe_k8s_cluster",
+        {"region": REGION, "cluster_id": cluster_id(i % max(fleet.clusters, 1))},
+    ),
+    "get_network_members": lambda i, fleet: (
+        "get_network_members",
+        {"region": REGION, "private_network_id": network_id(i % max(fleet.networks, 1))},
+    ),
+}
+
+
+class HttpClient:
+    """Posts JSON-RPC messages to the HTTP server's /mcp, over one keep-alive connection per thread."""
+
+    def __init__(self, port: int, timeout: float):
+        self.port = port
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method: str, params: Optional[dict] = None) -> dict:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = HTTPConnection("127.0.0.1", self.port, timeout=self.timeout)
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}})
+        try:
+            connection.request("POST", "/mcp", body, {"Content-Type": "application/json", "Accept": "application/json"})
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, ConnectionError):
+            self._local.connection = None
+            connection.close()
+            raise
+        return json.loads(payload)
+
+    def close(self) -> None:
+        pass
+
+
+class StdioClient:
+    """Speaks newline-delimited JSON-RPC over the STDIO server's pipes, with any number of requests in flight."""
+
+    def __init__(self, process: subprocess.Popen, timeout: float):
+        self.process = process
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._pending: dict[int, queue.Queue] = {}
+        self._reader = threading.Thread(target=self._read, name="stdio-reader", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            waiter = self._pending.pop(message.get("id"), None)
+            if waiter is not None:
+                waiter.put(message)
+
+    def _send(self, message: dict) -> None:
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.process.stdin.flush()
+
+    def request(self, method: str, params: Optional[dict] = None) -> dict:
+        request_id = next(self._ids)
+        waiter: queue.Queue = queue.Queue(maxsize=1)
+        self._pending[request_id] = waiter
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        try:
+            return waiter.get(timeout=self.timeout)
+        except queue.Empty:
+            self._pending.pop(request_id, None)
+            raise TimeoutError(f"No answer to {method} within {self.timeout}s") from None
+
+    def initialize(self) -> None:
+        self.request("initialize", {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "scaleway-mcp-benchmark", "version": "1.0"},
+        })
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+
+def peak_rss_kb(pid: int) -> Optional[int]:
+    """The peak resident set size of a running process, from /proc (None where it is not available)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentiles(values: list[float]) -> dict:
+    """p50/p90/p95/p99/max of latencies in seconds, in milliseconds (nearest-rank)."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+    return {
+        "p50": round(rank(0.50) * 1000, 2),
+        "p90": round(rank(0.90) * 1000, 2),
+        "p95": round(rank(0.95) * 1000, 2),
+        "p99": round(rank(0.99) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+def tool_failed(response: dict) -> bool:
+    """Whether a tools/call response is a JSON-RPC error or a tool error."""
+    if "error" in response:
+        return True
+    result = response.get("result", {})
+    content = result.get("content") or [{}]
+    return bool(result.get("isError")) or content[0].get("text", "").startswith("Error")
+
+
+class ServerUnderTest:
+    """A server process started against the mock API, and a client for it."""
+
+    def __init__(self, transport: str, api_url: str, extra_env: dict, timeout: float, command: Optional[str] = None):
+        self.transport = transport
+        env = {**os.environ, **SERVER_ENV, "SCW_API_URL": api_url, **extra_env}
+        if transport == "http":
+            port = free_port()
+            env.update({"HOST": "127.0.0.1", "PORT": str(port)})
+            argv = shlex.split(command or f"{shlex.quote(sys.executable)} scaleway_http_server.py")
+            self.process = subprocess.Popen(
+                [part.replace("{port}", str(port)) for part in argv],
+                cwd=ROOT,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            wait_for_health(f"http://127.0.0.1:{port}/health", time.perf_counter() + timeout)
+            self.client = HttpClient(port, timeout)
+        else:
+            argv = shlex.split(command or f"{shlex.quote(sys.executable)} scaleway_server.py")
+            self.process = subprocess.Popen(
+                argv,
+                cwd=ROOT,
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self.client = StdioClient(self.process, timeout)
+            self.client.initialize()
+
+    def tool_names(self) -> set[str]:
+        response = self.client.request("tools/list")
+        return {tool["name"] for tool in response.get("result", {}).get("tools", [])}
+
+    def call_tool(self, name: str, arguments: dict) -> dict:
+        return self.client.request("tools/call", {"name": name, "arguments": arguments})
+
+    def peak_rss_kb(self) -> Optional[int]:
+        return peak_rss_kb(self.process.pid)
+
+    def stop(self) -> None:
+        self.client.close()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def __enter__(self) -> "ServerUnderTest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def run_scenario(
+    server: ServerUnderTest,
+    api: MockScalewayAPI,
+    scenario: str,
+    requests: int,
+    concurrency: int,
+    fresh: bool = False,
+) -> dict:
+    """Send one warm-up call, then `requests` calls from `concurrency` clients, and measure them."""
+    make_call = SCENARIOS[scenario]
+
+    def call(i: int) -> tuple[float, bool]:
+        name, arguments = make_call(i, api.fleet)
+        if fresh:
+            arguments = {**arguments, "fresh": True}
+        start = time.perf_counter()
+        try:
+            failed = tool_failed(server.call_tool(name, arguments))
+        except Exception:
+            failed = True
+        return time.perf_counter() - start, failed
+
+    # The first call pays for the server's lazy imports and client setup
+    _, warm_up_failed = call(0)
+    api.reset_calls()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, range(1, requests + 1)))
+    elapsed = time.perf_counter() - start
+
+    upstream = api.reset_calls()
+    latencies = [latency for latency, _ in results]
+    return {
+        "transport": server.transport,
+        "fleet": api.fleet.servers,
+        "scenario": scenario,
+        "requests": requests,
+        "concurrency": concurrency,
+        "latency_ms": percentiles(latencies),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "errors": sum(1 for _, failed in results if failed) + int(warm_up_failed),
+        "upstream_calls": sum(upstream.values()),
+        "upstream_calls_per_request": round(sum(upstream.values()) / requests, 2),
+        "upstream_by_endpoint": dict(sorted(upstream.items())),
+        "peak_rss_mb": round(rss / 1024, 1) if (rss := server.peak_rss_kb()) is not None else None,
+    }
+
+
+def format_result(result: dict) -> str:
+    latency = result["latency_ms"]
+    rss = f"{result['peak_rss_mb']} MB" if result["peak_rss_mb"] is not None else "n/a"
+    return (
+        f"{result['transport']:<5} fleet={result['fleet']:<6} {result['scenario']:<22} "
+        f"p50 {latency['p50']:>8.2f}ms  p90 {latency['p90']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  "
+        f"max {latency['max']:>8.2f}ms  {result['throughput_rps']:>7.1f} req/s  "
+        f"upstream {result['upstream_calls_per_request']:>6.2f}/req  rss {rss}  errors {result['errors']}"
+    )
+
+
+def parse_env(pairs: list[str]) -> dict:
+    env = {}
+    for pair in pairs:
+        name, separator, value = pair.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError(f"--env expects NAME=VALUE, got {pair!r}")
+        env[name] = value
+    return env
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=("stdio", "http", "both"), default="both", help="Server(s) to run (default both)")
+    parser.add_argument("--fleet", default="10,1000", help="Comma-separated numbers of servers in the zone, 10 to 50000 (default 10,1000)")
+    parser.add_argument(
+        "--scenario",
+        default="list_instances,get_instance",
+        help=f"Comma-separated scenarios, or 'all': {', '.join(SCENARIOS)} (default list_instances,get_instance)",
+    )
+    parser.add_argument("--requests", type=int, default=50, help="Measured tool calls per scenario (default 50)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tool calls in flight at the same time (default 4)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock API adds to every request (default 0)")
+    parser.add_argument("--page-size", type=int, default=100, help="Largest page the mock API returns (default 100)")
+    parser.add_argument("--networks", type=int, default=10, help="Private networks in the region (default 10)")
+    parser.add_argument("--clusters", type=int, default=2, help="Kubernetes clusters in the region (default 2)")
+    parser.add_argument("--nodes", type=int, default=50, help="Nodes per Kubernetes cluster (default 50)")
+    parser.add_argument("--fresh", action="store_true", help="Call every tool with fresh=true, bypassing the read cache")
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Extra environment variable for the servers, e.g. SCW_MCP_RATE_LIMIT_INSTANCE=0 (repeatable)",
+    )
+    parser.add_argument("--http-command", help="Command starting the HTTP server; {port} is replaced by the port")
+    parser.add_argument("--stdio-command", help="Command starting the STDIO server")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for startup and for each call (default 120)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    transports = ("stdio", "http") if args.transport == "both" else (args.transport,)
+    fleets = [int(size) for size in args.fleet.split(",")]
+    scenarios = list(SCENARIOS) if args.scenario == "all" else args.scenario.split(",")
+    unknown = [scenario for scenario in scenarios if scenario not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    extra_env = parse_env(args.env)
+
+    results = []
+    for fleet in fleets:
+        api = MockScalewayAPI(
+            servers=fleet,
+            latency=args.latency,
+            max_page_size=args.page_size,
+            networks=args.networks,
+            clusters=args.clusters,
+            nodes_per_cluster=args.nodes,
+            zones=(ZONE,),
+            regions=(REGION,),
+        ).start()
+        try:
+            for transport in transports:
+                command = args.http_command if transport == "http" else args.stdio_command
+                for scenario in scenarios:
+                    # A new process per scenario, so peak RSS and the cache belong to that scenario alone
+                    with ServerUnderTest(transport, api.url, extra_env, args.timeout, command) as server:
+                        tool, _ = SCENARIOS[scenario](0, api.fleet)
+                        if tool not in server.tool_names():
+                            if not args.json:
+                                print(f"{transport:<5} fleet={fleet:<6} {scenario:<22} skipped: no {tool} tool")
+                            continue
+                        result = run_scenario(server, api, scenario, args.requests, args.concurrency, args.fresh)
+                    results.append(result)
+                    if not args.json:
+                        print(format_result(result), flush=True)
+        finally:
+            api.stop()
+
+    if args.json:
+        print(json.dumps({
+            "latency": args.latency,
+            "page_size": args.page_size,
+            "fresh": args.fresh,
+            "env": extra_env,
+            "results": results,
+        }, indent=2))
+    return 0 if all(result["errors"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Async HTTP Transport
+An asyncio-native alternative to the thread pool for the Scaleway API calls
+the tools make (servers, server actions, images, private networks, Kubernetes
+clusters, pools and nodes). Requests go out on an ``httpx.AsyncClient`` with
+connection pooling (and HTTP/2 when the ``h2`` package is installed), so
+hundreds of concurrent fan-out calls run on the event loop without a thread
+each.
+
+The SDK still does everything but the I/O: its method builds the request
+(which is captured instead of sent), and the same method is then replayed on
+the response, so parameter validation, error handling and the SDK models
+returned are exactly those of the synchronous path. Enabled with
+``SCW_MCP_HTTP_BACKEND=httpx``.
+"""
+
+import asyncio
+import copy
+import importlib.util
+import json
+import logging
+import os
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from scaleway_metrics import track_upstream
+from scaleway_ratelimit import get_rate_limiter
+from scaleway_timing import timed_phase
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+logger = logging.getLogger("scaleway-mcp.async-http")
+# httpx logs every request at INFO; upstream calls are already in the metrics
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+BACKENDS = ("requests", "httpx")
+DEFAULT_MAX_CONNECTIONS = 100
+# httpcore's pool does O(connections^2) bookkeeping per request, so large
+# limits are split across several small clients instead of one big pool
+CONNECTIONS_PER_CLIENT = 8
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+# SDK API methods served by the async transport, per API class; each sends
+# exactly one request. Any other method runs synchronously on the thread pool.
+ASYNC_METHODS = {
+    "InstanceV1API": frozenset({"list_servers", "get_server", "server_action", "delete_server", "list_images"}),
+    "VpcV2API": frozenset({"list_private_networks", "create_private_network"}),
+    "K8SV1API": frozenset({"list_clusters", "get_cluster", "list_pools", "list_nodes"}),
+}
+
+
+class _Captured(Exception):
+    """Raised by the stand-in ``_request`` to stop an SDK method once it has built its request."""
+
+    def __init__(self, method: str, path: str, params: dict, headers: dict, body: Any):
+        super().__init__(method, path)
+        self.method = method.upper()
+        self.path = path
+        self.params = params
+        self.headers = headers
+        self.body = body
+
+
+class AsyncTransport:
+    """Sends Scaleway API requests on a pooled ``httpx.AsyncClient``, rate limited and retried like the sync session.
+
+    httpx clients are bound to the event loop that created them, so each
+    running loop (in practice, the process's only one) gets its own set of
+    clients, ``max_connections`` split between them, and every request goes to
+    the client with the fewest requests in flight.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        http2: bool = True,
+        verify: bool = True,
+    ):
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # HTTP/2 needs the optional h2 package; without it httpx speaks HTTP/1.1
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.info("HTTP/2 unavailable without the 'h2' package (pip install 'httpx[http2]'), using HTTP/1.1")
+        self.verify = verify
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self._busy: dict[int, int] = {}
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def client(self) -> "httpx.AsyncClient":
+        """The least busy httpx client of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            import httpx
+
+            clients = self._clients[loop] = []
+            remaining = self.max_connections
+            while remaining > 0:
+                size = min(remaining, CONNECTIONS_PER_CLIENT)
+                remaining -= size
+                clients.append(
+                    httpx.AsyncClient(
+                        http2=self.http2,
+                        verify=self.verify,
+                        limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+                        timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                    )
+                )
+        return min(clients, key=lambda client: self._busy.get(id(client), 0))
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> "requests.Response":
+        """Send a request under the rate limiter and return it as the ``requests.Response`` the SDK expects."""
+        response = await get_rate_limiter().send_async(self._send, method, url, **kwargs)
+        return _to_requests_response(response)
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        client = self.client()
+        self._busy[id(client)] = self._busy.get(id(client), 0) + 1
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            with track_upstream(method, url) as outcome, timed_phase("upstream"):
+                response = await client.request(method, url, **kwargs)
+                outcome["status"] = response.status_code
+                return response
+        finally:
+            self.in_flight -= 1
+            self._busy[id(client)] -= 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+    async def aclose(self) -> None:
+        """Close the running event loop's clients, if it has any."""
+        for client in self._clients.pop(asyncio.get_running_loop(), []):
+            self._busy.pop(id(client), None)
+            await client.aclose()
+
+
+def _to_requests_response(response: "httpx.Response") -> "requests.Response":
+    """Convert an httpx response to the ``requests.Response`` SDK methods read."""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted.url = str(response.url)
+    converted.encoding = response.encoding
+    converted._content = response.content
+    # As the SDK's _request does: some list endpoints give the total in a header
+    if converted.headers.get("x-total-count"):
+        body = converted.json()
+        body["total_count"] = converted.headers["x-total-count"]
+        converted._content = json.dumps(body).encode("utf-8")
+    return converted
+
+
+def _with_request(api: Any, request: Callable[..., Any]) -> Any:
+    """A shallow copy of an SDK API object whose ``_request`` is ``request``."""
+    clone = copy.copy(api)
+    clone._request = request
+    return clone
+
+
+def _capture(api: Any, method: Callable[..., Any], args: tuple, kwargs: dict) -> _Captured:
+    """Run an SDK method until it sends its request, and return that request."""
+
+    def record(method: str, path: str, params: dict = {}, headers: dict = {}, body: Any = None) -> None:
+        raise _Captured(method, path, params, headers, body)
+
+    try:
+        method(_with_request(api, record), *args, **kwargs)
+    except _Captured as captured:
+        return captured
+    raise RuntimeError(f"{method.__qualname__} did not send a request")
+
+
+def _encode(api: Any, captured: _Captured) -> dict:
+    """The httpx arguments of a captured request, encoded as the SDK's _request encodes them."""
+    headers = {"accept": "application/json", "user-agent": api.client.user_agent}
+    if captured.method in ("POST", "PUT", "PATCH"):
+        headers["Content-Type"] = "application/json; charset=utf-8"
+    headers.update(captured.headers)
+    if api.client.secret_key is not None:
+        headers["x-auth-token"] = api.client.secret_key
+
+    body = {} if captured.body is None else captured.body
+    params = [
+        (name, str(item))
+        for name, value in captured.params.items()
+        if value is not None
+        for item in (value if isinstance(value, list) else [value])
+    ]
+    return {
+        "params": params,
+        "headers": headers,
+        "content": body if isinstance(body, bytes) else json.dumps(body),
+    }
+
+
+class AsyncAPI:
+    """Async-native view of a Scaleway SDK API object.
+
+    The methods listed in :data:`ASYNC_METHODS` become coroutine functions
+    returning the SDK's own models; ``run_blocking`` awaits them on the event
+    loop instead of handing them to a worker thread. Every other attribute is
+    the SDK object's.
+    """
+
+    def __init__(self, api: Any, transport: AsyncTransport):
+        self._api = api
+        self._transport = transport
+        self._served = ASYNC_METHODS.get(type(api).__name__, frozenset())
+        self._methods: dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in self.__dict__.get("_served", ()):
+            return getattr(self.__dict__["_api"], name)
+        method = self._methods.get(name)
+        if method is None:
+            method = self._methods[name] = self._async_method(name)
+        return method
+
+    def _async_method(self, name: str) -> Callable[..., Any]:
+        api, transport = self._api, self._transport
+        sync_method = getattr(type(api), name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            captured = _capture(api, sync_method, args, kwargs)
+            response = await transport.request(captured.method, f"{api.client.api_url}{captured.path}", **_encode(api, captured))
+            # Replay the method on the response: the SDK checks it for errors and unmarshals it
+            return sync_method(_with_request(api, lambda *_args, **_kwargs: response), *args, **kwargs)
+
+        call.__name__ = name
+        call.__qualname__ = f"{type(api).__name__}.{name}"
+        call.__doc__ = sync_method.__doc__
+        return call
+
+
+# Global transport shared by every API object in the process
+async_transport: Optional[AsyncTransport] = None
+_configured = False
+
+
+def get_async_transport() -> Optional[AsyncTransport]:
+    """Get the shared transport configured from environment variables, or None if the backend is ``requests``."""
+    global async_transport, _configured
+
+    if _configured:
+        return async_transport
+    _configured = True
+
+    backend = os.getenv("SCW_MCP_HTTP_BACKEND", "requests").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SCW_MCP_HTTP_BACKEND {backend!r}; choose one of {', '.join(BACKENDS)}")
+    if backend != "httpx":
+        return None
+
+    max_connections = int(os.getenv("SCW_MCP_ASYNC_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+    connect_timeout = float(os.getenv("SCW_MCP_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+    read_timeout = float(os.getenv("SCW_MCP_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+    http2 = os.getenv("SCW_MCP_HTTP2", "1").lower() not in ("0", "false", "no")
+
+    logger.info(
+        f"Initializing async HTTP transport with max_connections={max_connections}, "
+        f"timeouts=({connect_timeout}s, {read_timeout}s), http2={http2}"
+    )
+
+    async_transport = AsyncTransport(max_connections, connect_timeout, read_timeout, http2)
+    return async_transport
+
+
+async def close_async_transport() -> None:
+    """Close the shared transport's connections for the running event loop."""
+    if async_transport is not None:
+        await async_transport.aclose()
+
+
+def async_transport_stats() -> dict:
+    """Return stats for the shared transport."""
+    current = get_async_transport()
+    return current.stats() if current else {"enabled": False}
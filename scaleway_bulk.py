@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Bulk Instance Actions
+Runs one lifecycle action against many instances concurrently, bounded by a
+parallelism cap, and renders a compact per-instance result table.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from scaleway_cache import resource_tag, write_through
+from scaleway_executor import run_blocking
+from scaleway_pagination import fetch_listing
+from scaleway_progress import report_progress
+from scaleway_waiter import get_state_poller, wait_timeout
+
+logger = logging.getLogger("scaleway-mcp.bulk")
+
+DEFAULT_BULK_CONCURRENCY = 10
+
+# Bulk action -> (past tense shown in results, state reached once it completes)
+BULK_ACTIONS = {
+    "poweron": ("started", "running"),
+    "poweroff": ("stopped", "stopped"),
+    "delete": ("deleted", "deleted"),
+}
+
+
+class BulkResult(NamedTuple):
+    """Outcome of a bulk action for a single instance."""
+
+    instance_id: str
+    error: Optional[Exception]
+    detail: Optional[str] = None
+
+
+def bulk_concurrency(requested: Optional[int] = None) -> int:
+    """Parallelism cap for bulk actions: the requested value, or SCW_MCP_BULK_CONCURRENCY."""
+    if requested is not None:
+        return max(1, requested)
+    return max(1, int(os.getenv("SCW_MCP_BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY)))
+
+
+async def select_instances(
+    list_servers: Callable[..., Any],
+    zone: str,
+    instance_ids: Optional[list[str]],
+    tags: Optional[list[str]],
+) -> list[str]:
+    """Resolve the instances targeted by a bulk action.
+
+    Args:
+        list_servers: The Instance API's ``list_servers`` method
+        zone: Zone the instances live in
+        instance_ids: Explicit instance IDs
+        tags: Select instances carrying all of these tags. Combined with
+            ``instance_ids``, only the listed instances that match are kept.
+    """
+    if not instance_ids and not tags:
+        raise ValueError("Provide instance_ids or tags to select instances")
+
+    selected = list(dict.fromkeys(instance_ids or []))
+    if not tags:
+        return selected
+
+    listing = await fetch_listing(
+        functools.partial(list_servers, zone=zone, tags=tags),
+        "servers",
+        target=zone,
+        size_param="per_page",
+    )
+    matching = [server.id for server in listing.items]
+    if instance_ids:
+        return [server_id for server_id in selected if server_id in matching]
+    return matching
+
+
+async def run_bulk(
+    instance_ids: list[str],
+    action: Callable[[str], Awaitable[Optional[str]]],
+    concurrency: int,
+    follow_up: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
+) -> list[BulkResult]:
+    """Run ``action(instance_id)`` for every instance, at most ``concurrency`` at a time.
+
+    Results are returned in the order of ``instance_ids``. A failing instance
+    does not abort the others; its exception is recorded in the result. The
+    action may return a short detail string shown next to its result.
+    ``follow_up(instance_id)``, if given, runs once the action has succeeded,
+    outside the cap (waiting for a state change must not hold a slot), and its
+    return value replaces the detail.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+
+    async def run_one(instance_id: str) -> BulkResult:
+        nonlocal completed
+        try:
+            async with semaphore:
+                detail = await action(instance_id)
+            if follow_up is not None:
+                detail = await follow_up(instance_id)
+            result = BulkResult(instance_id, None, detail)
+        except Exception as e:
+            logger.warning(f"Bulk action failed for {instance_id}: {e}")
+            result = BulkResult(instance_id, e)
+        completed += 1
+        await report_progress(completed, len(instance_ids), f"{instance_id}: {'failed' if result.error else 'done'}")
+        return result
+
+    return list(await asyncio.gather(*(run_one(instance_id) for instance_id in instance_ids)))
+
+
+def render_bulk(results: list[BulkResult], verb: str, zone: str) -> str:
+    """Render bulk results as a markdown table.
+
+    Args:
+        results: Output of :func:`run_bulk`
+        verb: Past tense of the action, e.g. "started"
+        zone: Zone the action ran in
+    """
+    if not results:
+        return f"No matching instances found in zone {zone}."
+
+    failed = sum(1 for r in results if r.error is not None)
+    result = f"{verb.capitalize()} {len(results) - failed}/{len(results)} instance(s) in zone {zone}"
+    if failed:
+        result += f" ({failed} failed)"
+    result += ":\n\n| Instance | Result |\n|---|---|\n"
+
+    for r in results:
+        if r.error is not None:
+            outcome = f"✗ {str(r.error).replace('|', '/')}"
+        else:
+            outcome = f"✓ {r.detail or verb}"
+        result += f"| {r.instance_id} | {outcome} |\n"
+
+    return result
+
+
+async def bulk_server_action(
+    instance_api: Any,
+    zone: str,
+    action: str,
+    instance_ids: Optional[list[str]],
+    tags: Optional[list[str]],
+    concurrency: Optional[int] = None,
+    wait: bool = False,
+) -> str:
+    """Apply a lifecycle action to every selected instance and render the result table.
+
+    Args:
+        instance_api: The Instance API object
+        zone: Zone the instances live in
+        action: One of BULK_ACTIONS ("poweron", "poweroff" or "delete")
+        instance_ids: Explicit instance IDs
+        tags: Tag selector (see :func:`select_instances`)
+        concurrency: Parallelism cap, defaults to SCW_MCP_BULK_CONCURRENCY
+        wait: Wait until each instance reaches its target state
+    """
+    verb, target_state = BULK_ACTIONS[action]
+    selected = await select_instances(instance_api.list_servers, zone, instance_ids, tags)
+    limit = bulk_concurrency(concurrency)
+    logger.info(f"Bulk {action} of {len(selected)} instance(s) in zone {zone} with concurrency {limit}")
+
+    async def apply(instance_id: str) -> None:
+        if action == "delete":
+            call = run_blocking(instance_api.delete_server, zone=zone, server_id=instance_id)
+        else:
+            call = run_blocking(instance_api.server_action, zone=zone, server_id=instance_id, action=action)
+        await write_through(call, resource_tag("instance", zone), resource_tag("instance", zone, instance_id))
+
+    async def wait_for_state(instance_id: str) -> str:
+        outcome = await get_state_poller(instance_api.list_servers).wait_for(
+            zone, instance_id, {target_state}, wait_timeout()
+        )
+        if not outcome.reached:
+            raise TimeoutError(f"{verb}, but still {outcome.state or 'unknown'} after {outcome.elapsed:.0f}s")
+        return f"{outcome.state} after {outcome.elapsed:.0f}s"
+
+    results = await run_bulk(selected, apply, limit, wait_for_state if wait else None)
+    return render_bulk(results, verb, zone)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Read Cache
+Bounded TTL + LRU cache for Scaleway read calls, in-process by default or
+shared by worker processes (see ``scaleway_cache_backends``). Entries are
+tagged with the zone/region and resource they describe so that write tools
+can invalidate exactly what they touched. Identical reads issued while one
+is already in flight share its upstream call (single-flight), across
+workers too when the backend is shared. Shared backends do blocking I/O, so
+the async paths call them on the executor instead of the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+
+from scaleway_cache_backends import CacheBackend, MemoryBackend, create_backend
+from scaleway_executor import run_blocking
+
+logger = logging.getLogger("scaleway-mcp.cache")
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# Seconds a worker may spend loading a key while the others wait for it
+# (shared backends only), and how often the waiting workers check for it
+LEASE_TTL = 30.0
+LEASE_POLL_INTERVAL = 0.05
+
+# Seconds a cached read stays valid, per resource type. Instance state changes
+# often; images are close to static.
+DEFAULT_TTLS = {
+    "instance": 15.0,
+    "image": 300.0,
+    "private_network": 60.0,
+    "k8s_cluster": 30.0,
+}
+
+
+class ResponseCache:
+    """TTL + LRU cache with tag-based invalidation, stored in a pluggable backend."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[dict] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.backend = backend or MemoryBackend(max_entries)
+        # Key -> (load task, its tags) for the reads currently loading
+        self._inflight: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.coalesced = 0
+        self.shared_coalesced = 0
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """Return (found, value) for a key, dropping it if it has expired."""
+        return self.backend.get(key)
+
+    def set(self, key: tuple, value: Any, resource_type: str, tags: Iterable[str] = ()) -> None:
+        """Store a value for the TTL of its resource type, evicting the least recently used entries."""
+        ttl = self.ttls.get(resource_type, 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self.backend.set(key, value, ttl, frozenset(tags))
+
+    def generation(self, tags: Iterable[str]) -> tuple:
+        """Snapshot the invalidation generation of a set of tags."""
+        return self.backend.generation(tuple(tags))
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying one of ``tags``. Returns the number of entries removed."""
+        self.forget_loads(tags)
+        return self._invalidate_backend(*tags)
+
+    def forget_loads(self, tags: Iterable[str]) -> None:
+        """Stop new reads from joining loads carrying one of ``tags``: they may return pre-write data.
+
+        Callers already waiting on those loads keep them.
+        """
+        targets = frozenset(tags)
+        for key in [key for key, (_, load_tags) in self._inflight.items() if load_tags & targets]:
+            del self._inflight[key]
+
+    def _invalidate_backend(self, *tags: str) -> int:
+        targets = frozenset(tags)
+        removed = self.backend.invalidate(targets)
+        self.invalidations += removed
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for {', '.join(sorted(targets))}")
+        return removed
+
+    async def call_backend(self, method: Callable[..., T], *args: Any) -> T:
+        """Call ``method(*args)`` directly for the in-process backend, on the executor for a shared one."""
+        if not self.backend.shared:
+            return method(*args)
+        return await run_blocking(method, *args)
+
+    async def get_async(self, key: tuple) -> tuple[bool, Any]:
+        return await self.call_backend(self.get, key)
+
+    async def set_async(self, key: tuple, value: Any, resource_type: str, tags: Iterable[str] = ()) -> None:
+        await self.call_backend(self.set, key, value, resource_type, tuple(tags))
+
+    async def generation_async(self, tags: Iterable[str]) -> tuple:
+        return await self.call_backend(self.generation, tuple(tags))
+
+    async def invalidate_async(self, *tags: str) -> int:
+        # In-flight loads are only touched on the event loop
+        self.forget_loads(tags)
+        return await self.call_backend(self._invalidate_backend, *tags)
+
+    async def wait_for_load(self, key: tuple) -> tuple[bool, Any]:
+        """Wait for the worker holding the lease on ``key`` to store its value.
+
+        Returns (False, None) if the lease ends, or times out, without a value.
+        """
+        deadline = time.monotonic() + LEASE_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+            found, value = await self.get_async(key)
+            if found:
+                return found, value
+            if not await self.call_backend(self.backend.leased, key):
+                break
+        return False, None
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        backend_stats = self.backend.stats()
+        return {
+            "backend": self.backend.name,
+            "entries": backend_stats.pop("entries", 0),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": backend_stats.pop("evictions", 0),
+            "invalidations": self.invalidations,
+            "in_flight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "shared_coalesced": self.shared_coalesced,
+            **backend_stats,
+        }
+
+
+# Global cache shared by every tool in the process
+response_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> ResponseCache:
+    """Get or create the shared cache, configured from environment variables."""
+    global response_cache
+
+    if response_cache is not None:
+        return response_cache
+
+    max_entries = int(os.getenv("SCW_MCP_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    ttls = {
+        resource_type: float(os.getenv(f"SCW_MCP_CACHE_TTL_{resource_type.upper()}", ttl))
+        for resource_type, ttl in DEFAULT_TTLS.items()
+    }
+    backend = create_backend(os.getenv("SCW_MCP_CACHE_BACKEND", "memory"), max_entries)
+
+    logger.info(f"Initializing {backend.name} response cache with max_entries={max_entries}, ttls={ttls}")
+
+    response_cache = ResponseCache(max_entries=max_entries, ttls=ttls, backend=backend)
+    return response_cache
+
+
+def cache_key(tool: str, scope: str, **args: Any) -> tuple:
+    """Build a cache key from the tool name, zone/region and remaining arguments."""
+    return (tool, scope, tuple(sorted((k, repr(v)) for k, v in args.items())))
+
+
+def resource_tag(resource_type: str, scope: str, resource_id: Optional[str] = None) -> str:
+    """Tag for every listing of a resource type in a zone/region, or for one resource."""
+    tag = f"{resource_type}:{scope}"
+    return f"{tag}:{resource_id}" if resource_id else tag
+
+
+async def read_through(
+    key: tuple,
+    resource_type: str,
+    loader: Callable[[], Awaitable[T]],
+    *,
+    tags: Iterable[str] = (),
+    fresh: bool = False,
+) -> T:
+    """Return the cached value for ``key`` or load, cache and return it.
+
+    Concurrent misses for the same key share one ``loader()`` call. The load
+    runs as its own task, so a caller giving up does not cancel it for the
+    others.
+
+    Args:
+        key: Cache key from :func:`cache_key`
+        resource_type: Selects the TTL (see DEFAULT_TTLS)
+        loader: Coroutine factory performing the upstream call
+        tags: Invalidation tags from :func:`resource_tag`
+        fresh: Skip the cached value and any in-flight load, and reload from the API
+    """
+    cache = get_cache()
+    tags = tuple(tags)
+
+    if not fresh:
+        found, value = await cache.get_async(key)
+        if found:
+            cache.hits += 1
+            return value
+        inflight = cache._inflight.get(key)
+        if inflight is not None:
+            cache.coalesced += 1
+            return await asyncio.shield(inflight[0])
+    cache.misses += 1
+
+    async def load() -> T:
+        generation = await cache.generation_async(tags)
+        leader = fresh or await cache.call_backend(cache.backend.acquire, key, LEASE_TTL)
+        if not leader:
+            # Another worker process is loading the same key; reuse its result
+            found, value = await cache.wait_for_load(key)
+            if found:
+                cache.shared_coalesced += 1
+                return value
+        try:
+            value = await loader()
+            # A write that invalidated these tags while we were loading makes
+            # the result potentially stale; return it but do not cache it.
+            if await cache.generation_async(tags) == generation:
+                await cache.set_async(key, value, resource_type, tags)
+            return value
+        finally:
+            if leader and not fresh:
+                await cache.call_backend(cache.backend.release, key)
+
+    task = asyncio.ensure_future(load())
+    cache._inflight[key] = (task, frozenset(tags))
+
+    def done(finished: asyncio.Future) -> None:
+        inflight = cache._inflight.get(key)
+        if inflight is not None and inflight[0] is finished:
+            del cache._inflight[key]
+        # Mark the exception as retrieved in case every caller gave up
+        if not finished.cancelled():
+            finished.exception()
+
+    task.add_done_callback(done)
+    return await asyncio.shield(task)
+
+
+async def write_through(call: Awaitable[T], *tags: str) -> T:
+    """Await a mutating API call, then invalidate ``tags`` whether or not it succeeded."""
+    try:
+        return await call
+    finally:
+        await get_cache().invalidate_async(*tags)
+
+
+def cache_stats() -> dict:
+    """Return stats for the shared cache."""
+    return get_cache().stats()
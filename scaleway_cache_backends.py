@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Cache Backends
+Storage behind the read cache. The in-process backend serves a single
+worker; the SQLite backend (on /dev/shm when available, i.e. shared memory)
+and the Redis backend are shared by every worker process, so a read cached
+or being loaded by one worker is reused by the others. Shared backends also
+hold short leases so that only one worker loads a given key at a time, and
+store values as tagged JSON (``scaleway_cache_codec``) rather than pickles.
+"""
+
+import abc
+import atexit
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+import scaleway_cache_codec
+from scaleway_cache_codec import CodecError
+
+logger = logging.getLogger("scaleway-mcp.cache")
+
+BACKENDS = ("memory", "sqlite", "redis")
+REDIS_PREFIX = "scaleway-mcp:"
+
+
+def _owner() -> str:
+    """Identifies this worker process among the users of a shared backend."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _dumps(key: Hashable, value: Any) -> Optional[bytes]:
+    """Serialize a value for a shared backend, or None (not cached) if the codec cannot represent it."""
+    try:
+        return scaleway_cache_codec.dumps(value)
+    except CodecError as e:
+        logger.debug(f"Not caching {key!r}: {e}")
+        return None
+
+
+def _loads(key: Hashable, payload: bytes) -> tuple[bool, Any]:
+    """(found, value) for a stored payload; one that cannot be decoded is a miss."""
+    try:
+        return True, scaleway_cache_codec.loads(payload)
+    except CodecError as e:
+        logger.warning(f"Ignoring undecodable cache entry {key!r}: {e}")
+        return False, None
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expires_at: float
+    tags: frozenset
+
+
+class CacheBackend(abc.ABC):
+    """Key/value storage with TTLs, tag invalidation, tag generations and load leases."""
+
+    name = "base"
+    # Whether other worker processes see the same entries
+    shared = False
+
+    @abc.abstractmethod
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (found, value) for a key that has not expired."""
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float, tags: frozenset) -> None:
+        pass
+
+    @abc.abstractmethod
+    def invalidate(self, tags: frozenset) -> int:
+        """Bump the generation of ``tags`` and drop their entries. Returns the number of entries removed."""
+
+    @abc.abstractmethod
+    def generation(self, tags: tuple) -> tuple:
+        """Snapshot the invalidation generation of a set of tags."""
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        """Try to become the one loader of ``key`` for up to ``ttl`` seconds."""
+        return True
+
+    def release(self, key: Hashable) -> None:
+        pass
+
+    def leased(self, key: Hashable) -> bool:
+        """Whether some worker currently holds the lease on ``key``."""
+        return False
+
+    def acquire_or_renew(self, key: Hashable, ttl: float) -> bool:
+        """Take the lease on ``key``, or extend it if this worker already holds it, for ``ttl`` seconds."""
+        return True
+
+    def release_owned(self, key: Hashable) -> None:
+        """Give up the lease on ``key`` if this worker holds it."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """In-process TTL + LRU storage. Values are kept as-is, without serialization."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        # Generations come from one counter, so a tag's generation only grows:
+        # a forgotten tag reports the highest generation forgotten so far
+        self._generations: dict = {}
+        self._last_generation = 0
+        self._forgotten_generation = 0
+        self._prune_at = max_entries
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: float, tags: frozenset) -> None:
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, tags: frozenset) -> int:
+        for tag in tags:
+            self._last_generation += 1
+            self._generations[tag] = self._last_generation
+        stale = [key for key, entry in self._entries.items() if entry.tags & tags]
+        for key in stale:
+            del self._entries[key]
+        if len(self._generations) > self._prune_at:
+            self._prune_generations()
+        return len(stale)
+
+    def _prune_generations(self) -> None:
+        """Forget the generations of the tags no live entry carries."""
+        now = time.monotonic()
+        live = set().union(*(entry.tags for entry in self._entries.values() if entry.expires_at > now))
+        for tag in [tag for tag in self._generations if tag not in live]:
+            self._forgotten_generation = max(self._forgotten_generation, self._generations.pop(tag))
+        self._prune_at = max(self.max_entries, 2 * len(self._generations))
+
+    def generation(self, tags: tuple) -> tuple:
+        return tuple(self._generations.get(tag, self._forgotten_generation) for tag in tags)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "evictions": self.evictions}
+
+
+class SQLiteBackend(CacheBackend):
+    """Storage in a SQLite database shared by the worker processes of one host.
+
+    Values are stored as tagged JSON. When the cache is full, the entries closest to
+    expiring are dropped first.
+    """
+
+    name = "sqlite"
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS entry_tags (tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key));
+        CREATE TABLE IF NOT EXISTS generations (tag TEXT PRIMARY KEY, generation INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires_at REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS owned_leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at);
+    """
+
+    # Expired entries are swept every this many writes
+    SWEEP_INTERVAL = 100
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per process; a connection must not cross a fork
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(self.SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (repr(key), time.time())
+            ).fetchone()
+        if row is None:
+            return False, None
+        return _loads(key, row[0])
+
+    def set(self, key: Hashable, value: Any, ttl: float, tags: frozenset) -> None:
+        name = repr(key)
+        payload = _dumps(key, value)
+        if payload is None:
+            return
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (name, payload, now + ttl))
+                db.executemany("INSERT OR IGNORE INTO entry_tags VALUES (?, ?)", [(tag, name) for tag in tags])
+                self._writes += 1
+                if self._writes % self.SWEEP_INTERVAL == 0:
+                    db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                    db.execute("DELETE FROM entry_tags WHERE key NOT IN (SELECT key FROM entries)")
+                    db.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+                (count,) = db.execute("SELECT COUNT(*) FROM entries").fetchone()
+                if count > self.max_entries:
+                    excess = count - self.max_entries
+                    db.execute(
+                        "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires_at LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += excess
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, tags: frozenset) -> int:
+        tags = sorted(tags)
+        marks = ", ".join("?" * len(tags))
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    "INSERT INTO generations VALUES (?, 1) ON CONFLICT (tag) DO UPDATE SET generation = generation + 1",
+                    [(tag,) for tag in tags],
+                )
+                removed = db.execute(
+                    f"DELETE FROM entries WHERE key IN (SELECT key FROM entry_tags WHERE tag IN ({marks}))", tags
+                ).rowcount
+                db.execute(f"DELETE FROM entry_tags WHERE tag IN ({marks})", tags)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return removed
+
+    def generation(self, tags: tuple) -> tuple:
+        if not tags:
+            return ()
+        with self._lock:
+            rows = dict(self._db().execute(
+                f"SELECT tag, generation FROM generations WHERE tag IN ({', '.join('?' * len(tags))})", tags
+            ).fetchall())
+        return tuple(rows.get(tag, 0) for tag in tags)
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        name = repr(key)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM leases WHERE key = ? AND expires_at <= ?", (name, now))
+                acquired = db.execute("INSERT OR IGNORE INTO leases VALUES (?, ?)", (name, now + ttl)).rowcount == 1
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return acquired
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM leases WHERE key = ?", (repr(key),))
+
+    def leased(self, key: Hashable) -> bool:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT 1 FROM leases WHERE key = ? AND expires_at > ?", (repr(key), time.time())
+            ).fetchone()
+        return row is not None
+
+    def acquire_or_renew(self, key: Hashable, ttl: float) -> bool:
+        name, owner = repr(key), _owner()
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM owned_leases WHERE key = ? AND expires_at <= ?", (name, now))
+                db.execute(
+                    "INSERT INTO owned_leases VALUES (?, ?, ?) ON CONFLICT (key) "
+                    "DO UPDATE SET expires_at = excluded.expires_at WHERE owner = excluded.owner",
+                    (name, owner, now + ttl),
+                )
+                (holder,) = db.execute("SELECT owner FROM owned_leases WHERE key = ?", (name,)).fetchone()
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return holder == owner
+
+    def release_owned(self, key: Hashable) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM owned_leases WHERE key = ? AND owner = ?", (repr(key), _owner()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db().executescript("DELETE FROM entries; DELETE FROM entry_tags;")
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._db().execute(
+                "SELECT COUNT(*) FROM entries WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return {"entries": count, "evictions": self.evictions, "path": self.path}
+
+
+class RedisBackend(CacheBackend):
+    """Storage in Redis, or anything speaking its protocol, shared by workers on any host.
+
+    ``client`` is a redis-py style client; only GET, SET (NX/PX), MGET,
+    DEL, EXISTS, INCR, SADD, SMEMBERS, PEXPIRE and SCAN are used. Values are
+    stored as tagged JSON, so whoever can write to the server cannot make the
+    workers run code, and expire through Redis TTLs, so ``max_entries`` is left to the
+    server's eviction policy.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, client: Any, prefix: str = REDIS_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SCW_MCP_CACHE_BACKEND=redis requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url))
+
+    def _entry(self, key: Hashable) -> str:
+        return f"{self.prefix}entry:{key!r}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _generation(self, tag: str) -> str:
+        return f"{self.prefix}generation:{tag}"
+
+    def _lease(self, key: Hashable) -> str:
+        return f"{self.prefix}lease:{key!r}"
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        payload = self.client.get(self._entry(key))
+        if payload is None:
+            return False, None
+        return _loads(key, payload)
+
+    def set(self, key: Hashable, value: Any, ttl: float, tags: frozenset) -> None:
+        name = self._entry(key)
+        payload = _dumps(key, value)
+        if payload is None:
+            return
+        ttl_ms = max(1, int(ttl * 1000))
+        self.client.set(name, payload, px=ttl_ms)
+        for tag in tags:
+            self.client.sadd(self._tag(tag), name)
+            self.client.pexpire(self._tag(tag), ttl_ms)
+
+    def invalidate(self, tags: frozenset) -> int:
+        removed = 0
+        for tag in tags:
+            self.client.incr(self._generation(tag))
+            names = list(self.client.smembers(self._tag(tag)))
+            if names:
+                removed += self.client.delete(*names)
+            self.client.delete(self._tag(tag))
+        return removed
+
+    def generation(self, tags: tuple) -> tuple:
+        if not tags:
+            return ()
+        values = self.client.mget([self._generation(tag) for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        return bool(self.client.set(self._lease(key), os.getpid(), nx=True, px=max(1, int(ttl * 1000))))
+
+    def release(self, key: Hashable) -> None:
+        self.client.delete(self._lease(key))
+
+    def leased(self, key: Hashable) -> bool:
+        return bool(self.client.exists(self._lease(key)))
+
+    def acquire_or_renew(self, key: Hashable, ttl: float) -> bool:
+        name, owner = self._lease(key), _owner()
+        ttl_ms = max(1, int(ttl * 1000))
+        if self.client.set(name, owner, nx=True, px=ttl_ms):
+            return True
+        holder = self.client.get(name)
+        if isinstance(holder, bytes):
+            holder = holder.decode()
+        if holder != owner:
+            return False
+        self.client.pexpire(name, ttl_ms)
+        return True
+
+    def release_owned(self, key: Hashable) -> None:
+        holder = self.client.get(self._lease(key))
+        if isinstance(holder, bytes):
+            holder = holder.decode()
+        if holder == _owner():
+            self.client.delete(self._lease(key))
+
+    def clear(self) -> None:
+        # Entries expire on their own; other workers may be using the keyspace
+        pass
+
+    def stats(self) -> dict:
+        # Evictions are up to the server's policy and not reported to clients
+        entries = sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}entry:*", count=1000))
+        return {"entries": entries, "evictions": 0}
+
+
+def default_sqlite_path(owner: int) -> str:
+    """Database path for the workers of one server process: in shared memory when available."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"scaleway-mcp-cache-{owner}.sqlite")
+
+
+def create_backend(name: str, max_entries: int) -> CacheBackend:
+    """Create the backend named ``name``, configured from environment variables."""
+    if name == "memory":
+        return MemoryBackend(max_entries)
+    if name == "sqlite":
+        path = os.getenv("SCW_MCP_CACHE_PATH")
+        if not path:
+            path = default_sqlite_path(os.getpid())
+            atexit.register(_remove_database, path)
+        return SQLiteBackend(path, max_entries)
+    if name == "redis":
+        return RedisBackend.from_url(os.getenv("SCW_MCP_REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown cache backend '{name}'. Use one of: {', '.join(BACKENDS)}")
+
+
+def share_cache_between_workers(workers: int) -> None:
+    """Point the cache of ``workers`` worker processes at one shared backend.
+
+    Called by the server process before starting its workers, which inherit
+    the environment. The in-process backend is replaced by SQLite, and a
+    SQLite database private to this server is created and removed on exit.
+    """
+    if workers <= 1:
+        return
+    if os.getenv("SCW_MCP_CACHE_BACKEND", "memory") == "memory":
+        logger.info(f"Using the SQLite cache backend shared by {workers} workers")
+        os.environ["SCW_MCP_CACHE_BACKEND"] = "sqlite"
+    if os.environ["SCW_MCP_CACHE_BACKEND"] == "sqlite" and not os.getenv("SCW_MCP_CACHE_PATH"):
+        path = default_sqlite_path(os.getpid())
+        os.environ["SCW_MCP_CACHE_PATH"] = path
+        atexit.register(_remove_database, path)
+
+
+def _remove_database(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Cache Value Codec
+Serializes cached values for the shared cache backends as tagged JSON. Unlike
+pickle, decoding never calls arbitrary code: it only rebuilds containers,
+datetimes, enums, named tuples and plain objects of the Scaleway SDK and of
+this server's own modules, so a shared Redis or SQLite store cannot be used
+to run code in the server.
+"""
+
+import importlib
+import json
+import sys
+import types
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+
+class CodecError(ValueError):
+    """Raised for values that cannot be encoded, or payloads that cannot be decoded."""
+
+
+def _allowed(module: str) -> bool:
+    return module == "scaleway" or module.startswith(("scaleway.", "scaleway_"))
+
+
+def _class_name(cls: type) -> str:
+    if not _allowed(cls.__module__):
+        raise CodecError(f"{cls.__module__}.{cls.__qualname__} values cannot be stored in a shared cache")
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve(name: Any) -> type:
+    """The class named ``module:qualname``: from the SDK, or from an already loaded module of this server."""
+    if not isinstance(name, str) or ":" not in name:
+        raise CodecError(f"Invalid class name {name!r}")
+    module_name, qualname = name.split(":", 1)
+    if not _allowed(module_name):
+        raise CodecError(f"Refusing to load {name}")
+    module = sys.modules.get(module_name)
+    if module is None:
+        if not module_name.startswith(("scaleway.", "scaleway_core.")):
+            raise CodecError(f"Module {module_name} is not loaded")
+        module = importlib.import_module(module_name)
+    value: Any = module
+    for part in qualname.split("."):
+        value = getattr(value, part, None)
+    # Only classes defined where the name says: no detour through an imported module
+    if not isinstance(value, type) or issubclass(value, type) or (value.__module__, value.__qualname__) != (module_name, qualname):
+        raise CodecError(f"{name} is not a class of {module_name}")
+    return value
+
+
+def _encode(value: Any) -> Any:
+    if value is None or type(value) in (bool, int, float, str):
+        return value
+    if isinstance(value, Enum):
+        return {"$enum": _class_name(type(value)), "value": value.value}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {"$namedtuple": _class_name(type(value)), "items": [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {"$tuple": [_encode(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"$frozenset" if isinstance(value, frozenset) else "$set": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {"$dict": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, types.SimpleNamespace):
+        return {"$namespace": {name: _encode(item) for name, item in vars(value).items()}}
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return {"$object": _class_name(type(value)), "state": {name: _encode(item) for name, item in vars(value).items()}}
+    raise CodecError(f"{type(value).__qualname__} values cannot be stored in a shared cache")
+
+
+def _decode(data: Any) -> Any:
+    if data is None or type(data) in (bool, int, float, str):
+        return data
+    if isinstance(data, list):
+        return [_decode(item) for item in data]
+    if not isinstance(data, dict):
+        raise CodecError(f"Unexpected {type(data).__name__} in cached payload")
+
+    if "$datetime" in data:
+        return datetime.fromisoformat(data["$datetime"])
+    if "$date" in data:
+        return date.fromisoformat(data["$date"])
+    if "$tuple" in data:
+        return tuple(_decode(item) for item in data["$tuple"])
+    if "$set" in data:
+        return {_decode(item) for item in data["$set"]}
+    if "$frozenset" in data:
+        return frozenset(_decode(item) for item in data["$frozenset"])
+    if "$dict" in data:
+        return {_decode(k): _decode(v) for k, v in data["$dict"]}
+    if "$namespace" in data:
+        return types.SimpleNamespace(**{name: _decode(item) for name, item in data["$namespace"].items()})
+    if "$enum" in data:
+        cls = _resolve(data["$enum"])
+        if not issubclass(cls, Enum):
+            raise CodecError(f"{data['$enum']} is not an enum")
+        return cls(data["value"])
+    if "$namedtuple" in data:
+        cls = _resolve(data["$namedtuple"])
+        if not (issubclass(cls, tuple) and hasattr(cls, "_fields")):
+            raise CodecError(f"{data['$namedtuple']} is not a named tuple")
+        return cls._make(_decode(item) for item in data["items"])
+    if "$object" in data:
+        cls = _resolve(data["$object"])
+        # A finalizer would run on attributes read from the store
+        if issubclass(cls, (tuple, Enum, BaseException)) or hasattr(cls, "__del__"):
+            raise CodecError(f"{data['$object']} is not a plain class")
+        # Restore the attributes without calling __init__, as unpickling does
+        value = object.__new__(cls)
+        value.__dict__.update({name: _decode(item) for name, item in data["state"].items()})
+        return value
+    raise CodecError(f"Unknown tag in cached payload: {', '.join(data)}")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a cached value. Raises CodecError for values the codec cannot represent."""
+    return json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+
+
+def loads(payload: bytes) -> Any:
+    """Rebuild a value serialized by :func:`dumps`. Raises CodecError for anything else."""
+    try:
+        data = json.loads(payload)
+    except ValueError as e:
+        raise CodecError(f"Invalid cached payload: {e}") from None
+    return _decode(data)
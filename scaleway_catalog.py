@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Tool Catalog
+Builds the HTTP server's ``tools/list`` catalog once, from the tool
+definitions in ``scaleway_tool_definitions``, and keeps it pre-serialized with an ETag so
+repeated discovery costs a byte copy (or a 304) instead of a rebuild.
+"""
+
+import hashlib
+import inspect
+import json
+import re
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from mcp.types import Tool
+
+_ARG_LINE = re.compile(r"^(\w+):\s*(.*)$")
+
+
+def parse_docstring(doc: str) -> tuple[str, dict[str, str]]:
+    """Split a tool docstring into its summary line and its ``Args:`` descriptions."""
+    lines = inspect.cleandoc(doc or "").splitlines()
+    summary = lines[0].rstrip(".") if lines else ""
+    args: dict[str, str] = {}
+    current = None
+    in_args = False
+    for line in lines[1:]:
+        stripped = line.strip()
+        if stripped == "Args:":
+            in_args = True
+            continue
+        if not in_args or not stripped:
+            continue
+        match = _ARG_LINE.match(stripped)
+        if match and line.startswith(" " * 4) and not line.startswith(" " * 8):
+            current = match.group(1)
+            args[current] = match.group(2)
+        elif current is not None:
+            args[current] += " " + stripped
+    return summary, args
+
+
+def _property_schema(schema: dict, description: Optional[str]) -> dict:
+    """Simplify a pydantic property schema: drop titles and collapse ``X | None`` to ``X``."""
+    schema = {key: value for key, value in schema.items() if key != "title"}
+    variants = schema.pop("anyOf", None)
+    if variants is not None:
+        types = [variant for variant in variants if variant.get("type") != "null"]
+        if len(types) == 1:
+            schema = {**types[0], **schema}
+        else:
+            schema["anyOf"] = types
+    if schema.get("default", 0) is None:
+        del schema["default"]
+    if description:
+        schema["description"] = description
+    return schema
+
+
+def tool_from_definition(definition: Callable[..., Any], implementation: Callable[..., Any]) -> "Tool":
+    """Describe ``implementation`` with the schema and docstring of its tool definition.
+
+    The schema is the one FastMCP derives from the definition's signature.
+
+    Raises:
+        ValueError: if the implementation does not take the same arguments as the definition.
+    """
+    from mcp.server.fastmcp.utilities.func_metadata import func_metadata
+    from mcp.types import Tool
+
+    parameters = func_metadata(definition).arg_model.model_json_schema(by_alias=True)
+    expected = list(parameters.get("properties", {}))
+    actual = list(inspect.signature(implementation).parameters)
+    if actual != expected:
+        raise ValueError(
+            f"Tool {definition.__name__} takes ({', '.join(actual)}) but is defined with ({', '.join(expected)})"
+        )
+
+    summary, descriptions = parse_docstring(definition.__doc__)
+    schema: dict = {
+        "type": "object",
+        "properties": {
+            name: _property_schema(prop, descriptions.get(name))
+            for name, prop in parameters.get("properties", {}).items()
+        },
+    }
+    if parameters.get("required"):
+        schema["required"] = list(parameters["required"])
+    return Tool(name=definition.__name__, description=summary, inputSchema=schema)
+
+
+class ToolCatalog:
+    """A ``tools/list`` result serialized once and identified by an ETag."""
+
+    def __init__(self, tools: list["Tool"]):
+        self.tools = tools
+        self.result = {"tools": [tool.model_dump(exclude_none=True) for tool in tools]}
+        self.encoded = json.dumps(self.result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.encoded).hexdigest()[:32]}"'
+
+    def response(self, request_id: Any) -> bytes:
+        """The JSON-RPC response to a ``tools/list`` request, splicing in its id."""
+        return b'{"jsonrpc":"2.0","id":' + json.dumps(request_id).encode("utf-8") + b',"result":' + self.encoded + b"}"
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header names the current catalog."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags
+
+
+def build_catalog(definitions: dict[str, Callable[..., Any]], registry: dict[str, Callable[..., Any]]) -> ToolCatalog:
+    """Build the catalog of every tool in ``registry``, in registry order, from its definition."""
+    missing = [name for name in registry if name not in definitions]
+    if missing:
+        raise ValueError(f"No tool definition for {', '.join(missing)}")
+    return ToolCatalog([tool_from_definition(definitions[name], func) for name, func in registry.items()])
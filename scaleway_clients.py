@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - API Client Manager
+Long-lived Scaleway API objects sharing one pooled keep-alive HTTP session,
+so tool calls reuse TLS connections to the Scaleway API instead of opening
+a new one per request. With the async transport enabled, the API objects
+are wrapped so the methods it serves run on the event loop instead.
+"""
+
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from urllib.parse import urlparse
+
+import requests
+import scaleway_core.api
+import urllib3.connection
+import urllib3.util.connection
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from scaleway_async_http import AsyncAPI, AsyncTransport, get_async_transport
+from scaleway_metrics import track_upstream
+from scaleway_ratelimit import UpstreamLimiter, get_rate_limiter
+from scaleway_timing import timed_phase
+
+if TYPE_CHECKING:
+    from scaleway import Client
+    from scaleway.instance.v1.api import InstanceV1API
+    from scaleway.k8s.v1.api import K8SV1API
+    from scaleway.vpc.v2.api import VpcV2API
+
+logger = logging.getLogger("scaleway-mcp.clients")
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_DNS_TTL = 60.0
+
+
+class DNSCache:
+    """TTL cache of address lookups for a fixed set of hostnames."""
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL):
+        self.ttl = ttl
+        self.hosts: set[str] = set()
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Return the addresses of ``host``, resolving it at most once per TTL."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        family = urllib3.util.connection.allowed_gai_family()
+        addresses = []
+        for *_, sockaddr in socket.getaddrinfo(host, port, family, socket.SOCK_STREAM):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+
+        with self._lock:
+            self._entries[(host, port)] = (addresses, now + self.ttl)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"ttl": self.ttl, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+dns_cache = DNSCache()
+
+
+class _CachedDNSConnection:
+    """urllib3 connection mixin connecting to the addresses :data:`dns_cache` holds for its host.
+
+    Only the TCP connect uses the cached address; TLS still verifies the
+    original hostname.
+    """
+
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        if host not in dns_cache.hosts or dns_cache.ttl <= 0:
+            return super()._new_conn()  # type: ignore[misc]
+        try:
+            addresses = dns_cache.resolve(host, self.port)
+        except OSError:
+            # Let urllib3 resolve the host and report the failure its own way
+            return super()._new_conn()  # type: ignore[misc]
+
+        try:
+            for ip in addresses:
+                self._dns_host = ip
+                try:
+                    return super()._new_conn()  # type: ignore[misc]
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    logger.debug(f"Connection to {host} via {ip} failed: {e}")
+        finally:
+            self._dns_host = host
+
+        # Every cached address failed; the records may have moved
+        dns_cache.forget(host, self.port)
+        return super()._new_conn()  # type: ignore[misc]
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnection, urllib3.connection.HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnection, urllib3.connection.HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class _CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve hosts through :data:`dns_cache`.
+
+    Mounted on the manager's session only, so other HTTP clients in the
+    process resolve names as usual.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSHTTPConnectionPool,
+            "https": _CachedDNSHTTPSConnectionPool,
+        }
+
+
+class _SessionRequests:
+    """Stand-in for the ``requests`` module used inside ``scaleway_core.api``.
+
+    The SDK calls ``requests.request(...)`` directly, which opens a new
+    connection every time (as of the ``scaleway-core`` version pinned in
+    pyproject.toml); this routes those calls through a shared session,
+    applies default timeouts, records latency metrics and, when given a
+    limiter, rate limits and retries them.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        timeout: tuple[float, float],
+        limiter: Optional[UpstreamLimiter] = None,
+    ):
+        self.session = session
+        self.timeout = timeout
+        self.limiter = limiter
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        if self.limiter is None:
+            return self._send(method, url, **kwargs)
+        return self.limiter.send(self._send, method, url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        with track_upstream(method, url) as outcome, timed_phase("upstream"):
+            response = self.session.request(method, url, **kwargs)
+            outcome["status"] = response.status_code
+            return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+
+class ClientManager:
+    """Holds the Scaleway client, its API objects and the pooled HTTP session."""
+
+    def __init__(
+        self,
+        client: "Client",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        async_transport: Optional[AsyncTransport] = None,
+    ):
+        self.client = client
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.async_transport = async_transport
+        if async_transport is not None:
+            async_transport.verify = not client.api_allow_insecure
+
+        self.session = requests.Session()
+        adapter = _CachedDNSAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._apis: dict = {}
+
+    def install(self) -> None:
+        """Route every Scaleway SDK request in this process through the pooled, rate-limited session."""
+        api_host = urlparse(self.client.api_url).hostname
+        if api_host:
+            dns_cache.hosts.add(api_host)
+        scaleway_core.api.requests = _SessionRequests(
+            self.session, (self.connect_timeout, self.read_timeout), get_rate_limiter()
+        )
+
+    def _api(self, module: str, name: str) -> Any:
+        api = self._apis.get(name)
+        if api is None:
+            with self._lock:
+                api = self._apis.get(name)
+                if api is None:
+                    # SDK API modules take tens of milliseconds each to
+                    # import, so only the ones a tool uses are loaded
+                    api_class = getattr(importlib.import_module(module), name)
+                    api = api_class(self.client)
+                    if self.async_transport is not None:
+                        api = AsyncAPI(api, self.async_transport)
+                    self._apis[name] = api
+        return api
+
+    @property
+    def instance(self) -> "InstanceV1API":
+        return self._api("scaleway.instance.v1.api", "InstanceV1API")
+
+    @property
+    def vpc(self) -> "VpcV2API":
+        return self._api("scaleway.vpc.v2.api", "VpcV2API")
+
+    @property
+    def k8s(self) -> "K8SV1API":
+        return self._api("scaleway.k8s.v1.api", "K8SV1API")
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "dns_cache": dns_cache.stats(),
+            "backend": "httpx" if self.async_transport is not None else "requests",
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# Global client manager shared by every tool in the process
+client_manager: Optional[ClientManager] = None
+
+
+def get_client_manager(client_factory: Callable[[], "Client"]) -> ClientManager:
+    """Get or create the shared client manager.
+
+    Args:
+        client_factory: Returns the configured Scaleway client (e.g. ``get_scaleway_client``)
+    """
+    global client_manager
+
+    if client_manager is not None:
+        return client_manager
+
+    pool_size = int(os.getenv("SCW_MCP_HTTP_POOL_SIZE", os.getenv("SCW_MCP_MAX_WORKERS", DEFAULT_POOL_SIZE)))
+    connect_timeout = float(os.getenv("SCW_MCP_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+    read_timeout = float(os.getenv("SCW_MCP_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+    dns_cache.ttl = float(os.getenv("SCW_MCP_DNS_TTL", DEFAULT_DNS_TTL))
+
+    logger.info(
+        f"Initializing API client manager with pool_size={pool_size}, "
+        f"timeouts=({connect_timeout}s, {read_timeout}s), dns_ttl={dns_cache.ttl}s"
+    )
+
+    manager = ClientManager(
+        client_factory(),
+        pool_size=pool_size,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        async_transport=get_async_transport(),
+    )
+    manager.install()
+    client_manager = manager
+    return client_manager
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Blocking Call Executor
+Runs synchronous Scaleway SDK calls on a bounded thread pool so that the
+asyncio event loop (FastMCP or uvicorn) keeps serving other requests while
+an upstream API call is in flight. Calls of the async transport
+(``scaleway_async_http``) are awaited on the event loop instead.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from scaleway_timing import record_phase, timed_phase
+
+logger = logging.getLogger("scaleway-mcp.executor")
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_CALL_TIMEOUT = 30.0
+
+
+class UpstreamTimeoutError(TimeoutError):
+    """Raised when a blocking Scaleway API call exceeds its timeout."""
+
+
+class BlockingExecutor:
+    """Bounded thread pool for blocking SDK calls, with per-call timeouts."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, call_timeout: float = DEFAULT_CALL_TIMEOUT):
+        self.max_workers = max_workers
+        self.call_timeout = call_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scaleway-sdk")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._awaited = 0
+
+    def _invoke(self, func: Callable[..., T], args: tuple, kwargs: dict, submitted: float) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        record_phase("queue", time.perf_counter() - submitted)
+        try:
+            with timed_phase("blocking"):
+                result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Args:
+            func: Blocking callable, usually a bound Scaleway SDK method
+            timeout: Seconds to wait before giving up. Defaults to the executor's call timeout.
+        """
+        with self._lock:
+            self._queued += 1
+        # Run in a copy of the caller's context so request-scoped state
+        # (timing, progress) is visible from the worker thread
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, self._invoke, func, args, kwargs, time.perf_counter())
+
+        limit = self.call_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=limit)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # A call that never left the queue can be dropped; a running worker
+            # thread cannot be interrupted, so it finishes in the background
+            # and its result is discarded.
+            with self._lock:
+                if future.cancel():
+                    self._queued -= 1
+                if isinstance(e, asyncio.TimeoutError):
+                    self._timed_out += 1
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            name = getattr(getattr(func, "func", func), "__name__", repr(func))
+            raise UpstreamTimeoutError(f"Scaleway API call {name} timed out after {limit:g}s") from None
+
+    async def run_async(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Await the coroutine function ``func(*args, **kwargs)`` under the same call timeout, without a thread."""
+        with self._lock:
+            self._awaited += 1
+        limit = self.call_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(func(*args, **kwargs), timeout=limit)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            name = getattr(getattr(func, "func", func), "__name__", repr(func))
+            raise UpstreamTimeoutError(f"Scaleway API call {name} timed out after {limit:g}s") from None
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue depth and call counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "call_timeout": self.call_timeout,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "awaited": self._awaited,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global executor shared by every tool in the process
+blocking_executor: Optional[BlockingExecutor] = None
+
+
+def get_executor() -> BlockingExecutor:
+    """Get or create the shared executor, sized from environment variables."""
+    global blocking_executor
+
+    if blocking_executor is not None:
+        return blocking_executor
+
+    max_workers = int(os.getenv("SCW_MCP_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+    call_timeout = float(os.getenv("SCW_MCP_CALL_TIMEOUT", DEFAULT_CALL_TIMEOUT))
+
+    logger.info(f"Initializing blocking executor with max_workers={max_workers}, call_timeout={call_timeout}s")
+
+    blocking_executor = BlockingExecutor(max_workers=max_workers, call_timeout=call_timeout)
+    return blocking_executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+    """Run a blocking SDK call on the shared executor, or await it if it is async-native."""
+    if inspect.iscoroutinefunction(func):
+        return await get_executor().run_async(func, *args, timeout=timeout, **kwargs)
+    return await get_executor().run(func, *args, timeout=timeout, **kwargs)
+
+
+def executor_stats() -> dict:
+    """Return stats for the shared executor."""
+    return get_executor().stats()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Zone/Region Fan-out
+Helpers for running one listing concurrently across several Scaleway zones
+or regions and merging the results, including partial failures.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterator, NamedTuple, Optional
+
+from scaleway_core.bridge.region import ALL_REGIONS
+from scaleway_core.bridge.zone import ALL_ZONES
+
+from scaleway_pagination import staleness_note
+from scaleway_progress import report_progress
+
+logger = logging.getLogger("scaleway-mcp.fanout")
+
+ALL_TARGETS = "all"
+
+
+class FanOutResult(NamedTuple):
+    """Outcome of a fan-out call for a single zone or region."""
+
+    target: str
+    items: list
+    error: Optional[Exception]
+    total_count: Optional[int] = None
+    next_cursor: Optional[str] = None
+    as_of: Optional[float] = None
+    # total_count counts the matches on one locally filtered page (see Page.filtered)
+    filtered: bool = False
+
+
+def _resolve(value: Optional[str], default: str, known: list[str]) -> list[str]:
+    if not value:
+        return [default]
+    if value.strip().lower() == ALL_TARGETS:
+        return list(known)
+
+    targets: list[str] = []
+    for part in value.split(","):
+        part = part.strip()
+        if part and part not in targets:
+            targets.append(part)
+    return targets or [default]
+
+
+def resolve_zones(zone: Optional[str], default_zone: str) -> list[str]:
+    """Expand a zone argument ("fr-par-1", "fr-par-1,nl-ams-1" or "all") into a list of zones."""
+    return _resolve(zone, default_zone, ALL_ZONES)
+
+
+def resolve_regions(region: Optional[str], default_region: str) -> list[str]:
+    """Expand a region argument ("fr-par", "fr-par,nl-ams" or "all") into a list of regions."""
+    return _resolve(region, default_region, ALL_REGIONS)
+
+
+def zone_region(zone: str) -> str:
+    """The region of a zone ("fr-par-1" -> "fr-par")."""
+    return zone.rsplit("-", 1)[0]
+
+
+def region_zones(region: str) -> list[str]:
+    """The zones of a region ("fr-par" -> fr-par-1, fr-par-2, ...)."""
+    return [zone for zone in ALL_ZONES if zone_region(zone) == region]
+
+
+async def fan_out(targets: list[str], fetch: Callable[[str], Awaitable[Any]]) -> list[FanOutResult]:
+    """Run ``fetch(target)`` for every target concurrently.
+
+    ``fetch`` returns either a list of items or a :class:`scaleway_pagination.Page`.
+    Results are returned in the order of ``targets``. A failing target does not
+    abort the others; its exception is recorded in the result instead.
+    """
+    completed = 0
+
+    async def tracked(target: str) -> Any:
+        # Report each zone/region as it finishes so streaming clients see
+        # partial results before the slowest one completes.
+        nonlocal completed
+        try:
+            outcome = await fetch(target)
+        except Exception as e:
+            completed += 1
+            await report_progress(completed, len(targets), f"{target}: failed ({e})")
+            raise
+        completed += 1
+        count = len(outcome) if isinstance(outcome, list) else outcome.total_count
+        await report_progress(completed, len(targets), f"{target}: {count} item(s)")
+        return outcome
+
+    outcomes = await asyncio.gather(*(tracked(target) for target in targets), return_exceptions=True)
+
+    results = []
+    for target, outcome in zip(targets, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning(f"Fan-out call failed for {target}: {outcome}")
+            results.append(FanOutResult(target, [], outcome))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        elif isinstance(outcome, list):
+            results.append(FanOutResult(target, outcome, None))
+        else:
+            results.append(FanOutResult(
+                target, outcome.items, None, outcome.total_count, outcome.next_cursor, outcome.as_of, outcome.filtered
+            ))
+    return results
+
+
+def render_fan_out(
+    results: list[FanOutResult],
+    noun: str,
+    scope: str,
+    format_item: Callable[[Any], str],
+) -> str:
+    """Render merged fan-out results with one section per zone/region.
+
+    Args:
+        results: Output of :func:`fan_out`
+        noun: What is being listed, e.g. "instance(s)"
+        scope: "zone" or "region"
+        format_item: Renders one item as markdown
+    """
+    return "".join(_iter_fan_out(results, noun, scope, format_item))
+
+
+def _iter_fan_out(
+    results: list[FanOutResult],
+    noun: str,
+    scope: str,
+    format_item: Callable[[Any], str],
+) -> Iterator[str]:
+    def count(r: FanOutResult) -> int:
+        return r.total_count if r.total_count is not None else len(r.items)
+
+    total = sum(count(r) for r in results if r.error is None)
+    failed = [r for r in results if r.error is not None]
+
+    yield f"Found {total} {noun} across {len(results)} {scope}(s)"
+    if any(r.filtered and r.next_cursor is not None for r in results):
+        yield " on the pages fetched so far"
+    if failed:
+        yield f" ({len(failed)} {scope}(s) failed)"
+    yield ":\n\n"
+
+    for r in results:
+        if r.error is not None:
+            yield f"### {r.target}: Error: {r.error}\n\n"
+            continue
+
+        yield f"### {r.target} ({count(r)} {noun}{' on this page' if r.filtered else ''})\n\n"
+        yield from map(format_item, r.items)
+        if r.next_cursor is not None:
+            more = "More pages remain" if r.filtered else f"... and {count(r) - len(r.items)} more"
+            yield f"{more} in {r.target}. To continue, call again with cursor=\"{r.next_cursor}\".\n\n"
+        if r.as_of is not None:
+            yield staleness_note(r.as_of) + "\n"
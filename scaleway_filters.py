@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - List Filters
+Turns list tool filter arguments into a plan: the predicates the Scaleway
+API supports are pushed down as list call arguments (and part of the cache
+key), and the rest are applied locally to each page after the cache. Every
+pushed-down filter also has a local equivalent, used to filter listings that
+did not come from the filtered API call (the background inventory).
+"""
+
+import importlib
+from typing import Any, NamedTuple, Optional
+
+from scaleway_pagination import Page
+
+
+class FilterPlan(NamedTuple):
+    """Filters split into API arguments and local predicates."""
+
+    api_args: dict
+    # (argument, value, predicate) for each filter the API does not support
+    local: tuple = ()
+    # (argument, value, predicate) reproducing each of api_args locally
+    pushed: tuple = ()
+
+    def matches(self, item: Any) -> bool:
+        return all(predicate(item) for _, _, predicate in self.local)
+
+    def matches_all(self, item: Any) -> bool:
+        """Whether an item passes every filter, including the ones normally left to the API."""
+        return all(predicate(item) for _, _, predicate in self.pushed) and self.matches(item)
+
+    def apply(self, listing: Page) -> Page:
+        """Drop the items of a page that fail a local predicate.
+
+        The upstream total counts unfiltered items, so a page of a longer
+        listing is marked ``filtered`` and counts its own matches instead.
+        """
+        if not self.local:
+            return listing
+        items = [item for item in listing.items if self.matches(item)]
+        complete = listing.page == 1 and listing.next_cursor is None
+        return listing._replace(items=items, total_count=len(items), filtered=not complete)
+
+
+def _split(value: Optional[str]) -> list[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _check_states(states: list[str], module: str, enum: str, label: str) -> None:
+    if not states:
+        return
+    valid = [str(member) for member in getattr(importlib.import_module(module), enum)]
+    unknown = [state for state in states if state not in valid]
+    if unknown:
+        raise ValueError(f"Unknown {label} {', '.join(unknown)}. Valid values: {', '.join(valid)}")
+
+
+def _push(api_args: dict, pushed: list, argument: str, value: Any, predicate) -> None:
+    api_args[argument] = value
+    pushed.append((argument, value, predicate))
+
+
+def _name_contains(name: str):
+    return lambda item, name=name.lower(): name in (item.name or "").lower()
+
+
+def _has_tags(tags: list[str]):
+    return lambda item, tags=frozenset(tags): tags.issubset(item.tags or [])
+
+
+def _equals(attribute: str, value: Any):
+    return lambda item: getattr(item, attribute, None) == value
+
+
+def _prefix(value: str) -> Optional[str]:
+    """The prefix of a trailing-wildcard pattern such as "GP1-*", or None for an exact value."""
+    return value[:-1] if value.endswith("*") else None
+
+
+def instance_filters(
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    state: Optional[str] = None,
+    commercial_type: Optional[str] = None,
+    private_network: Optional[str] = None,
+    arch: Optional[str] = None,
+) -> FilterPlan:
+    """Plan ``list_servers`` filters.
+
+    The API filters on name (substring), tags (all of them), one state, one
+    exact commercial type and private network. Several states, commercial
+    type prefixes ("GP1-*") and architecture are filtered locally.
+    """
+    api_args: dict = {}
+    local: list = []
+    pushed: list = []
+
+    if name:
+        _push(api_args, pushed, "name", name, _name_contains(name))
+    if tags:
+        _push(api_args, pushed, "tags", list(tags), _has_tags(tags))
+    if private_network:
+        _push(
+            api_args,
+            pushed,
+            "private_network",
+            private_network,
+            lambda server: any(nic.private_network_id == private_network for nic in server.private_nics or []),
+        )
+
+    states = _split(state)
+    _check_states(states, "scaleway.instance.v1.types", "ServerState", "state(s)")
+    if len(states) == 1:
+        _push(api_args, pushed, "state", states[0], lambda server: str(server.state) == states[0])
+    elif states:
+        local.append(("state", states, lambda server, states=frozenset(states): str(server.state) in states))
+
+    if commercial_type:
+        prefix = _prefix(commercial_type)
+        if prefix is None:
+            _push(api_args, pushed, "commercial_type", commercial_type, _equals("commercial_type", commercial_type))
+        else:
+            local.append((
+                "commercial_type",
+                commercial_type,
+                lambda server, prefix=prefix.upper(): (server.commercial_type or "").upper().startswith(prefix),
+            ))
+
+    if arch:
+        local.append(("arch", arch, lambda server, arch=arch: str(server.arch) == arch))
+
+    return FilterPlan(api_args, tuple(local), tuple(pushed))
+
+
+def private_network_filters(
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    vpc_id: Optional[str] = None,
+    dhcp_enabled: Optional[bool] = None,
+) -> FilterPlan:
+    """Plan ``list_private_networks`` filters. The API supports all of them."""
+    api_args: dict = {}
+    pushed: list = []
+    if name:
+        _push(api_args, pushed, "name", name, _name_contains(name))
+    if tags:
+        _push(api_args, pushed, "tags", list(tags), _has_tags(tags))
+    if vpc_id:
+        _push(api_args, pushed, "vpc_id", vpc_id, _equals("vpc_id", vpc_id))
+    if dhcp_enabled is not None:
+        _push(api_args, pushed, "dhcp_enabled", dhcp_enabled, _equals("dhcp_enabled", dhcp_enabled))
+    return FilterPlan(api_args, (), tuple(pushed))
+
+
+def k8s_cluster_filters(
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    private_network_id: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    version: Optional[str] = None,
+) -> FilterPlan:
+    """Plan ``list_clusters`` filters.
+
+    The API filters on name, one status, type and private network. Several
+    statuses, tags and version prefixes ("1.30" matches 1.30.x) are filtered
+    locally.
+    """
+    api_args: dict = {}
+    local: list = []
+    pushed: list = []
+
+    if name:
+        _push(api_args, pushed, "name", name, _name_contains(name))
+    if type:
+        _push(api_args, pushed, "type_", type, _equals("type_", type))
+    if private_network_id:
+        _push(api_args, pushed, "private_network_id", private_network_id, _equals("private_network_id", private_network_id))
+
+    statuses = _split(status)
+    _check_states(statuses, "scaleway.k8s.v1.types", "ClusterStatus", "status(es)")
+    if len(statuses) == 1:
+        _push(api_args, pushed, "status", statuses[0], lambda cluster: str(cluster.status) == statuses[0])
+    elif statuses:
+        local.append(("status", statuses, lambda cluster, statuses=frozenset(statuses): str(cluster.status) in statuses))
+
+    if tags:
+        local.append(("tags", sorted(tags), lambda cluster, tags=frozenset(tags): tags.issubset(cluster.tags or [])))
+
+    if version:
+        local.append((
+            "version",
+            version,
+            lambda cluster, version=version: cluster.version == version or cluster.version.startswith(version + "."),
+        ))
+
+    return FilterPlan(api_args, tuple(local), tuple(pushed))
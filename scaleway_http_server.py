@@ -5,29 +5,51 @@ A Model Context Protocol server for managing Scaleway infrastructure via HTTP.
 """
 
 import asyncio
+import contextlib
+import functools
 import json
 import logging
 import os
 import sys
-from typing import Optional
+import threading
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
 import uvicorn
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sse_starlette.sse import EventSourceResponse
 
-from mcp.server import Server
-from mcp.server.models import (
-    Tool,
-    TextContent,
-    CallToolResult,
-    ListToolsResult,
-)
-from mcp import types
+from scaleway_async_http import async_transport_stats, close_async_transport
+from scaleway_bulk import bulk_server_action
+from scaleway_catalog import ToolCatalog, build_catalog
+from scaleway_cache import cache_key, cache_stats, read_through, resource_tag, write_through
+from scaleway_cache_backends import share_cache_between_workers
+from scaleway_executor import run_blocking, executor_stats
+from scaleway_fanout import fan_out, render_fan_out, resolve_regions, resolve_zones
+from scaleway_filters import instance_filters, k8s_cluster_filters
+from scaleway_inventory import inventory_item, inventory_listing, inventory_stats, start_inventory, stop_inventory
+from scaleway_k8s import describe_cluster
+from scaleway_metrics import is_error_result, render_metrics, track_tool
+from scaleway_output import StructuredText, ToolOutput, to_call_tool_result
+from scaleway_pagination import MAX_PAGE_SIZE, Page, fetch_listing, listing_header, render_page, resolve_cursor, staleness_note
+from scaleway_profiler import DEFAULT_REQUESTS as DEFAULT_PROFILE_REQUESTS, get_profiler, profiler_enabled
+from scaleway_progress import progress_context
+from scaleway_ratelimit import rate_limiter_stats
+from scaleway_streaming import InvalidArguments, cached_pages, check_stream_format, ndjson_lines, stream_listing
+from scaleway_timing import RequestTimer, request_timer, timed_phase
+from scaleway_tool_definitions import TOOL_DEFINITIONS, implements
+from scaleway_topology import cluster_topology_report, instance_topology_report, network_members_report
+from scaleway_waiter import format_wait_result, get_state_poller, wait_timeout
 
-from scaleway import Client
-from scaleway.instance.v1.api import InstanceV1API
-from scaleway.k8s.v1.api import K8SV1API
+# The MCP models, the Scaleway SDK and the STDIO tool definitions are imported
+# on first use (or by the warm-up thread) so the port is bound sooner
+if TYPE_CHECKING:
+    from mcp.server import Server
+    from mcp.types import CallToolResult, ListToolsResult
+    from scaleway import Client
+    from scaleway_clients import ClientManager
 
 # Configure logging to stderr
 logging.basicConfig(
@@ -37,18 +59,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger("scaleway-mcp-http")
 
+# Maximum number of messages of one JSON-RPC batch handled at the same time
+BATCH_CONCURRENCY = int(os.getenv("SCW_MCP_BATCH_CONCURRENCY", 8))
+
+# Seconds between keep-alive comments on streamed responses, kept below
+# typical proxy idle timeouts
+SSE_PING_INTERVAL = int(os.getenv("SCW_MCP_SSE_PING_INTERVAL", 15))
+
+# MCP protocol versions this server speaks, newest first
+SUPPORTED_PROTOCOL_VERSIONS = ["2025-03-26", "2024-11-05"]
+
 # Global Scaleway client
-scaleway_client: Optional[Client] = None
-mcp_server: Optional[Server] = None
+scaleway_client: Optional["Client"] = None
+mcp_server: Optional["Server"] = None
 
 
-def get_scaleway_client() -> Client:
-    """Get or create Scaleway client with credentials from environment variables."""
-    global scaleway_client
-    
-    if scaleway_client is not None:
-        return scaleway_client
+def scaleway_settings() -> dict:
+    """Read the Scaleway client settings from environment variables.
     
+    Cheap enough to validate the configuration at startup without importing
+    the SDK.
+    """
     access_key = os.getenv("SCW_ACCESS_KEY") or os.getenv("SCALEWAY_ACCESS_KEY")
     secret_key = os.getenv("SCW_SECRET_KEY") or os.getenv("SCALEWAY_SECRET_KEY")
     project_id = os.getenv("SCW_PROJECT_ID") or os.getenv("SCALEWAY_PROJECT_ID")
@@ -61,48 +92,120 @@ def get_scaleway_client() -> Client:
         logger.error(error_msg)
         raise ValueError(error_msg)
     
-    logger.info(f"Initializing Scaleway client with region={default_region}, zone={default_zone}")
+    return {
+        "access_key": access_key,
+        "secret_key": secret_key,
+        "default_project_id": project_id,
+        "default_organization_id": organization_id,
+        "default_region": default_region,
+        "default_zone": default_zone,
+        "api_url": os.getenv("SCW_API_URL", "https://api.scaleway.com"),
+    }
+
+
+def get_scaleway_client() -> "Client":
+    """Get or create Scaleway client with credentials from environment variables."""
+    global scaleway_client
     
-    scaleway_client = Client(
-        access_key=access_key,
-        secret_key=secret_key,
-        default_project_id=project_id,
-        default_organization_id=organization_id,
-        default_region=default_region,
-        default_zone=default_zone,
-    )
+    if scaleway_client is not None:
+        return scaleway_client
+    
+    settings = scaleway_settings()
+    logger.info(f"Initializing Scaleway client with region={settings['default_region']}, zone={settings['default_zone']}")
+    
+    from scaleway import Client
+    
+    scaleway_client = Client(**settings)
     
     return scaleway_client
 
 
+def get_api_clients() -> "ClientManager":
+    """Get the shared manager holding long-lived Scaleway API objects and the pooled HTTP session."""
+    from scaleway_clients import get_client_manager
+    
+    return get_client_manager(get_scaleway_client)
+
+
 # ============================================================================
 # TOOL IMPLEMENTATIONS
 # ============================================================================
 
-async def list_instances_tool(zone: Optional[str] = None) -> str:
-    """List all compute instances in a Scaleway zone."""
+def _format_instance(instance) -> str:
+    """Render one instance as a markdown list entry."""
+    result = f"- **{instance.name}** (ID: {instance.id})\n"
+    result += f"  - State: {instance.state}\n"
+    result += f"  - Type: {instance.commercial_type}\n"
+    result += f"  - Public IP: {instance.public_ip.address if instance.public_ip else 'None'}\n"
+    result += f"  - Created: {instance.creation_date}\n\n"
+    return result
+
+
+@implements("list_instances")
+async def list_instances_tool(
+    zone: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    state: Optional[str] = None,
+    commercial_type: Optional[str] = None,
+    private_network: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None,
+) -> str:
     try:
+        output = ToolOutput("instance", format, fields)
+        filters = instance_filters(name, tags, state, commercial_type, private_network, arch)
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
-        target_zone = zone or client.default_zone
-        logger.info(f"Listing instances in zone: {target_zone}")
+        cursor_zone, page, page_size = resolve_cursor(cursor, page_size)
+        zones = [cursor_zone] if cursor_zone else resolve_zones(zone, client.default_zone)
+        logger.info(f"Listing instances in zone(s): {', '.join(zones)}")
         
-        response = instance_api.list_servers(zone=target_zone)
-        instances = response.servers or []
+        async def fetch(target_zone: str) -> Page:
+            listing = await inventory_listing("instance", target_zone, filters, page, page_size, fresh=fresh)
+            if listing is not None:
+                return listing
+            listing = await read_through(
+                cache_key("list_instances", target_zone, page=page, page_size=page_size, **filters.api_args),
+                "instance",
+                lambda: fetch_listing(
+                    functools.partial(instance_api.list_servers, zone=target_zone, **filters.api_args),
+                    "servers",
+                    target=target_zone,
+                    page=page,
+                    page_size=page_size,
+                    size_param="per_page",
+                ),
+                tags=[resource_tag("instance", target_zone)],
+                fresh=fresh,
+            )
+            return filters.apply(listing)
         
-        if not instances:
-            return f"No instances found in zone {target_zone}."
+        if len(zones) > 1:
+            results = await fan_out(zones, fetch)
+            if output.json:
+                return output.render_fan_out(results, "zone")
+            return render_fan_out(results, "instance(s)", "zone", output.format_item(_format_instance))
         
-        result = f"Found {len(instances)} instance(s) in zone {target_zone}:\n\n"
-        for instance in instances:
-            result += f"- **{instance.name}** (ID: {instance.id})\n"
-            result += f"  - State: {instance.state}\n"
-            result += f"  - Type: {instance.commercial_type}\n"
-            result += f"  - Public IP: {instance.public_ip.address if instance.public_ip else 'None'}\n"
-            result += f"  - Created: {instance.creation_date}\n\n"
+        target_zone = zones[0]
+        listing = await fetch(target_zone)
         
-        return result
+        if output.json:
+            return output.render_listing(listing, "zone")
+        
+        if not listing.items and listing.next_cursor is None:
+            return f"No instances found in zone {target_zone}."
+        
+        return render_page(
+            listing_header(listing, "instance(s)", f"zone {target_zone}"),
+            listing,
+            output.format_item(_format_instance),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list instances: {str(e)}"
@@ -110,17 +213,43 @@ async def list_instances_tool(zone: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
-async def get_instance_tool(instance_id: str, zone: Optional[str] = None) -> str:
-    """Get detailed information about a specific instance."""
+@implements("get_instance")
+async def get_instance_tool(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None,
+) -> str:
     try:
+        output = ToolOutput("instance", format, fields, listing=False)
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Getting instance {instance_id} in zone {target_zone}")
         
-        response = instance_api.get_server(zone=target_zone, server_id=instance_id)
-        instance = response.server
+        found = await inventory_item("instance", target_zone, instance_id, fresh=fresh)
+        if found is not None:
+            instance, as_of = found
+        else:
+            response = await read_through(
+                cache_key("get_instance", target_zone, instance_id=instance_id),
+                "instance",
+                lambda: run_blocking(instance_api.get_server, zone=target_zone, server_id=instance_id),
+                tags=[resource_tag("instance", target_zone, instance_id)],
+                fresh=fresh,
+            )
+            instance, as_of = response.server, None
+        
+        if output.json:
+            return output.render_item(instance, as_of)
+        if output.requested:
+            return (
+                f"**Instance Details: {instance.name}**\n\n"
+                + output.format_item(_format_instance)(instance)
+                + staleness_note(as_of)
+            )
         
         result = f"**Instance Details: {instance.name}**\n\n"
         result += f"- ID: {instance.id}\n"
@@ -136,7 +265,7 @@ async def get_instance_tool(instance_id: str, zone: Optional[str] = None) -> str
             for vol_id, volume in instance.volumes.items():
                 result += f"  - {volume.name}: {volume.size}GB ({volume.volume_type})\n"
         
-        return result
+        return result + staleness_note(as_of)
         
     except Exception as e:
         error_msg = f"Failed to get instance: {str(e)}"
@@ -144,18 +273,29 @@ async def get_instance_tool(instance_id: str, zone: Optional[str] = None) -> str
         return f"Error: {error_msg}"
 
 
-async def start_instance_tool(instance_id: str, zone: Optional[str] = None) -> str:
-    """Start a stopped instance."""
+@implements("start_instance")
+async def start_instance_tool(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Starting instance {instance_id} in zone {target_zone}")
         
-        instance_api.server_action(zone=target_zone, server_id=instance_id, action="poweron")
+        await write_through(
+            run_blocking(instance_api.server_action, zone=target_zone, server_id=instance_id, action="poweron"),
+            resource_tag("instance", target_zone),
+            resource_tag("instance", target_zone, instance_id),
+        )
         
-        return f"Successfully started instance {instance_id} in zone {target_zone}"
+        result = f"Successfully started instance {instance_id} in zone {target_zone}"
+        if wait:
+            outcome = await get_state_poller(instance_api.list_servers).wait_for(
+                target_zone, instance_id, {"running"}, wait_timeout()
+            )
+            result += "\n" + format_wait_result(outcome, "running")
+        
+        return result
         
     except Exception as e:
         error_msg = f"Failed to start instance: {str(e)}"
@@ -163,18 +303,29 @@ async def start_instance_tool(instance_id: str, zone: Optional[str] = None) -> s
         return f"Error: {error_msg}"
 
 
-async def stop_instance_tool(instance_id: str, zone: Optional[str] = None) -> str:
-    """Stop a running instance."""
+@implements("stop_instance")
+async def stop_instance_tool(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Stopping instance {instance_id} in zone {target_zone}")
         
-        instance_api.server_action(zone=target_zone, server_id=instance_id, action="poweroff")
+        await write_through(
+            run_blocking(instance_api.server_action, zone=target_zone, server_id=instance_id, action="poweroff"),
+            resource_tag("instance", target_zone),
+            resource_tag("instance", target_zone, instance_id),
+        )
         
-        return f"Successfully stopped instance {instance_id} in zone {target_zone}"
+        result = f"Successfully stopped instance {instance_id} in zone {target_zone}"
+        if wait:
+            outcome = await get_state_poller(instance_api.list_servers).wait_for(
+                target_zone, instance_id, {"stopped"}, wait_timeout()
+            )
+            result += "\n" + format_wait_result(outcome, "stopped")
+        
+        return result
         
     except Exception as e:
         error_msg = f"Failed to stop instance: {str(e)}"
@@ -182,29 +333,151 @@ async def stop_instance_tool(instance_id: str, zone: Optional[str] = None) -> st
         return f"Error: {error_msg}"
 
 
-async def list_k8s_clusters_tool(region: Optional[str] = None) -> str:
-    """List all Kubernetes clusters in a Scaleway region."""
+@implements("wait_for_instance_state")
+async def wait_for_instance_state_tool(
+    instance_id: str,
+    state: str,
+    zone: Optional[str] = None,
+    timeout: float = 300,
+) -> str:
     try:
         client = get_scaleway_client()
-        k8s_api = K8SV1API(client)
+        instance_api = get_api_clients().instance
         
-        target_region = region or client.default_region
-        logger.info(f"Listing Kubernetes clusters in region: {target_region}")
+        target_zone = zone or client.default_zone
+        logger.info(f"Waiting for instance {instance_id} in zone {target_zone} to be {state}")
         
-        response = k8s_api.list_clusters(region=target_region)
-        clusters = response.clusters or []
+        outcome = await get_state_poller(instance_api.list_servers).wait_for(
+            target_zone, instance_id, {state}, timeout
+        )
         
-        if not clusters:
-            return f"No Kubernetes clusters found in region {target_region}."
+        return format_wait_result(outcome, state)
+        
+    except Exception as e:
+        error_msg = f"Failed to wait for instance: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@implements("bulk_start_instances")
+async def bulk_start_instances_tool(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False,
+) -> str:
+    try:
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
         
-        result = f"Found {len(clusters)} Kubernetes cluster(s) in region {target_region}:\n\n"
-        for cluster in clusters:
-            result += f"- **{cluster.name}** (ID: {cluster.id})\n"
-            result += f"  - Status: {cluster.status}\n"
-            result += f"  - Version: {cluster.version}\n"
-            result += f"  - CNI: {cluster.cni}\n\n"
+        target_zone = zone or client.default_zone
+        return await bulk_server_action(
+            instance_api, target_zone, "poweron", instance_ids, tags, concurrency, wait
+        )
         
-        return result
+    except Exception as e:
+        error_msg = f"Failed to start instances: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@implements("bulk_stop_instances")
+async def bulk_stop_instances_tool(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False,
+) -> str:
+    try:
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
+        
+        target_zone = zone or client.default_zone
+        return await bulk_server_action(
+            instance_api, target_zone, "poweroff", instance_ids, tags, concurrency, wait
+        )
+        
+    except Exception as e:
+        error_msg = f"Failed to stop instances: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+def _format_k8s_cluster(cluster) -> str:
+    """Render one Kubernetes cluster as a markdown list entry."""
+    result = f"- **{cluster.name}** (ID: {cluster.id})\n"
+    result += f"  - Status: {cluster.status}\n"
+    result += f"  - Version: {cluster.version}\n"
+    result += f"  - CNI: {cluster.cni}\n\n"
+    return result
+
+
+@implements("list_k8s_clusters")
+async def list_k8s_clusters_tool(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    private_network_id: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    version: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None,
+) -> str:
+    try:
+        output = ToolOutput("k8s_cluster", format, fields)
+        filters = k8s_cluster_filters(name, status, type, private_network_id, tags, version)
+        client = get_scaleway_client()
+        k8s_api = get_api_clients().k8s
+        
+        cursor_region, page, page_size = resolve_cursor(cursor, page_size)
+        regions = [cursor_region] if cursor_region else resolve_regions(region, client.default_region)
+        logger.info(f"Listing Kubernetes clusters in region(s): {', '.join(regions)}")
+        
+        async def fetch(target_region: str) -> Page:
+            listing = await inventory_listing("k8s_cluster", target_region, filters, page, page_size, fresh=fresh)
+            if listing is not None:
+                return listing
+            listing = await read_through(
+                cache_key("list_k8s_clusters", target_region, page=page, page_size=page_size, **filters.api_args),
+                "k8s_cluster",
+                lambda: fetch_listing(
+                    functools.partial(k8s_api.list_clusters, region=target_region, **filters.api_args),
+                    "clusters",
+                    target=target_region,
+                    page=page,
+                    page_size=page_size,
+                ),
+                tags=[resource_tag("k8s_cluster", target_region)],
+                fresh=fresh,
+            )
+            return filters.apply(listing)
+        
+        if len(regions) > 1:
+            results = await fan_out(regions, fetch)
+            if output.json:
+                return output.render_fan_out(results, "region")
+            return render_fan_out(results, "Kubernetes cluster(s)", "region", output.format_item(_format_k8s_cluster))
+        
+        target_region = regions[0]
+        listing = await fetch(target_region)
+        
+        if output.json:
+            return output.render_listing(listing, "region")
+        
+        if not listing.items and listing.next_cursor is None:
+            return f"No Kubernetes clusters found in region {target_region}."
+        
+        return render_page(
+            listing_header(listing, "Kubernetes cluster(s)", f"region {target_region}"),
+            listing,
+            output.format_item(_format_k8s_cluster),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list Kubernetes clusters: {str(e)}"
@@ -212,13 +485,195 @@ async def list_k8s_clusters_tool(region: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
+@implements("describe_k8s_cluster")
+async def describe_k8s_cluster_tool(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+) -> str:
+    try:
+        client = get_scaleway_client()
+        k8s_api = get_api_clients().k8s
+        
+        target_region = region or client.default_region
+        logger.info(f"Describing Kubernetes cluster {cluster_id} in region {target_region}")
+        
+        return await describe_cluster(k8s_api, target_region, cluster_id, fresh, format)
+        
+    except Exception as e:
+        error_msg = f"Failed to describe Kubernetes cluster: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@implements("get_network_members")
+async def get_network_members_tool(
+    private_network_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+) -> str:
+    try:
+        client = get_scaleway_client()
+        target_region = region or client.default_region
+        logger.info(f"Getting members of private network {private_network_id} in region {target_region}")
+        
+        return await network_members_report(get_api_clients(), target_region, private_network_id, fresh, format)
+        
+    except Exception as e:
+        error_msg = f"Failed to get network members: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@implements("get_instance_topology")
+async def get_instance_topology_tool(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+) -> str:
+    try:
+        client = get_scaleway_client()
+        target_zone = zone or client.default_zone
+        logger.info(f"Getting topology of instance {instance_id} in zone {target_zone}")
+        
+        return await instance_topology_report(get_api_clients(), target_zone, instance_id, fresh, format)
+        
+    except Exception as e:
+        error_msg = f"Failed to get instance topology: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@implements("get_k8s_cluster_topology")
+async def get_k8s_cluster_topology_tool(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+) -> str:
+    try:
+        client = get_scaleway_client()
+        target_region = region or client.default_region
+        logger.info(f"Getting topology of Kubernetes cluster {cluster_id} in region {target_region}")
+        
+        return await cluster_topology_report(get_api_clients(), target_region, cluster_id, fresh, format)
+        
+    except Exception as e:
+        error_msg = f"Failed to get Kubernetes cluster topology: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+async def stream_instances_tool(
+    zone: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    state: Optional[str] = None,
+    commercial_type: Optional[str] = None,
+    private_network: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "json",
+    fields: Optional[list[str]] = None,
+) -> AsyncIterator[list[dict]]:
+    """Stream instances as records, one batch per upstream page."""
+    check_stream_format(format)
+    output = ToolOutput("instance", format, fields)
+    filters = instance_filters(name, tags, state, commercial_type, private_network, arch)
+    client = get_scaleway_client()
+    instance_api = get_api_clients().instance
+    
+    cursor_zone, page, page_size = resolve_cursor(cursor, page_size)
+    zones = [cursor_zone] if cursor_zone else resolve_zones(zone, client.default_zone)
+    logger.info(f"Streaming instances in zone(s): {', '.join(zones)}")
+    
+    async def pages(target_zone: str) -> AsyncIterator[Page]:
+        async for listing in cached_pages(
+            functools.partial(instance_api.list_servers, zone=target_zone, **filters.api_args),
+            "servers",
+            tool="list_instances",
+            resource_type="instance",
+            target=target_zone,
+            page=page,
+            page_size=page_size or MAX_PAGE_SIZE,
+            api_args=filters.api_args,
+            size_param="per_page",
+            fresh=fresh,
+        ):
+            yield filters.apply(listing)
+    
+    async for records in stream_listing(zones, pages, output, "zone"):
+        yield records
+
+
+async def stream_k8s_clusters_tool(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    private_network_id: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    version: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "json",
+    fields: Optional[list[str]] = None,
+) -> AsyncIterator[list[dict]]:
+    """Stream Kubernetes clusters as records, one batch per upstream page."""
+    check_stream_format(format)
+    output = ToolOutput("k8s_cluster", format, fields)
+    filters = k8s_cluster_filters(name, status, type, private_network_id, tags, version)
+    client = get_scaleway_client()
+    k8s_api = get_api_clients().k8s
+    
+    cursor_region, page, page_size = resolve_cursor(cursor, page_size)
+    regions = [cursor_region] if cursor_region else resolve_regions(region, client.default_region)
+    logger.info(f"Streaming Kubernetes clusters in region(s): {', '.join(regions)}")
+    
+    async def pages(target_region: str) -> AsyncIterator[Page]:
+        async for listing in cached_pages(
+            functools.partial(k8s_api.list_clusters, region=target_region, **filters.api_args),
+            "clusters",
+            tool="list_k8s_clusters",
+            resource_type="k8s_cluster",
+            target=target_region,
+            page=page,
+            page_size=page_size or MAX_PAGE_SIZE,
+            api_args=filters.api_args,
+            fresh=fresh,
+        ):
+            yield filters.apply(listing)
+    
+    async for records in stream_listing(regions, pages, output, "region"):
+        yield records
+
+
 # Tool registry mapping tool names to implementations
 TOOL_REGISTRY = {
     "list_instances": list_instances_tool,
     "get_instance": get_instance_tool,
     "start_instance": start_instance_tool,
     "stop_instance": stop_instance_tool,
+    "wait_for_instance_state": wait_for_instance_state_tool,
+    "bulk_start_instances": bulk_start_instances_tool,
+    "bulk_stop_instances": bulk_stop_instances_tool,
     "list_k8s_clusters": list_k8s_clusters_tool,
+    "describe_k8s_cluster": describe_k8s_cluster_tool,
+    "get_network_members": get_network_members_tool,
+    "get_instance_topology": get_instance_topology_tool,
+    "get_k8s_cluster_topology": get_k8s_cluster_topology_tool,
+}
+
+# Listing tools that can stream NDJSON records (Accept: application/x-ndjson)
+STREAM_REGISTRY = {
+    "list_instances": stream_instances_tool,
+    "list_k8s_clusters": stream_k8s_clusters_tool,
 }
 
 
@@ -226,95 +681,27 @@ TOOL_REGISTRY = {
 # MCP SERVER SETUP
 # ============================================================================
 
+# The tools/list catalog, built once from the tool definitions and kept serialized
+tool_catalog: Optional[ToolCatalog] = None
+
+
+def get_tool_catalog() -> ToolCatalog:
+    """Get or build the tools/list catalog."""
+    global tool_catalog
+    
+    if tool_catalog is None:
+        tool_catalog = build_catalog(TOOL_DEFINITIONS, TOOL_REGISTRY)
+    return tool_catalog
+
+
 # Global handler functions
-async def list_tools() -> ListToolsResult:
+async def list_tools() -> "ListToolsResult":
     """List available tools."""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="list_instances",
-                description="List all compute instances in a Scaleway zone",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "zone": {
-                            "type": "string",
-                            "description": "Scaleway zone (e.g., fr-par-1, nl-ams-1). Optional, uses default if not provided."
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="get_instance",
-                description="Get detailed information about a specific instance",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "instance_id": {
-                            "type": "string",
-                            "description": "The ID of the instance to retrieve"
-                        },
-                        "zone": {
-                            "type": "string",
-                            "description": "Scaleway zone. Optional, uses default if not provided."
-                        }
-                    },
-                    "required": ["instance_id"]
-                }
-            ),
-            Tool(
-                name="start_instance",
-                description="Start a stopped instance",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "instance_id": {
-                            "type": "string",
-                            "description": "The ID of the instance to start"
-                        },
-                        "zone": {
-                            "type": "string",
-                            "description": "Scaleway zone. Optional, uses default if not provided."
-                        }
-                    },
-                    "required": ["instance_id"]
-                }
-            ),
-            Tool(
-                name="stop_instance",
-                description="Stop a running instance",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "instance_id": {
-                            "type": "string",
-                            "description": "The ID of the instance to stop"
-                        },
-                        "zone": {
-                            "type": "string",
-                            "description": "Scaleway zone. Optional, uses default if not provided."
-                        }
-                    },
-                    "required": ["instance_id"]
-                }
-            ),
-            Tool(
-                name="list_k8s_clusters",
-                description="List all Kubernetes clusters in a Scaleway region",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "region": {
-                            "type": "string",
-                            "description": "Scaleway region (e.g., fr-par, nl-ams). Optional, uses default if not provided."
-                        }
-                    }
-                }
-            ),
-        ]
-    )
+    from mcp.types import ListToolsResult
+    
+    return ListToolsResult(tools=get_tool_catalog().tools)
 
-async def call_tool(name: str, arguments: dict) -> CallToolResult:
+async def call_tool(name: str, arguments: dict) -> "CallToolResult":
     """Execute a tool."""
     logger.info(f"Calling tool: {name} with arguments: {arguments}")
     
@@ -322,14 +709,24 @@ async def call_tool(name: str, arguments: dict) -> CallToolResult:
         raise ValueError(f"Unknown tool: {name}")
     
     tool_func = TOOL_REGISTRY[name]
-    result_text = await tool_func(**arguments)
+    with track_tool(name) as outcome:
+        result_text = await tool_func(**arguments)
+        outcome["error"] = is_error_result(result_text)
+    
+    if isinstance(result_text, StructuredText):
+        return to_call_tool_result(result_text)
+    
+    from mcp.types import CallToolResult, TextContent
     
     return CallToolResult(
         content=[TextContent(type="text", text=result_text)]
     )
 
-def create_mcp_server() -> Server:
+def create_mcp_server() -> "Server":
     """Create and configure the MCP server."""
+    from mcp.server import Server
+    from mcp.types import CallToolResult, ListToolsResult
+    
     server = Server("scaleway")
     
     @server.list_tools()
@@ -347,7 +744,34 @@ def create_mcp_server() -> Server:
 # FASTAPI HTTP SERVER
 # ============================================================================
 
-app = FastAPI(title="Scaleway MCP Server", version="1.0.0")
+def warm_up() -> None:
+    """Import and build what the first tool call needs: the tool catalog, the MCP models and the API clients."""
+    start = time.perf_counter()
+    try:
+        get_tool_catalog()
+        import mcp.types  # noqa: F401
+        api_clients = get_api_clients()
+        api_clients.instance, api_clients.k8s
+    except Exception as e:
+        logger.warning(f"Warm-up failed, deferring to the first request: {e}")
+        return
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up in the background once the server starts, so /health answers right away, and run the inventory sync."""
+    if os.getenv("SCW_MCP_WARM_UP", "1").lower() not in ("0", "false", "no"):
+        threading.Thread(target=warm_up, name="scaleway-warm-up", daemon=True).start()
+    start_inventory(get_api_clients)
+    try:
+        yield
+    finally:
+        await stop_inventory()
+        await close_async_transport()
+
+
+app = FastAPI(title="Scaleway MCP Server", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -371,114 +795,336 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "executor": executor_stats(),
+        "cache": cache_stats(),
+        "rate_limiter": rate_limiter_stats(),
+        "inventory": inventory_stats(),
+        "async_http": async_transport_stats(),
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(content=render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/debug/profile")
+async def start_profile(requests: int = DEFAULT_PROFILE_REQUESTS):
+    """Arm the sampling profiler for the next N MCP requests (requires SCW_MCP_ENABLE_PROFILER)."""
+    if not profiler_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    profiler = get_profiler()
+    profiler.arm(requests)
+    return profiler.status()
+
+@app.get("/debug/profile")
+async def read_profile():
+    """Return the samples collected so far as folded stacks, ready for flamegraph.pl or speedscope."""
+    if not profiler_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    profiler = get_profiler()
+    status = profiler.status()
+    return Response(
+        content=profiler.collapsed(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Profile-Remaining": str(status["remaining"] + status["active"])},
+    )
+
+
+def error_response(message: object, error: Exception) -> dict:
+    """Build a JSON-RPC error response for a failed message: invalid params or an internal error."""
+    invalid = isinstance(error, InvalidArguments)
+    return {
+        "jsonrpc": "2.0",
+        "id": message.get("id") if isinstance(message, dict) else None,
+        "error": {
+            "code": -32602 if invalid else -32603,
+            "message": "Invalid params" if invalid else "Internal error",
+            "data": str(error)
+        }
+    }
+
+
+async def handle_message(body: dict) -> dict:
+    """Handle a single JSON-RPC message and return its response."""
+    method = body.get("method")
+    
+    if method == "initialize":
+        # Return initialization response, agreeing on the client's protocol
+        # version when we support it
+        requested_version = body.get("params", {}).get("protocolVersion")
+        return {
+            "jsonrpc": "2.0",
+            "id": body.get("id"),
+            "result": {
+                "protocolVersion": requested_version if requested_version in SUPPORTED_PROTOCOL_VERSIONS else SUPPORTED_PROTOCOL_VERSIONS[0],
+                "capabilities": {
+                    "tools": {}
+                },
+                "serverInfo": {
+                    "name": "scaleway",
+                    "version": "1.0.0"
+                }
+            }
+        }
+    
+    elif method == "tools/list":
+        # List available tools from the prebuilt catalog
+        return {
+            "jsonrpc": "2.0",
+            "id": body.get("id"),
+            "result": get_tool_catalog().result
+        }
+    
+    elif method == "tools/call":
+        # Call a tool
+        params = body.get("params", {})
+        tool_name = params.get("name")
+        arguments = params.get("arguments", {})
+        
+        with request_timer() as timer:
+            with timed_phase("tool"):
+                result = await call_tool(name=tool_name, arguments=arguments)
+        
+        response = {
+            "jsonrpc": "2.0",
+            "id": body.get("id"),
+            "result": {
+                "content": [
+                    {
+                        "type": content.type,
+                        "text": content.text
+                    }
+                    for content in result.content
+                ],
+                "_meta": {
+                    "timing": timer.breakdown()
+                }
+            }
+        }
+        if result.structuredContent is not None:
+            response["result"]["structuredContent"] = result.structuredContent
+        return response
+    
+    elif method == "notifications/initialized":
+        # Handle initialization notification (no response needed for notifications)
+        logger.info("Client initialization notification received")
+        return {
+            "jsonrpc": "2.0"
+        }
+    
+    elif method.startswith("notifications/"):
+        # Handle other notifications (no response needed)
+        logger.info(f"Notification received: {method}")
+        return {
+            "jsonrpc": "2.0"
+        }
+    
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
+
+
+async def handle_batch(messages: list) -> list:
+    """Handle a JSON-RPC batch, running its messages concurrently.
+    
+    Responses keep the order of the requests; notifications get no response.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def handle(message: object) -> Optional[dict]:
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32600, "message": "Invalid Request"}
+            }
+        
+        async with semaphore:
+            try:
+                response = await handle_message(message)
+            except Exception as e:
+                logger.error(f"Error handling MCP batch message: {e}", exc_info=True)
+                response = error_response(message, e)
+        
+        return None if "id" not in message else response
+    
+    responses = await asyncio.gather(*(handle(message) for message in messages))
+    return [response for response in responses if response is not None]
+
+
+async def stream_message(body: dict) -> AsyncIterator[dict]:
+    """Handle a message as a Streamable HTTP response.
+    
+    Yields SSE events: a `notifications/progress` message for every progress
+    update the tool reports (when the client sent a progressToken), then the
+    JSON-RPC response itself.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    progress_token = body.get("params", {}).get("_meta", {}).get("progressToken")
+    
+    async def on_progress(progress: float, total: Optional[float], message: Optional[str]) -> None:
+        if progress_token is None:
+            return
+        params = {"progressToken": progress_token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message is not None:
+            params["message"] = message
+        await queue.put({"jsonrpc": "2.0", "method": "notifications/progress", "params": params})
+    
+    async def run() -> None:
+        with progress_context(on_progress), get_profiler().track():
+            try:
+                response = await handle_message(body)
+            except Exception as e:
+                logger.error(f"Error handling streamed MCP request: {e}", exc_info=True)
+                response = error_response(body, e)
+        await queue.put(response)
+        await queue.put(None)
+    
+    task = asyncio.create_task(run())
+    try:
+        while (message := await queue.get()) is not None:
+            yield {"event": "message", "data": json.dumps(message)}
+    finally:
+        # Stop the tool if the client went away before it finished
+        task.cancel()
+
+
+async def stream_ndjson(body: dict) -> AsyncIterator[bytes]:
+    """Handle a listing tools/call as an NDJSON stream.
+    
+    Yields one line per listed item as soon as its upstream page arrives, one
+    count or error line per zone/region, and finally the JSON-RPC response
+    summarizing the listing.
+    """
+    params = body.get("params", {})
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+    total = 0
+    targets = []
+    
+    with track_tool(tool_name) as outcome, get_profiler().track():
+        try:
+            async for records in STREAM_REGISTRY[tool_name](**arguments):
+                for record in records:
+                    if "item" in record:
+                        total += 1
+                    else:
+                        targets.append(record)
+                yield ndjson_lines(records)
+        except Exception as e:
+            logger.error(f"Error streaming {tool_name}: {e}", exc_info=True)
+            outcome["error"] = True
+            yield ndjson_lines([error_response(body, e)])
+            return
+    
+    failed = sum(1 for target in targets if "error" in target)
+    summary = f"Streamed {total} item(s) from {len(targets)} location(s)"
+    if failed:
+        summary += f" ({failed} failed)"
+    yield ndjson_lines([{
+        "jsonrpc": "2.0",
+        "id": body.get("id"),
+        "result": {
+            "content": [{"type": "text", "text": summary}],
+            "structuredContent": {"total_count": total, "targets": targets}
+        }
+    }])
+
+
+def timed_json_response(content: object, timer: RequestTimer, status_code: int = 200) -> Response:
+    """Encode a JSON response and report the request's phases in a Server-Timing header."""
+    with timed_phase("serialize"):
+        encoded = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return Response(
+        content=encoded,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Server-Timing": timer.server_timing()},
+    )
 
 
 @app.post("/mcp")
 async def mcp_post(request: Request):
     """Handle MCP POST requests (client-to-server messages)."""
+    with request_timer() as timer:
+        return await _mcp_post(request, timer)
+
+
+async def _mcp_post(request: Request, timer: RequestTimer):
+    """Parse and dispatch one POST to /mcp, timing each phase into ``timer``."""
     try:
-        body = await request.json()
+        with timed_phase("parse"):
+            body = await request.json()
+        
+        if isinstance(body, list):
+            logger.info(f"Received MCP batch of {len(body)} message(s)")
+            if not body:
+                return JSONResponse(
+                    status_code=400,
+                    content={
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {"code": -32600, "message": "Invalid Request", "data": "Empty batch"}
+                    }
+                )
+            
+            with get_profiler().track():
+                responses = await handle_batch(body)
+            if not responses:
+                # A batch made only of notifications has nothing to return
+                return Response(status_code=202)
+            return timed_json_response(responses, timer)
+        
         logger.info(f"Received MCP message: {body.get('method', 'unknown')}")
         
-        # Handle different JSON-RPC methods
-        method = body.get("method")
+        if body.get("method") == "tools/list":
+            # Serve the pre-serialized catalog, or nothing if the client has it
+            catalog = get_tool_catalog()
+            headers = {"ETag": catalog.etag, "Server-Timing": timer.server_timing()}
+            if catalog.matches(request.headers.get("if-none-match")):
+                return Response(status_code=304, headers=headers)
+            return Response(
+                content=catalog.response(body.get("id")),
+                media_type="application/json",
+                headers=headers,
+            )
         
-        if method == "initialize":
-            # Return initialization response
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": body.get("id"),
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "scaleway",
-                        "version": "1.0.0"
-                    }
-                }
-            })
+        accept = request.headers.get("accept", "")
         
-        elif method == "tools/list":
-            # List available tools - call the handler function directly
-            tools_result = await list_tools()
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": body.get("id"),
-                "result": {
-                    "tools": [
-                        {
-                            "name": tool.name,
-                            "description": tool.description,
-                            "inputSchema": tool.inputSchema
-                        }
-                        for tool in tools_result.tools
-                    ]
-                }
-            })
+        if (
+            body.get("method") == "tools/call"
+            and "application/x-ndjson" in accept
+            and body.get("params", {}).get("name") in STREAM_REGISTRY
+        ):
+            # Stream listing records while later pages are still being fetched
+            return StreamingResponse(stream_ndjson(body), media_type="application/x-ndjson")
         
-        elif method == "tools/call":
-            # Call a tool
-            params = body.get("params", {})
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            result = await call_tool(name=tool_name, arguments=arguments)
-            
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": body.get("id"),
-                "result": {
-                    "content": [
-                        {
-                            "type": content.type,
-                            "text": content.text
-                        }
-                        for content in result.content
-                    ]
-                }
-            })
-        
-        elif method == "notifications/initialized":
-            # Handle initialization notification (no response needed for notifications)
-            logger.info("Client initialization notification received")
-            return JSONResponse({
-                "jsonrpc": "2.0"
-            })
-        
-        elif method.startswith("notifications/"):
-            # Handle other notifications (no response needed)
-            logger.info(f"Notification received: {method}")
-            return JSONResponse({
-                "jsonrpc": "2.0"
-            })
+        if body.get("method") == "tools/call" and "text/event-stream" in accept:
+            # Streamable HTTP: keep the connection alive with pings and push
+            # progress while the tool runs
+            return EventSourceResponse(stream_message(body), ping=SSE_PING_INTERVAL)
         
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
+        with get_profiler().track():
+            response = await handle_message(body)
+        return timed_json_response(response, timer)
     
     except Exception as e:
         logger.error(f"Error handling MCP request: {e}", exc_info=True)
-        return JSONResponse(
+        return timed_json_response(
+            error_response(body if "body" in locals() else None, e),
+            timer,
             status_code=500,
-            content={
-                "jsonrpc": "2.0",
-                "id": body.get("id") if "body" in locals() else None,
-                "error": {
-                    "code": -32603,
-                    "message": "Internal error",
-                    "data": str(e)
-                }
-            }
         )
 
 
 if __name__ == "__main__":
-    # Initialize the Scaleway client on startup
+    # Check the Scaleway configuration on startup; the client itself is
+    # created by the warm-up thread or the first tool call
     try:
-        get_scaleway_client()
-        logger.info("Scaleway client initialized successfully")
+        scaleway_settings()
     except Exception as e:
         logger.error(f"Failed to initialize Scaleway client: {e}")
         sys.exit(1)
@@ -486,8 +1132,14 @@ if __name__ == "__main__":
     # Get configuration from environment
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8080))
+    workers = int(os.getenv("SCW_MCP_WORKERS", 1))
     
-    logger.info(f"Starting Scaleway MCP HTTP server on {host}:{port}")
+    logger.info(f"Starting Scaleway MCP HTTP server on {host}:{port} with {workers} worker(s)")
     
     # Run the server
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    if workers > 1:
+        # Worker processes import the app themselves and share one cache
+        share_cache_between_workers(workers)
+        uvicorn.run("scaleway_http_server:app", host=host, port=port, workers=workers, log_level="info")
+    else:
+        uvicorn.run(app, host=host, port=port, log_level="info")
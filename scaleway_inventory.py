@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Background Inventory
+Optional in-memory inventory of instances, private networks and Kubernetes
+clusters for the configured zones/regions, kept up to date by a background
+task so list/get tools can answer without calling the API. Where the API can
+list by modification date, a refresh only re-reads what changed since the
+previous one; answers carry the time of the sync they were served from.
+
+With a shared cache backend, the workers elect one of them through a lease in
+the backend to sync with the API; it publishes each collection to the backend,
+where the other workers load it from instead of listing the API themselves.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import os
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+from scaleway_cache import get_cache, resource_tag
+from scaleway_fanout import resolve_regions, resolve_zones
+from scaleway_pagination import Page, encode_cursor, fetch_listing, iter_pages
+
+logger = logging.getLogger("scaleway-mcp.inventory")
+
+DEFAULT_INTERVAL = 30.0
+DEFAULT_MAX_STALENESS = 120.0
+# Incremental refreshes between two full listings, as a safety net
+DEFAULT_FULL_SYNC_EVERY = 10
+
+# Name of the backend lease held by the worker syncing with the API
+LEADER_LEASE = ("inventory", "leader")
+
+# Items per request when re-reading recently modified items: most refreshes
+# find nothing new and stop after the first page
+INCREMENTAL_PAGE_SIZE = 20
+
+
+class Resource(NamedTuple):
+    """How to list one resource type and tell when an item changed."""
+
+    api: str
+    method: str
+    key: str
+    scope: str
+    size_param: str
+    modified: str
+    created: str
+    # Extra list arguments returning the most recently modified items first,
+    # or None if the API cannot order by modification date
+    recent_first: Optional[dict]
+    # Whether the API lists the newest items first by default
+    newest_first: bool
+
+
+RESOURCES = {
+    "instance": Resource(
+        "instance", "list_servers", "servers", "zone", "per_page",
+        "modification_date", "creation_date", {"order": "modification_date_desc"}, True,
+    ),
+    "private_network": Resource(
+        "vpc", "list_private_networks", "private_networks", "region", "page_size",
+        "updated_at", "created_at", None, False,
+    ),
+    "k8s_cluster": Resource(
+        "k8s", "list_clusters", "clusters", "region", "page_size",
+        "updated_at", "created_at", {"order_by": "updated_at_desc"}, False,
+    ),
+}
+
+
+class Snapshot(NamedTuple):
+    """A collection as synced by the leading worker, published to the shared backend."""
+
+    ordered: list
+    as_of: float
+    generation: Optional[tuple]
+    watermark: Any
+
+
+class Collection:
+    """The inventory of one resource type in one zone or region."""
+
+    def __init__(self, resource_type: str, scope: str):
+        self.resource_type = resource_type
+        self.scope = scope
+        self.resource = RESOURCES[resource_type]
+        self.tag = resource_tag(resource_type, scope)
+        self.items: dict = {}
+        # Items in the API's default listing order
+        self.ordered: list = []
+        # Wall-clock start of the last successful sync, and the cache
+        # generation of the collection's tag at that point
+        self.as_of: Optional[float] = None
+        self.generation: Optional[tuple] = None
+        self.watermark: Any = None
+        self.syncs_since_full = 0
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.changed = 0
+        self.removed = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    async def invalidated(self) -> bool:
+        """Whether a write tool touched this zone/region's resources since the last sync."""
+        return self.generation != await get_cache().generation_async([self.tag])
+
+    async def current(self, max_staleness: float) -> bool:
+        if self.as_of is None or time.time() - self.as_of > max_staleness:
+            return False
+        return not await self.invalidated()
+
+    @property
+    def snapshot_key(self) -> tuple:
+        return ("inventory", self.resource_type, self.scope)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(self.ordered, self.as_of, self.generation, self.watermark)
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Take over a snapshot published by the leading worker."""
+        self.ordered = snapshot.ordered
+        self.items = {item.id: item for item in snapshot.ordered}
+        self.as_of = snapshot.as_of
+        self.generation = snapshot.generation
+        self.watermark = snapshot.watermark
+
+    def _modified(self, item: Any) -> Any:
+        return getattr(item, self.resource.modified, None)
+
+    async def sync(self, api_clients: Any, full_sync_every: int) -> None:
+        """Bring the collection up to date, incrementally when possible."""
+        resource = self.resource
+        api = getattr(api_clients, resource.api)
+        list_call = functools.partial(getattr(api, resource.method), **{resource.scope: self.scope})
+        generation = await get_cache().generation_async([self.tag])
+        started = time.time()
+
+        incremental = (
+            resource.recent_first is not None
+            and self.as_of is not None
+            and self.syncs_since_full < full_sync_every
+        )
+        if incremental and await self._sync_changes(list_call):
+            self.incremental_syncs += 1
+            self.syncs_since_full += 1
+        else:
+            await self._sync_all(list_call)
+            self.full_syncs += 1
+            self.syncs_since_full = 0
+
+        def created(item: Any) -> tuple:
+            value = getattr(item, resource.created, None)
+            return (value is not None, value or 0)
+
+        self.ordered = sorted(self.items.values(), key=created, reverse=resource.newest_first)
+        modified = [value for value in map(self._modified, self.items.values()) if value is not None]
+        self.watermark = max(modified, default=None)
+        self.as_of = started
+        self.generation = generation
+
+    async def _sync_all(self, list_call: Callable[..., Any]) -> None:
+        listing = await fetch_listing(list_call, self.resource.key, target=self.scope, size_param=self.resource.size_param)
+        items = {}
+        for item in listing.items:
+            previous = self.items.get(item.id)
+            if previous is not None and self._modified(previous) == self._modified(item):
+                # Unchanged: keep the object already referenced by earlier answers
+                items[item.id] = previous
+            else:
+                items[item.id] = item
+                self.changed += 1
+        self.removed += len(self.items.keys() - items.keys())
+        self.items = items
+
+    async def _sync_changes(self, list_call: Callable[..., Any]) -> bool:
+        """Re-read the items modified since the last sync, most recent first.
+
+        Returns False, changing nothing, when the total count shows that items
+        were deleted: those only disappear from a full listing.
+        """
+        changed: dict = {}
+        total_count = 0
+        pages = iter_pages(
+            functools.partial(list_call, **self.resource.recent_first),
+            self.resource.key,
+            target=self.scope,
+            page_size=INCREMENTAL_PAGE_SIZE,
+            size_param=self.resource.size_param,
+        )
+        try:
+            async for page in pages:
+                total_count = page.total_count
+                caught_up = False
+                for item in page.items:
+                    if self._is_older(item):
+                        caught_up = True
+                        break
+                    changed[item.id] = item
+                if caught_up:
+                    break
+        finally:
+            await pages.aclose()
+
+        added = sum(1 for item_id in changed if item_id not in self.items)
+        if total_count != len(self.items) + added:
+            return False
+        for item_id, item in changed.items():
+            previous = self.items.get(item_id)
+            if previous is None or self._modified(previous) != self._modified(item):
+                self.items[item_id] = item
+                self.changed += 1
+        return True
+
+    def _is_older(self, item: Any) -> bool:
+        modified = self._modified(item)
+        return modified is not None and self.watermark is not None and modified < self.watermark
+
+    def stats(self) -> dict:
+        return {
+            "resource_type": self.resource_type,
+            self.resource.scope: self.scope,
+            "items": len(self.items),
+            "age_seconds": round(time.time() - self.as_of, 1) if self.as_of is not None else None,
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "changed": self.changed,
+            "removed": self.removed,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+class Inventory:
+    """Collections for the configured zones/regions and the task keeping them in sync."""
+
+    def __init__(
+        self,
+        zones: list[str],
+        regions: list[str],
+        interval: float = DEFAULT_INTERVAL,
+        max_staleness: float = DEFAULT_MAX_STALENESS,
+        full_sync_every: int = DEFAULT_FULL_SYNC_EVERY,
+    ):
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.full_sync_every = full_sync_every
+        self.collections: dict[tuple[str, str], Collection] = {}
+        for zone in zones:
+            self.collections["instance", zone] = Collection("instance", zone)
+        for region in regions:
+            for resource_type in ("private_network", "k8s_cluster"):
+                self.collections[resource_type, region] = Collection(resource_type, region)
+        self.served = 0
+        self.fallbacks = 0
+        self.leader: Optional[bool] = None
+        self.loaded = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _lookup(self, resource_type: str, scope: str, fresh: bool) -> Optional[Collection]:
+        """The collection able to answer for a zone/region, or None to ask the API."""
+        collection = None if fresh else self.collections.get((resource_type, scope))
+        if collection is None:
+            return None
+        if await collection.current(self.max_staleness):
+            return collection
+        self.fallbacks += 1
+        if collection.as_of is not None:
+            self.request_sync()
+        return None
+
+    async def listing(
+        self,
+        resource_type: str,
+        scope: str,
+        filters: Any,
+        page: int,
+        page_size: Optional[int],
+        fresh: bool = False,
+    ) -> Optional[Page]:
+        """Answer a list call from the inventory, or return None if it cannot.
+
+        ``filters`` is a :class:`scaleway_filters.FilterPlan`, applied entirely
+        locally.
+        """
+        # API pages are cut before local filters apply: serving those pages
+        # from here would shift the cursors of a listing continued from the API
+        if page_size is not None and filters.local:
+            return None
+        collection = await self._lookup(resource_type, scope, fresh)
+        if collection is None:
+            return None
+        self.served += 1
+
+        items = [item for item in collection.ordered if filters.matches_all(item)]
+        if page_size is None:
+            return Page(scope, items, 1, len(items), len(items), None, collection.as_of)
+        start = (page - 1) * page_size
+        next_cursor = encode_cursor(scope, page + 1, page_size) if start + page_size < len(items) else None
+        return Page(scope, items[start:start + page_size], page, page_size, len(items), next_cursor, collection.as_of)
+
+    async def item(self, resource_type: str, scope: str, resource_id: str, fresh: bool = False) -> Optional[tuple[Any, float]]:
+        """Answer a get call from the inventory as (item, as_of), or return None if it cannot."""
+        collection = await self._lookup(resource_type, scope, fresh)
+        if collection is None:
+            return None
+        item = collection.items.get(resource_id)
+        if item is None:
+            # Created since the last sync, or not there at all: let the API say
+            return None
+        self.served += 1
+        return item, collection.as_of
+
+    async def sync(self, api_clients: Any, collections: Optional[list[Collection]] = None) -> None:
+        """Sync every collection (or the given ones) concurrently. Failures are logged and kept in the stats."""
+        targets = list(self.collections.values()) if collections is None else collections
+        await asyncio.gather(*(self._sync(collection, api_clients) for collection in targets))
+
+    async def _sync(self, collection: Collection, api_clients: Any) -> None:
+        try:
+            await collection.sync(api_clients, self.full_sync_every)
+        except Exception as e:
+            collection.errors += 1
+            collection.last_error = str(e)
+            logger.warning(f"Inventory sync of {collection.tag} failed: {e}")
+
+    async def publish(self, collections: Optional[list[Collection]] = None) -> None:
+        """Store the synced collections in the shared backend for the other workers."""
+        cache = get_cache()
+        targets = list(self.collections.values()) if collections is None else collections
+        for collection in targets:
+            if collection.as_of is not None:
+                await cache.call_backend(
+                    cache.backend.set, collection.snapshot_key, collection.snapshot(), self.max_staleness, frozenset()
+                )
+
+    async def load(self) -> None:
+        """Take over the collections the leading worker published, where newer than ours."""
+        cache = get_cache()
+        for collection in self.collections.values():
+            found, snapshot = await cache.call_backend(cache.backend.get, collection.snapshot_key)
+            if found and isinstance(snapshot, Snapshot) and (collection.as_of is None or snapshot.as_of > collection.as_of):
+                collection.restore(snapshot)
+                self.loaded += 1
+
+    async def lead(self) -> bool:
+        """Whether this worker syncs with the API: always, unless the cache backend is shared between workers."""
+        cache = get_cache()
+        if not cache.backend.shared:
+            leader = True
+        else:
+            # Outlasts a few missed renewals, so a slow sync does not hand over the lease
+            leader = await cache.call_backend(cache.backend.acquire_or_renew, LEADER_LEASE, 3 * self.interval)
+        if leader != self.leader:
+            logger.info("Inventory: this worker syncs with the API" if leader else "Inventory: following the worker syncing with the API")
+            self.leader = leader
+        return leader
+
+    def request_sync(self) -> None:
+        """Wake the sync task to refresh the collections invalidated by a write."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self, api_clients: Callable[[], Any]) -> None:
+        """Sync every ``interval`` seconds, and sooner after a write, until cancelled.
+
+        Workers that do not hold the leader lease load the published
+        collections on the same schedule instead.
+        """
+        self._wake = asyncio.Event()
+        collections = None
+        while True:
+            try:
+                if await self.lead():
+                    await self.sync(api_clients(), collections)
+                    if get_cache().backend.shared:
+                        await self.publish(collections)
+                else:
+                    await self.load()
+            except Exception as e:
+                logger.warning(f"Inventory sync failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+                collections = [c for c in self.collections.values() if c.as_of is None or await c.invalidated()]
+            except asyncio.TimeoutError:
+                collections = None
+            self._wake.clear()
+
+    def start(self, api_clients: Callable[[], Any]) -> None:
+        """Start the sync task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run(api_clients), name="scaleway-inventory")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self.leader:
+            # Let another worker take over without waiting for the lease to expire
+            cache = get_cache()
+            await cache.call_backend(cache.backend.release_owned, LEADER_LEASE)
+            self.leader = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "interval": self.interval,
+            "max_staleness": self.max_staleness,
+            "leader": self.leader,
+            "loaded": self.loaded,
+            "served": self.served,
+            "fallbacks": self.fallbacks,
+            "collections": [collection.stats() for collection in self.collections.values()],
+        }
+
+
+# Global inventory, None until configured or when disabled
+inventory: Optional[Inventory] = None
+_configured = False
+
+
+def get_inventory() -> Optional[Inventory]:
+    """Get the shared inventory configured from environment variables, or None if it is disabled."""
+    global inventory, _configured
+
+    if _configured:
+        return inventory
+    _configured = True
+
+    zones_setting = os.getenv("SCW_MCP_INVENTORY_ZONES", "")
+    regions_setting = os.getenv("SCW_MCP_INVENTORY_REGIONS", "")
+    if not zones_setting.strip() and not regions_setting.strip():
+        return None
+
+    zones = resolve_zones(zones_setting, "") if zones_setting.strip() else []
+    regions = resolve_regions(regions_setting, "") if regions_setting.strip() else []
+    interval = float(os.getenv("SCW_MCP_INVENTORY_INTERVAL", DEFAULT_INTERVAL))
+    max_staleness = float(os.getenv("SCW_MCP_INVENTORY_MAX_STALENESS", DEFAULT_MAX_STALENESS))
+    full_sync_every = int(os.getenv("SCW_MCP_INVENTORY_FULL_SYNC_EVERY", DEFAULT_FULL_SYNC_EVERY))
+
+    logger.info(
+        f"Initializing inventory for zones={zones}, regions={regions}, "
+        f"interval={interval}s, max_staleness={max_staleness}s"
+    )
+
+    inventory = Inventory(zones, regions, interval, max_staleness, full_sync_every)
+    return inventory
+
+
+async def inventory_listing(
+    resource_type: str,
+    scope: str,
+    filters: Any,
+    page: int,
+    page_size: Optional[int],
+    fresh: bool = False,
+) -> Optional[Page]:
+    """A list call answered from the inventory, or None to call the API (see :meth:`Inventory.listing`)."""
+    current = get_inventory()
+    return await current.listing(resource_type, scope, filters, page, page_size, fresh) if current else None
+
+
+async def inventory_item(resource_type: str, scope: str, resource_id: str, fresh: bool = False) -> Optional[tuple[Any, float]]:
+    """A get call answered from the inventory as (item, as_of), or None to call the API."""
+    current = get_inventory()
+    return await current.item(resource_type, scope, resource_id, fresh) if current else None
+
+
+def start_inventory(api_clients: Callable[[], Any]) -> Optional[Inventory]:
+    """Start syncing the inventory in the background, if enabled. Call from a running event loop."""
+    current = get_inventory()
+    if current is not None:
+        current.start(api_clients)
+    return current
+
+
+async def stop_inventory() -> None:
+    if inventory is not None:
+        await inventory.stop()
+
+
+def inventory_stats() -> dict:
+    """Return stats for the shared inventory."""
+    current = get_inventory()
+    return current.stats() if current else {"enabled": False}
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Kubernetes Inspection
+Fetches a Kubernetes cluster, all of its pools and all of its nodes
+concurrently and summarizes node counts, autoscaling bounds and unhealthy
+nodes per pool, for the ``describe_k8s_cluster`` tool.
+"""
+
+import asyncio
+import functools
+import logging
+from collections import Counter
+from typing import Any
+
+from scaleway_cache import cache_key, read_through, resource_tag
+from scaleway_executor import run_blocking
+from scaleway_output import StructuredText, check_format
+from scaleway_pagination import fetch_listing
+
+logger = logging.getLogger("scaleway-mcp.k8s")
+
+# Node statuses on the way to "ready" (or out of the cluster), not counted as unhealthy
+TRANSITIONAL_NODE_STATUSES = frozenset({"creating", "starting", "registering", "upgrading", "rebooting", "deleting"})
+
+
+def node_healthy(node: Any) -> bool:
+    """Whether a node is ready or settling, without an error."""
+    status = str(node.status)
+    return not node.error_message and (status == "ready" or status in TRANSITIONAL_NODE_STATUSES)
+
+
+def failing_conditions(conditions: dict) -> dict:
+    """The node conditions reporting a problem: Ready other than True, or any pressure condition True."""
+    return {name: value for name, value in (conditions or {}).items() if (name == "Ready") != (value == "True")}
+
+
+def _node(node: Any) -> dict:
+    return {
+        "id": node.id,
+        "name": node.name,
+        "status": str(node.status),
+        "error_message": node.error_message,
+        "failing_conditions": failing_conditions(node.conditions),
+    }
+
+
+def _pool(pool: Any, nodes: list) -> dict:
+    return {
+        "id": pool.id,
+        "name": pool.name,
+        "status": str(pool.status),
+        "node_type": pool.node_type,
+        "version": pool.version,
+        "zone": str(pool.zone),
+        "size": pool.size,
+        "nodes": len(nodes),
+        "node_statuses": dict(sorted(Counter(str(node.status) for node in nodes).items())),
+        "autoscaling": pool.autoscaling,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "autohealing": pool.autohealing,
+        "unhealthy_nodes": [_node(node) for node in nodes if not node_healthy(node)],
+    }
+
+
+def summarize_cluster(cluster: Any, pools: list, nodes: list) -> dict:
+    """Group nodes by pool and summarize the cluster's capacity and health."""
+    nodes_by_pool: dict[str, list] = {}
+    for node in nodes:
+        nodes_by_pool.setdefault(node.pool_id, []).append(node)
+
+    pool_records = [_pool(pool, nodes_by_pool.pop(pool.id, [])) for pool in pools]
+    # Nodes whose pool was deleted since the pools were listed
+    orphans = [node for pool_nodes in nodes_by_pool.values() for node in pool_nodes]
+
+    return {
+        "cluster": {
+            "id": cluster.id,
+            "name": cluster.name,
+            "status": str(cluster.status),
+            "version": cluster.version,
+            "type": cluster.type_,
+            "cni": str(cluster.cni),
+            "region": str(cluster.region),
+        },
+        "pools": pool_records,
+        "node_count": len(nodes),
+        "ready_nodes": sum(1 for node in nodes if str(node.status) == "ready"),
+        "unhealthy_nodes": sum(len(pool["unhealthy_nodes"]) for pool in pool_records) + sum(
+            1 for node in orphans if not node_healthy(node)
+        ),
+        "nodes_without_pool": [_node(node) for node in orphans],
+    }
+
+
+def _render_node(record: dict) -> str:
+    result = f"    - **{record['name']}** (ID: {record['id']}) - {record['status']}"
+    if record["error_message"]:
+        result += f": {record['error_message']}"
+    if record["failing_conditions"]:
+        result += "; " + ", ".join(f"{name}={value}" for name, value in record["failing_conditions"].items())
+    return result + "\n"
+
+
+def render_cluster_summary(record: dict) -> str:
+    cluster = record["cluster"]
+    result = f"**Kubernetes Cluster {cluster['name']}** (ID: {cluster['id']}, {cluster['region']})\n\n"
+    result += f"- Status: {cluster['status']}\n"
+    result += f"- Version: {cluster['version']}\n"
+    result += f"- Type: {cluster['type']}, CNI: {cluster['cni']}\n"
+    result += (
+        f"- Pools: {len(record['pools'])}, nodes: {record['node_count']} "
+        f"({record['ready_nodes']} ready, {record['unhealthy_nodes']} unhealthy)\n"
+    )
+
+    for pool in record["pools"]:
+        result += f"\n**Pool {pool['name']}** (ID: {pool['id']}) - {pool['status']}\n"
+        result += f"  - Type: {pool['node_type']}, zone: {pool['zone']}, version: {pool['version']}\n"
+        statuses = ", ".join(f"{status}: {count}" for status, count in pool["node_statuses"].items())
+        result += f"  - Nodes: {pool['nodes']} of size {pool['size']}" + (f" ({statuses})" if statuses else "") + "\n"
+        if pool["autoscaling"]:
+            result += f"  - Autoscaling: {pool['min_size']}-{pool['max_size']} nodes"
+            if pool["size"] >= pool["max_size"]:
+                result += " (at its maximum)"
+            result += "\n"
+        else:
+            result += "  - Autoscaling: off\n"
+        result += f"  - Autohealing: {'on' if pool['autohealing'] else 'off'}\n"
+        if pool["unhealthy_nodes"]:
+            result += f"  - Unhealthy nodes ({len(pool['unhealthy_nodes'])}):\n"
+            result += "".join(map(_render_node, pool["unhealthy_nodes"]))
+
+    if record["nodes_without_pool"]:
+        result += f"\n**Nodes without a pool ({len(record['nodes_without_pool'])}):**\n"
+        result += "".join(map(_render_node, record["nodes_without_pool"]))
+    return result
+
+
+async def describe_cluster(k8s_api: Any, region: str, cluster_id: str, fresh: bool = False, format: str = "text") -> str:
+    """Fetch a cluster, its pools and its nodes concurrently and summarize them as text or JSON."""
+    json_output = check_format(format)
+    tags = [resource_tag("k8s_cluster", region, cluster_id)]
+
+    cluster, pools, nodes = await asyncio.gather(
+        read_through(
+            cache_key("get_k8s_cluster", region, cluster_id=cluster_id),
+            "k8s_cluster",
+            lambda: run_blocking(k8s_api.get_cluster, region=region, cluster_id=cluster_id),
+            tags=tags,
+            fresh=fresh,
+        ),
+        read_through(
+            cache_key("list_k8s_pools", region, cluster_id=cluster_id),
+            "k8s_cluster",
+            lambda: fetch_listing(
+                functools.partial(k8s_api.list_pools, region=region, cluster_id=cluster_id), "pools", target=region
+            ),
+            tags=tags,
+            fresh=fresh,
+        ),
+        read_through(
+            cache_key("list_k8s_nodes", region, cluster_id=cluster_id),
+            "k8s_cluster",
+            lambda: fetch_listing(
+                functools.partial(k8s_api.list_nodes, region=region, cluster_id=cluster_id), "nodes", target=region
+            ),
+            tags=tags,
+            fresh=fresh,
+        ),
+    )
+    logger.debug(f"Cluster {cluster_id}: {len(pools.items)} pool(s), {len(nodes.items)} node(s)")
+
+    record = summarize_cluster(cluster, pools.items, nodes.items)
+    return StructuredText(record) if json_output else render_cluster_summary(record)
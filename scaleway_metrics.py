@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Metrics
+Minimal Prometheus-compatible counters, gauges and histograms for tool calls
+and upstream Scaleway API requests, rendered in the text exposition format
+for the HTTP server's /metrics endpoint and the STDIO server's stats tool.
+"""
+
+import contextlib
+import functools
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterator
+from urllib.parse import urlparse
+
+from scaleway_cache import cache_stats
+from scaleway_executor import executor_stats
+from scaleway_inventory import inventory_stats
+from scaleway_ratelimit import api_family, rate_limiter_stats
+
+logger = logging.getLogger("scaleway-mcp.metrics")
+
+# Latency buckets in seconds, from cached reads to multi-zone fan-outs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class for a metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            yield self.name, _format_labels(self.labels, key), value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return state["count"] if state else 0
+
+    def series(self) -> list[tuple[tuple, dict]]:
+        """Snapshot of (label values, {"counts", "sum", "count"}) per label set."""
+        with self._lock:
+            items = [(key, {**state, "counts": list(state["counts"])}) for key, state in self._values.items()]
+        return sorted(items, key=lambda item: item[0])
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, state in self.series():
+            for bound, count in zip(self.buckets, state["counts"]):
+                yield f"{self.name}_bucket", _format_labels(self.labels, key, f'le="{_format_value(bound)}"'), count
+            yield f"{self.name}_sum", _format_labels(self.labels, key), state["sum"]
+            yield f"{self.name}_count", _format_labels(self.labels, key), state["count"]
+
+
+class MetricsRegistry:
+    """Holds the metric families and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], list[Metric]]] = []
+
+    def register(self, metric: Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list[Metric]]) -> None:
+        """Register a function producing metrics at scrape time (e.g. from component stats)."""
+        self._collectors.append(collector)
+
+    def collect(self) -> list[Metric]:
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        return metrics
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self.collect():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+TOOL_CALLS = registry.register(Counter(
+    "scaleway_mcp_tool_calls_total", "Tool calls handled, by tool.", ("tool",)))
+TOOL_ERRORS = registry.register(Counter(
+    "scaleway_mcp_tool_errors_total", "Tool calls that raised or returned an error, by tool.", ("tool",)))
+TOOL_DURATION = registry.register(Histogram(
+    "scaleway_mcp_tool_duration_seconds", "Tool call latency in seconds, by tool.", ("tool",)))
+TOOLS_IN_FLIGHT = registry.register(Gauge(
+    "scaleway_mcp_tool_calls_in_flight", "Tool calls currently running, by tool.", ("tool",)))
+UPSTREAM_REQUESTS = registry.register(Counter(
+    "scaleway_mcp_upstream_requests_total", "Scaleway API requests sent, by API family, zone/region and status.",
+    ("family", "zone", "status")))
+UPSTREAM_DURATION = registry.register(Histogram(
+    "scaleway_mcp_upstream_duration_seconds", "Scaleway API request latency in seconds, by API family and zone/region.",
+    ("family", "zone")))
+UPSTREAM_IN_FLIGHT = registry.register(Gauge(
+    "scaleway_mcp_upstream_requests_in_flight", "Scaleway API requests currently waiting for a response, by API family.",
+    ("family",)))
+
+
+def _runtime_metrics() -> list[Metric]:
+    """Expose cache, executor and rate limiter stats as gauges and counters."""
+    metrics: list[Metric] = []
+
+    def gauge(name: str, documentation: str, value: float) -> None:
+        metric = Gauge(name, documentation)
+        metric.set(value)
+        metrics.append(metric)
+
+    def counter(name: str, documentation: str, value: float) -> None:
+        metric = Counter(name, documentation)
+        metric.inc(value)
+        metrics.append(metric)
+
+    cache = cache_stats()
+    counter("scaleway_mcp_cache_hits_total", "Read cache hits.", cache["hits"])
+    counter("scaleway_mcp_cache_misses_total", "Read cache misses.", cache["misses"])
+    counter("scaleway_mcp_cache_coalesced_total", "Reads that joined an identical in-flight read.", cache["coalesced"])
+    counter("scaleway_mcp_cache_evictions_total", "Read cache LRU evictions.", cache["evictions"])
+    gauge("scaleway_mcp_cache_hit_ratio", "Read cache hit ratio since start.", cache["hit_ratio"])
+    gauge("scaleway_mcp_cache_entries", "Entries currently cached.", cache["entries"])
+    gauge("scaleway_mcp_cache_in_flight", "Distinct reads currently in flight.", cache["in_flight"])
+
+    executor = executor_stats()
+    gauge("scaleway_mcp_executor_active", "Blocking API calls currently running.", executor["active"])
+    gauge("scaleway_mcp_executor_queue_depth", "Blocking API calls waiting for a worker.", executor["queue_depth"])
+    counter("scaleway_mcp_executor_timeouts_total", "Blocking API calls that timed out.", executor["timed_out"])
+
+    limiter = rate_limiter_stats()
+    counter("scaleway_mcp_upstream_retries_total", "Scaleway API requests retried.", limiter["retries"])
+    counter("scaleway_mcp_upstream_rate_limited_total", "Scaleway API responses with status 429.", limiter["rate_limited"])
+    throttled = Counter(
+        "scaleway_mcp_upstream_throttled_total", "Requests delayed by the client-side rate limiter, by API family.",
+        ("family",))
+    for family, count in limiter["throttled"].items():
+        throttled.inc(count, family=family)
+    metrics.append(throttled)
+
+    return metrics
+
+
+registry.add_collector(_runtime_metrics)
+
+
+def is_error_result(result: Any) -> bool:
+    """Tools report failures by returning text starting with "Error:"."""
+    return isinstance(result, str) and result.startswith("Error:")
+
+
+@contextlib.contextmanager
+def track_tool(name: str) -> Iterator[dict]:
+    """Time a tool call. Set ``outcome["error"] = True`` to count it as failed."""
+    outcome = {"error": False}
+    TOOL_CALLS.inc(tool=name)
+    TOOLS_IN_FLIGHT.inc(tool=name)
+    start = time.perf_counter()
+    try:
+        yield outcome
+    except BaseException:
+        outcome["error"] = True
+        raise
+    finally:
+        TOOL_DURATION.observe(time.perf_counter() - start, tool=name)
+        TOOLS_IN_FLIGHT.dec(tool=name)
+        if outcome["error"]:
+            TOOL_ERRORS.inc(tool=name)
+
+
+def instrument_tool(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Count and time the calls of an async tool function, named after the function.
+
+    Apply it right under ``@mcp.tool`` so it sees what FastMCP gets back.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with track_tool(name) as outcome:
+            result = await func(*args, **kwargs)
+            outcome["error"] = is_error_result(result)
+            return result
+
+    return wrapper
+
+
+def upstream_scope(url: str) -> str:
+    """Zone or region a Scaleway API URL targets, e.g. "fr-par-1" for /instance/v1/zones/fr-par-1/..."""
+    parts = urlparse(url).path.strip("/").split("/")
+    for i, part in enumerate(parts[:-1]):
+        if part in ("zones", "regions"):
+            return parts[i + 1]
+    return "global"
+
+
+@contextlib.contextmanager
+def track_upstream(method: str, url: str) -> Iterator[dict]:
+    """Time one Scaleway API request. Set ``outcome["status"]`` to the response status."""
+    family, zone = api_family(url), upstream_scope(url)
+    outcome: dict = {"status": "error"}
+    UPSTREAM_IN_FLIGHT.inc(family=family)
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        UPSTREAM_DURATION.observe(time.perf_counter() - start, family=family, zone=zone)
+        UPSTREAM_REQUESTS.inc(family=family, zone=zone, status=str(outcome["status"]))
+        UPSTREAM_IN_FLIGHT.dec(family=family)
+
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    return registry.render()
+
+
+def stats_summary() -> str:
+    """Human-readable summary of per-tool and upstream latency, for the STDIO stats tool."""
+    result = "Tool calls:\n"
+    tool_rows = []
+    for (tool,), state in TOOL_DURATION.series():
+        tool_rows.append(
+            f"- {tool}: {state['count']} call(s), {int(TOOL_ERRORS.value(tool=tool))} error(s), "
+            f"avg {state['sum'] / state['count'] * 1000:.0f}ms\n"
+        )
+    result += "".join(tool_rows) or "- none yet\n"
+
+    result += "\nScaleway API requests:\n"
+    upstream_rows = []
+    for (family, zone), state in UPSTREAM_DURATION.series():
+        upstream_rows.append(
+            f"- {family} @ {zone}: {state['count']} request(s), avg {state['sum'] / state['count'] * 1000:.0f}ms\n"
+        )
+    result += "".join(upstream_rows) or "- none yet\n"
+
+    cache = cache_stats()
+    result += (
+        f"\nCache: {cache['hits']} hit(s), {cache['misses']} miss(es), "
+        f"hit ratio {cache['hit_ratio']:.0%}, {cache['coalesced']} coalesced read(s)\n"
+    )
+    executor = executor_stats()
+    result += f"Executor: {executor['active']} active, {executor['queue_depth']} queued, {executor['timed_out']} timed out\n"
+    inventory = inventory_stats()
+    if inventory["enabled"]:
+        result += (
+            f"Inventory: {inventory['served']} answer(s) served, {inventory['fallbacks']} fallback(s) to the API, "
+            f"{sum(c['items'] for c in inventory['collections'])} item(s) in {len(inventory['collections'])} collection(s)\n"
+        )
+    # Imported here: the async transport records its requests through this module
+    from scaleway_async_http import async_transport_stats
+
+    transport = async_transport_stats()
+    if transport["enabled"]:
+        result += (
+            f"Async HTTP: {transport['requests']} request(s), {transport['in_flight']} in flight "
+            f"(peak {transport['peak_in_flight']}), {'HTTP/2' if transport['http2'] else 'HTTP/1.1'}\n"
+        )
+    return result
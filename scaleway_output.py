@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Structured Output
+``format=json`` rendering and ``fields=[...]`` projection for list/get tools.
+Only the requested fields are extracted from the SDK objects, and JSON
+results are returned both as text and as MCP structured content.
+"""
+
+import functools
+import json
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from scaleway_fanout import FanOutResult
+from scaleway_pagination import Page
+
+OUTPUT_FORMATS = ("text", "json")
+
+
+def _value(value: Any) -> Any:
+    """Convert an SDK attribute to a JSON-compatible value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _value(v) for k, v in value.items()}
+    return str(value)
+
+
+def _attr(*path: str) -> Callable[[Any], Any]:
+    """Extractor following a dotted attribute path, tolerating missing attributes."""
+    def extract(obj: Any) -> Any:
+        for name in path:
+            obj = getattr(obj, name, None)
+            if obj is None:
+                return None
+        return _value(obj)
+    return extract
+
+
+def _volumes(server: Any) -> list:
+    return [
+        {"slot": slot, "id": vol.id, "name": vol.name, "size": vol.size, "volume_type": _value(vol.volume_type)}
+        for slot, vol in (server.volumes or {}).items()
+    ]
+
+
+# Field name -> extractor, per resource type
+FIELDS: dict[str, dict[str, Callable[[Any], Any]]] = {
+    "instance": {
+        "id": _attr("id"),
+        "name": _attr("name"),
+        "state": _attr("state"),
+        "commercial_type": _attr("commercial_type"),
+        "zone": _attr("zone"),
+        "arch": _attr("arch"),
+        "public_ip": _attr("public_ip", "address"),
+        "private_ip": _attr("private_ip"),
+        "ipv6": _attr("ipv6", "address"),
+        "image": _attr("image", "name"),
+        "protected": _attr("protected"),
+        "tags": _attr("tags"),
+        "volumes": _volumes,
+        "creation_date": _attr("creation_date"),
+        "modification_date": _attr("modification_date"),
+    },
+    "private_network": {
+        "id": _attr("id"),
+        "name": _attr("name"),
+        "region": _attr("region"),
+        "vpc_id": _attr("vpc_id"),
+        "subnets": lambda network: [_value(subnet.subnet) for subnet in network.subnets or []],
+        "dhcp_enabled": _attr("dhcp_enabled"),
+        "tags": _attr("tags"),
+        "created_at": _attr("created_at"),
+        "updated_at": _attr("updated_at"),
+    },
+    "k8s_cluster": {
+        "id": _attr("id"),
+        "name": _attr("name"),
+        "status": _attr("status"),
+        "version": _attr("version"),
+        "cni": _attr("cni"),
+        "type": _attr("type_"),
+        "region": _attr("region"),
+        "description": _attr("description"),
+        "cluster_url": _attr("cluster_url"),
+        "private_network_id": _attr("private_network_id"),
+        "tags": _attr("tags"),
+        "created_at": _attr("created_at"),
+        "updated_at": _attr("updated_at"),
+    },
+    "image": {
+        "id": _attr("id"),
+        "name": _attr("name"),
+        "arch": _attr("arch"),
+        "state": _attr("state"),
+        "public": _attr("public"),
+        "zone": _attr("zone"),
+        "tags": _attr("tags"),
+        "creation_date": _attr("creation_date"),
+        "modification_date": _attr("modification_date"),
+    },
+}
+
+# Fields returned by list tools when none are requested; get tools return every field
+LIST_FIELDS = {
+    "instance": ("id", "name", "state", "commercial_type", "zone", "public_ip", "private_ip", "creation_date"),
+    "private_network": ("id", "name", "region", "subnets", "tags", "created_at"),
+    "k8s_cluster": ("id", "name", "status", "version", "cni", "region", "tags", "created_at"),
+    "image": ("id", "name", "arch", "public", "creation_date"),
+}
+
+
+def check_format(format: str) -> bool:
+    """Validate a ``format`` argument. Returns whether JSON output was requested."""
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format '{format}'. Use one of: {', '.join(OUTPUT_FORMATS)}")
+    return format == "json"
+
+
+def filtered_fields(filtered: bool) -> dict:
+    """A ``filtered`` key for pages whose ``total_count`` only counts their own matches."""
+    return {"filtered": True} if filtered else {}
+
+
+def staleness_fields(as_of: Optional[float]) -> dict:
+    """``as_of``/``staleness_seconds`` keys for answers served from the background inventory."""
+    if as_of is None:
+        return {}
+    return {
+        "as_of": datetime.fromtimestamp(as_of, timezone.utc).isoformat(),
+        "staleness_seconds": round(max(0.0, time.time() - as_of), 1),
+    }
+
+
+class StructuredText(str):
+    """Tool output text carrying the structured payload it was rendered from."""
+
+    structured: dict
+
+    def __new__(cls, payload: dict) -> "StructuredText":
+        text = super().__new__(cls, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        text.structured = payload
+        return text
+
+
+def to_call_tool_result(result: Any) -> Any:
+    """Turn StructuredText into a CallToolResult with structured content; pass anything else through."""
+    if isinstance(result, StructuredText):
+        from mcp.types import CallToolResult, TextContent
+
+        return CallToolResult(
+            content=[TextContent(type="text", text=str(result))],
+            structuredContent=result.structured,
+        )
+    return result
+
+
+def structured_tool(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Let a FastMCP tool return StructuredText as MCP structured content.
+
+    Register the tool with ``structured_output=False`` so FastMCP passes the
+    CallToolResult through instead of wrapping the text in {"result": ...}.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return to_call_tool_result(await func(*args, **kwargs))
+
+    return wrapper
+
+
+class ToolOutput:
+    """Output options of one list/get call: format and field projection."""
+
+    def __init__(self, resource_type: str, format: str = "text", fields: Optional[list[str]] = None, listing: bool = True):
+        json_output = check_format(format)
+        available = FIELDS[resource_type]
+        if fields:
+            unknown = [name for name in fields if name not in available]
+            if unknown:
+                raise ValueError(
+                    f"Unknown field(s) {', '.join(unknown)} for {resource_type}. "
+                    f"Available: {', '.join(available)}"
+                )
+
+        self.resource_type = resource_type
+        self.json = json_output
+        self.requested = tuple(dict.fromkeys(fields)) if fields else None
+        self.fields = self.requested or (LIST_FIELDS[resource_type] if listing else tuple(available))
+        self._extractors = [(name, available[name]) for name in self.fields]
+
+    def project(self, item: Any) -> dict:
+        """Extract the selected fields of an SDK object."""
+        return {name: extract(item) for name, extract in self._extractors}
+
+    def format_item(self, default: Callable[[Any], str]) -> Callable[[Any], str]:
+        """Text renderer for one item: ``default`` unless specific fields were requested."""
+        if self.requested is None:
+            return default
+
+        def render(item: Any) -> str:
+            record = self.project(item)
+            first, *rest = record.items()
+            result = f"- **{first[0]}**: {first[1]}\n"
+            for name, value in rest:
+                result += f"  - {name}: {value}\n"
+            return result + "\n"
+
+        return render
+
+    def render_item(self, item: Any, as_of: Optional[float] = None) -> StructuredText:
+        return StructuredText({**self.project(item), **staleness_fields(as_of)})
+
+    def render_listing(self, listing: Page, scope: str) -> StructuredText:
+        return StructuredText({
+            scope: listing.target,
+            "total_count": listing.total_count,
+            "items": [self.project(item) for item in listing.items],
+            "next_cursor": listing.next_cursor,
+            **filtered_fields(listing.filtered),
+            **staleness_fields(listing.as_of),
+        })
+
+    def render_fan_out(self, results: list[FanOutResult], scope: str) -> StructuredText:
+        targets = []
+        for r in results:
+            if r.error is not None:
+                targets.append({scope: r.target, "error": str(r.error)})
+                continue
+            targets.append({
+                scope: r.target,
+                "total_count": r.total_count if r.total_count is not None else len(r.items),
+                "items": [self.project(item) for item in r.items],
+                "next_cursor": r.next_cursor,
+                **filtered_fields(r.filtered),
+                **staleness_fields(r.as_of),
+            })
+        return StructuredText({
+            "total_count": sum(t.get("total_count", 0) for t in targets),
+            f"{scope}s": targets,
+        })
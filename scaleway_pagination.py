@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Pagination
+Page-by-page iteration over Scaleway list endpoints and the opaque cursors
+that let MCP clients continue a listing where they left off.
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import math
+import time
+from typing import Any, AsyncIterator, Callable, NamedTuple, Optional
+
+from scaleway_executor import run_blocking
+
+logger = logging.getLogger("scaleway-mcp.pagination")
+
+# Largest page the Instance, VPC and Kubernetes list endpoints accept
+MAX_PAGE_SIZE = 100
+
+# Pages of one full listing fetched at the same time, after the first
+PAGE_CONCURRENCY = 4
+
+
+class Page(NamedTuple):
+    """One page of a Scaleway listing."""
+
+    target: str
+    items: list
+    page: int
+    page_size: int
+    total_count: int
+    next_cursor: Optional[str]
+    # Wall-clock time of the inventory sync the page was served from, None if fetched from the API
+    as_of: Optional[float] = None
+    # Local filters dropped items from one page of a longer listing: total_count
+    # then counts the matches on this page only
+    filtered: bool = False
+
+
+def encode_cursor(target: str, page: int, page_size: int) -> str:
+    """Encode the position of the next page as an opaque cursor string."""
+    raw = json.dumps({"t": target, "p": page, "s": page_size}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int, int]:
+    """Decode a cursor produced by :func:`encode_cursor` into (target, page, page_size)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(data["t"]), int(data["p"]), int(data["s"])
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+
+
+def resolve_cursor(cursor: Optional[str], page_size: Optional[int]) -> tuple[Optional[str], int, Optional[int]]:
+    """Turn the ``cursor``/``page_size`` tool arguments into (target, page, page_size).
+
+    The target is None unless a cursor pins the listing to a zone or region.
+    A page size of None means "fetch every page".
+    """
+    if cursor:
+        target, page, cursor_page_size = decode_cursor(cursor)
+        return target, page, cursor_page_size
+    if page_size is not None:
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    return None, 1, page_size
+
+
+async def iter_pages(
+    list_call: Callable[..., Any],
+    key: str,
+    *,
+    target: str,
+    page_size: int = MAX_PAGE_SIZE,
+    start_page: int = 1,
+    size_param: str = "page_size",
+) -> AsyncIterator[Page]:
+    """Lazily fetch a listing page by page.
+
+    Args:
+        list_call: SDK list method with the zone/region already bound
+        key: Attribute of the response holding the items (e.g. "servers")
+        target: Zone or region the listing runs in, used to build cursors
+        page_size: Items per upstream request
+        start_page: First page to fetch
+        size_param: Name of the SDK's page size argument ("per_page" for Instance)
+    """
+    page = start_page
+    while True:
+        response = await run_blocking(list_call, page=page, **{size_param: page_size})
+        items = getattr(response, key) or []
+        total_count = int(getattr(response, "total_count", 0) or 0)
+
+        has_more = page * page_size < total_count if total_count else len(items) == page_size
+        next_cursor = encode_cursor(target, page + 1, page_size) if items and has_more else None
+
+        yield Page(target, items, page, page_size, total_count or len(items), next_cursor)
+
+        if next_cursor is None:
+            return
+        page += 1
+
+
+async def fetch_listing(
+    list_call: Callable[..., Any],
+    key: str,
+    *,
+    target: str,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    size_param: str = "page_size",
+) -> Page:
+    """Fetch one page, or every page when ``page_size`` is None, as a single Page.
+
+    A full listing reads the total count from the first page and fetches the
+    remaining pages concurrently (at most PAGE_CONCURRENCY at a time). If the
+    pages do not add up to that count (the API served smaller pages than
+    asked, or the listing changed meanwhile), it is read again page by page.
+    """
+    if page_size is not None:
+        pages = iter_pages(list_call, key, target=target, page_size=page_size, start_page=page, size_param=size_param)
+        try:
+            return await anext(pages)
+        finally:
+            await pages.aclose()
+
+    def sequential(start_page: int, size: int) -> AsyncIterator[Page]:
+        return iter_pages(list_call, key, target=target, page_size=size, start_page=start_page, size_param=size_param)
+
+    # The first page gives the total count; the others are then fetched concurrently
+    response = await run_blocking(list_call, page=1, **{size_param: MAX_PAGE_SIZE})
+    items: list = list(getattr(response, key) or [])
+    total_count = int(getattr(response, "total_count", 0) or 0)
+
+    if total_count and len(items) == min(total_count, MAX_PAGE_SIZE):
+        semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+        async def fetch_page(number: int) -> list:
+            async with semaphore:
+                result = await run_blocking(list_call, page=number, **{size_param: MAX_PAGE_SIZE})
+            return getattr(result, key) or []
+
+        remaining = range(2, math.ceil(total_count / MAX_PAGE_SIZE) + 1)
+        for page_items in await asyncio.gather(*map(fetch_page, remaining)):
+            items.extend(page_items)
+
+        if len(items) != total_count:
+            # Items moved between pages while they were fetched: some may be missing or repeated
+            logger.info(f"Got {len(items)} of {total_count} {key} from {target}, listing them again page by page")
+            items = [item async for result in sequential(1, MAX_PAGE_SIZE) for item in result.items]
+    elif total_count and items and len(items) < total_count:
+        # The API serves fewer items per page than asked: number the pages by its size
+        async for result in sequential(2, len(items)):
+            items.extend(result.items)
+    elif not total_count and len(items) == MAX_PAGE_SIZE:
+        async for result in sequential(2, MAX_PAGE_SIZE):
+            items.extend(result.items)
+
+    logger.debug(f"Fetched {len(items)} {key} from {target}")
+    return Page(target, items, 1, len(items), len(items), None)
+
+
+def render_page(header: str, listing: Page, format_item: Callable[[Any], str]) -> str:
+    """Render a header, every item of a page and its footer in a single join."""
+    parts = itertools.chain((header,), map(format_item, listing.items), (page_footer(listing),))
+    return "".join(parts)
+
+
+def staleness_note(as_of: Optional[float]) -> str:
+    """Say how old an answer served from the background inventory is; empty for live answers."""
+    if as_of is None:
+        return ""
+    return f"(From the background inventory, synced {max(0.0, time.time() - as_of):.0f}s ago.)\n"
+
+
+def listing_header(listing: Page, noun: str, location: str) -> str:
+    """Render the first line of a listing, e.g. "Found 3 instance(s) in zone fr-par-1:"."""
+    if listing.filtered:
+        return f"Found {len(listing.items)} matching {noun} on page {listing.page} in {location}:\n\n"
+    return f"Found {listing.total_count} {noun} in {location}:\n\n"
+
+
+def page_footer(listing: Page) -> str:
+    """Render the position and continuation hint for a partial listing, and its staleness."""
+    if listing.next_cursor is None and listing.page == 1:
+        return staleness_note(listing.as_of)
+    if listing.filtered:
+        # The page's position in the unfiltered listing says nothing about the matches
+        result = f"{len(listing.items)} match(es) on this page, "
+        result += "more pages remain." if listing.next_cursor is not None else "the last page."
+    else:
+        first = (listing.page - 1) * listing.page_size + 1
+        last = first + len(listing.items) - 1
+        result = f"Showing {first}-{last} of {listing.total_count}."
+    if listing.next_cursor is not None:
+        result += f" To continue, call again with cursor=\"{listing.next_cursor}\"."
+    return result + "\n" + staleness_note(listing.as_of)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Sampling Profiler
+Opt-in wall-clock sampling profiler for the HTTP server. Once armed, it
+samples the stacks of every thread (event loop and executor workers) while
+the next N MCP requests are being handled, and renders them in the collapsed
+"folded stacks" format understood by flamegraph.pl, speedscope and inferno.
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Iterator, Optional
+
+logger = logging.getLogger("scaleway-mcp.profiler")
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_REQUESTS = 10
+MAX_STACK_DEPTH = 128
+
+# Leaf frames of threads that are parked waiting for work
+IDLE_FRAMES = {("threading.py", "wait"), ("queue.py", "get"), ("thread.py", "_worker")}
+
+
+def profiler_enabled() -> bool:
+    """The profiler endpoints only exist when SCW_MCP_ENABLE_PROFILER is set."""
+    return os.getenv("SCW_MCP_ENABLE_PROFILER", "").lower() in ("1", "true", "yes")
+
+
+class SamplingProfiler:
+    """Samples thread stacks while armed requests are in flight."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.remaining = 0
+        self.captured = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def arm(self, requests: int) -> None:
+        """Discard previous samples and profile the next ``requests`` requests."""
+        with self._lock:
+            self.samples.clear()
+            self.remaining = max(0, requests)
+            self.captured = 0
+        logger.info(f"Profiling the next {requests} request(s)")
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator[bool]:
+        """Profile the enclosed request if the profiler is armed. Yields whether it is profiled."""
+        with self._lock:
+            profiled = self.remaining > 0
+            if profiled:
+                self.remaining -= 1
+                self._active += 1
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._sample, name="scaleway-profiler", daemon=True)
+                    self._thread.start()
+        try:
+            yield profiled
+        finally:
+            if profiled:
+                with self._lock:
+                    self._active -= 1
+                    self.captured += 1
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while True:
+            with self._lock:
+                if self._active == 0:
+                    self._thread = None
+                    return
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._fold(frame)
+                if stack is not None:
+                    if ident not in names:
+                        names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    self.samples[f"{names.get(ident, ident)};{stack}"] += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _fold(frame) -> Optional[str]:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return None
+        frames = []
+        while frame is not None and len(frames) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+            frames.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(frames))
+
+    def collapsed(self) -> str:
+        """Samples in folded-stack format: one "frame;frame;... count" line per stack."""
+        with self._lock:
+            samples = list(self.samples.items())
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(samples))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "remaining": self.remaining,
+                "active": self._active,
+                "captured": self.captured,
+                "samples": sum(self.samples.values()),
+                "interval": self.interval,
+            }
+
+
+# Global profiler shared by the HTTP server
+profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get or create the shared profiler."""
+    global profiler
+
+    if profiler is None:
+        profiler = SamplingProfiler(float(os.getenv("SCW_MCP_PROFILER_INTERVAL", DEFAULT_INTERVAL)))
+    return profiler
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Progress Reporting
+Lets long-running tool code report progress without knowing which transport
+is serving the request. The HTTP server binds a reporter per streamed
+request; the STDIO server forwards to the FastMCP request context.
+"""
+
+import contextlib
+import logging
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional
+
+logger = logging.getLogger("scaleway-mcp.progress")
+
+ProgressReporter = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("scaleway_progress_reporter", default=None)
+
+# Used when no reporter is bound to the current request (see set_default_reporter)
+default_reporter: Optional[ProgressReporter] = None
+
+
+def set_default_reporter(reporter: Optional[ProgressReporter]) -> None:
+    """Install the process-wide reporter used outside of :func:`progress_context`."""
+    global default_reporter
+    default_reporter = reporter
+
+
+@contextlib.contextmanager
+def progress_context(reporter: ProgressReporter) -> Iterator[None]:
+    """Send progress reported by code running in this context to ``reporter``."""
+    token = _reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+async def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report progress for the current tool call. Never raises."""
+    reporter = _reporter.get() or default_reporter
+    if reporter is None:
+        return
+    try:
+        await reporter(progress, total, message)
+    except Exception as e:
+        logger.debug(f"Dropping progress notification: {e}")
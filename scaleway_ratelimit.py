@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Upstream Rate Limiting
+Token-bucket limiters per Scaleway API family and a retry policy with
+exponential backoff and jitter for rate-limited (429) and failed (5xx)
+requests. Applied to every SDK request by the pooled session in
+``scaleway_clients``, and by the async transport in ``scaleway_async_http``.
+"""
+
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+logger = logging.getLogger("scaleway-mcp.ratelimit")
+
+# Requests per second allowed to each API family. Burst defaults to twice the rate.
+DEFAULT_RATES = {
+    "instance": 20.0,
+    "vpc": 10.0,
+    "k8s": 10.0,
+}
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 10.0
+
+# Statuses retried for every method: the request was rejected before being processed.
+# A 502 or 504 may come after the API applied it, so those are retried like any
+# other 5xx, only for idempotent methods; a 503 only counts as a rejection with
+# a Retry-After header
+ALWAYS_RETRY_STATUSES = {429}
+REJECTED_WITH_RETRY_AFTER_STATUSES = {503}
+# Statuses and connection errors are only retried for requests that are safe to repeat
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Callers reserve a token and sleep until it is theirs."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate * 2)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self.throttled += 1
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the time spent waiting."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring ``Retry-After``.
+
+    A ``Retry-After`` longer than ``max_delay`` is not retried at all: the
+    response is handed back rather than sent again before the server allows.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, method: str, status: int, retry_after: Optional[float] = None) -> bool:
+        if retry_after is not None and retry_after > self.max_delay:
+            return False
+        if status in ALWAYS_RETRY_STATUSES:
+            return True
+        if status in REJECTED_WITH_RETRY_AFTER_STATUSES and retry_after is not None:
+            return True
+        return status >= 500 and method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (starting at 0)."""
+        if retry_after is not None:
+            return max(0.0, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def api_family(url: str) -> str:
+    """API family of a Scaleway URL, e.g. "instance" for /instance/v1/zones/..."""
+    path = urlparse(url).path.strip("/")
+    return path.split("/", 1)[0] or "other"
+
+
+class UpstreamLimiter:
+    """Applies the per-family token buckets and the retry policy to HTTP requests."""
+
+    def __init__(self, rates: Optional[dict] = None, policy: Optional[RetryPolicy] = None):
+        self.rates = {**DEFAULT_RATES, **(rates or {})}
+        self.policy = policy or RetryPolicy()
+        self._buckets: dict[str, TokenBucket] = {
+            family: TokenBucket(rate) for family, rate in self.rates.items()
+        }
+        self.retries = 0
+        self.rate_limited = 0
+
+    def bucket(self, url: str) -> Optional[TokenBucket]:
+        return self._buckets.get(api_family(url))
+
+    def send(self, send: Callable[..., "requests.Response"], method: str, url: str, **kwargs: Any) -> "requests.Response":
+        """Call ``send(method, url, **kwargs)`` under the family's rate limit, retrying transient failures."""
+        import requests  # loaded with the SDK by then; not needed to serve /health
+
+        bucket = self.bucket(url)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                bucket.acquire()
+
+            try:
+                response = send(method, url, **kwargs)
+            except requests.ConnectionError as e:
+                if attempt >= self.policy.max_retries or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code == 429:
+                    self.rate_limited += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if attempt >= self.policy.max_retries or not self.policy.should_retry(method, response.status_code, retry_after):
+                    return response
+                delay = self.policy.delay(attempt, retry_after)
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+
+            self.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    async def send_async(
+        self, send: Callable[..., Awaitable["httpx.Response"]], method: str, url: str, **kwargs: Any
+    ) -> "httpx.Response":
+        """Like :meth:`send`, for an async ``send`` returning an httpx response; waits without blocking the event loop."""
+        import httpx
+
+        bucket = self.bucket(url)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                wait = bucket.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            try:
+                response = await send(method, url, **kwargs)
+            except (httpx.NetworkError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                if attempt >= self.policy.max_retries or method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                delay = self.policy.delay(attempt)
+                logger.warning(f"{method} {url} failed ({e!r}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code == 429:
+                    self.rate_limited += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if attempt >= self.policy.max_retries or not self.policy.should_retry(method, response.status_code, retry_after):
+                    return response
+                delay = self.policy.delay(attempt, retry_after)
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                await response.aclose()
+
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "rates": self.rates,
+            "throttled": {family: bucket.throttled for family, bucket in self._buckets.items()},
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+# Global limiter shared by every tool in the process
+upstream_limiter: Optional[UpstreamLimiter] = None
+
+
+def get_rate_limiter() -> UpstreamLimiter:
+    """Get or create the shared limiter, configured from environment variables."""
+    global upstream_limiter
+
+    if upstream_limiter is not None:
+        return upstream_limiter
+
+    # Each worker process has its own limiter; split the rates so that
+    # together they stay within the configured limits
+    workers = max(1, int(os.getenv("SCW_MCP_WORKERS", 1)))
+    rates = {
+        family: float(os.getenv(f"SCW_MCP_RATE_LIMIT_{family.upper()}", rate)) / workers
+        for family, rate in DEFAULT_RATES.items()
+    }
+    policy = RetryPolicy(
+        max_retries=int(os.getenv("SCW_MCP_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        base_delay=float(os.getenv("SCW_MCP_RETRY_BASE_DELAY", DEFAULT_BASE_DELAY)),
+        max_delay=float(os.getenv("SCW_MCP_RETRY_MAX_DELAY", DEFAULT_MAX_DELAY)),
+    )
+
+    logger.info(
+        f"Initializing upstream rate limiter with rates={rates}, "
+        f"max_retries={policy.max_retries}, delay={policy.base_delay}-{policy.max_delay}s"
+    )
+
+    upstream_limiter = UpstreamLimiter(rates=rates, policy=policy)
+    return upstream_limiter
+
+
+def rate_limiter_stats() -> dict:
+    """Return stats for the shared limiter."""
+    return get_rate_limiter().stats()
@@ -7,12 +7,28 @@ A Model Context Protocol server for managing Scaleway cloud infrastructure.
 import os
 import sys
 import logging
-from typing import Any, Optional
+import contextlib
+import functools
+from typing import Any, AsyncIterator, Optional
 from mcp.server.fastmcp import FastMCP
 from scaleway import Client
-from scaleway.instance.v1.api import InstanceV1API
-from scaleway.vpc.v2.api import VpcV2API
-from scaleway.k8s.v1.api import K8SV1API
+
+from scaleway_async_http import close_async_transport
+from scaleway_bulk import bulk_server_action
+from scaleway_cache import cache_key, read_through, resource_tag, write_through
+from scaleway_clients import ClientManager, get_client_manager
+from scaleway_executor import run_blocking
+from scaleway_fanout import fan_out, render_fan_out, resolve_regions, resolve_zones
+from scaleway_filters import instance_filters, k8s_cluster_filters, private_network_filters
+from scaleway_inventory import inventory_item, inventory_listing, start_inventory, stop_inventory
+from scaleway_k8s import describe_cluster
+from scaleway_metrics import instrument_tool, render_metrics, stats_summary
+from scaleway_output import ToolOutput, structured_tool
+from scaleway_pagination import Page, fetch_listing, listing_header, render_page, resolve_cursor, staleness_note
+from scaleway_progress import set_default_reporter
+from scaleway_tool_definitions import implements
+from scaleway_topology import cluster_topology_report, instance_topology_report, network_members_report
+from scaleway_waiter import format_wait_result, get_state_poller, wait_timeout
 
 # Configure logging to stderr only (NEVER use print() in STDIO-based MCP servers)
 logging.basicConfig(
@@ -22,8 +38,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger("scaleway-mcp")
 
+# Images shown per page by list_images when no page_size is given
+DEFAULT_IMAGE_PAGE_SIZE = 20
+
+
+@contextlib.asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Keep the background inventory in sync while the server runs, if it is enabled."""
+    start_inventory(get_api_clients)
+    try:
+        yield
+    finally:
+        await stop_inventory()
+        await close_async_transport()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("scaleway")
+mcp = FastMCP("scaleway", lifespan=server_lifespan)
+
+
+async def _report_progress_to_client(progress: float, total: Optional[float], message: Optional[str]) -> None:
+    """Forward tool progress to the MCP client of the current request."""
+    await mcp.get_context().report_progress(progress, total, message)
+
+
+set_default_reporter(_report_progress_to_client)
 
 # Global Scaleway client
 scaleway_client: Optional[Client] = None
@@ -58,45 +97,100 @@ def get_scaleway_client() -> Client:
         default_organization_id=organization_id,
         default_region=default_region,
         default_zone=default_zone,
+        api_url=os.getenv("SCW_API_URL", "https://api.scaleway.com"),
     )
     
     return scaleway_client
 
 
+def get_api_clients() -> ClientManager:
+    """Get the shared manager holding long-lived Scaleway API objects and the pooled HTTP session."""
+    return get_client_manager(get_scaleway_client)
+
+
 # ============================================================================
 # INSTANCE MANAGEMENT TOOLS
 # ============================================================================
 
-@mcp.tool()
-async def list_instances(zone: Optional[str] = None) -> str:
-    """List all compute instances in a Scaleway zone.
-    
-    Args:
-        zone: Scaleway zone (e.g., fr-par-1, nl-ams-1). If not provided, uses default zone.
-    """
+def _format_instance(server: Any) -> str:
+    """Render one instance as a markdown list entry."""
+    result = f"- **{server.name}** (ID: {server.id})\n"
+    result += f"  - State: {server.state}\n"
+    result += f"  - Type: {server.commercial_type}\n"
+    result += f"  - Public IP: {server.public_ip.address if server.public_ip else 'None'}\n"
+    result += f"  - Private IP: {server.private_ip or 'None'}\n"
+    result += f"  - Created: {server.creation_date}\n\n"
+    return result
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("list_instances")
+async def list_instances(
+    zone: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    state: Optional[str] = None,
+    commercial_type: Optional[str] = None,
+    private_network: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
     try:
+        output = ToolOutput("instance", format, fields)
+        filters = instance_filters(name, tags, state, commercial_type, private_network, arch)
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
-        
-        target_zone = zone or client.default_zone
-        logger.info(f"Listing instances in zone: {target_zone}")
-        
-        response = instance_api.list_servers(zone=target_zone)
-        servers = response.servers or []
-        
-        if not servers:
+        instance_api = get_api_clients().instance
+        
+        cursor_zone, page, page_size = resolve_cursor(cursor, page_size)
+        zones = [cursor_zone] if cursor_zone else resolve_zones(zone, client.default_zone)
+        logger.info(f"Listing instances in zone(s): {', '.join(zones)}")
+        
+        async def fetch(target_zone: str) -> Page:
+            listing = await inventory_listing("instance", target_zone, filters, page, page_size, fresh=fresh)
+            if listing is not None:
+                return listing
+            listing = await read_through(
+                cache_key("list_instances", target_zone, page=page, page_size=page_size, **filters.api_args),
+                "instance",
+                lambda: fetch_listing(
+                    functools.partial(instance_api.list_servers, zone=target_zone, **filters.api_args),
+                    "servers",
+                    target=target_zone,
+                    page=page,
+                    page_size=page_size,
+                    size_param="per_page",
+                ),
+                tags=[resource_tag("instance", target_zone)],
+                fresh=fresh,
+            )
+            return filters.apply(listing)
+        
+        if len(zones) > 1:
+            results = await fan_out(zones, fetch)
+            if output.json:
+                return output.render_fan_out(results, "zone")
+            return render_fan_out(results, "instance(s)", "zone", output.format_item(_format_instance))
+        
+        target_zone = zones[0]
+        listing = await fetch(target_zone)
+        
+        if output.json:
+            return output.render_listing(listing, "zone")
+        
+        if not listing.items and listing.next_cursor is None:
             return f"No instances found in zone {target_zone}."
         
-        result = f"Found {len(servers)} instance(s) in zone {target_zone}:\n\n"
-        for server in servers:
-            result += f"- **{server.name}** (ID: {server.id})\n"
-            result += f"  - State: {server.state}\n"
-            result += f"  - Type: {server.commercial_type}\n"
-            result += f"  - Public IP: {server.public_ip.address if server.public_ip else 'None'}\n"
-            result += f"  - Private IP: {server.private_ip or 'None'}\n"
-            result += f"  - Created: {server.creation_date}\n\n"
-        
-        return result
+        return render_page(
+            listing_header(listing, "instance(s)", f"zone {target_zone}"),
+            listing,
+            output.format_item(_format_instance),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list instances: {str(e)}"
@@ -104,23 +198,46 @@ async def list_instances(zone: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
-@mcp.tool()
-async def get_instance(instance_id: str, zone: Optional[str] = None) -> str:
-    """Get detailed information about a specific instance.
-    
-    Args:
-        instance_id: The ID of the instance to retrieve
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-    """
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("get_instance")
+async def get_instance(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
     try:
+        output = ToolOutput("instance", format, fields, listing=False)
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Getting instance {instance_id} in zone {target_zone}")
         
-        server = instance_api.get_server(zone=target_zone, server_id=instance_id)
-        s = server.server
+        found = await inventory_item("instance", target_zone, instance_id, fresh=fresh)
+        if found is not None:
+            s, as_of = found
+        else:
+            server = await read_through(
+                cache_key("get_instance", target_zone, instance_id=instance_id),
+                "instance",
+                lambda: run_blocking(instance_api.get_server, zone=target_zone, server_id=instance_id),
+                tags=[resource_tag("instance", target_zone, instance_id)],
+                fresh=fresh,
+            )
+            s, as_of = server.server, None
+        
+        if output.json:
+            return output.render_item(s, as_of)
+        if output.requested:
+            return (
+                f"**Instance Details: {s.name}**\n\n"
+                + output.format_item(_format_instance)(s)
+                + staleness_note(as_of)
+            )
         
         result = f"**Instance Details: {s.name}**\n\n"
         result += f"- ID: {s.id}\n"
@@ -130,7 +247,6 @@ async def get_instance(instance_id: str, zone: Optional[str] = None) -> str:
         result += f"- Public IP: {s.public_ip.address if s.public_ip else 'None'}\n"
         result += f"- Private IP: {s.private_ip or 'None'}\n"
         result += f"- IPv6: {s.ipv6.address if s.ipv6 else 'None'}\n"
-        result += f"- Bootscript: {s.bootscript.title if s.bootscript else 'None'}\n"
         result += f"- Protected: {s.protected}\n"
         result += f"- Created: {s.creation_date}\n"
         result += f"- Modified: {s.modification_date}\n"
@@ -143,7 +259,7 @@ async def get_instance(instance_id: str, zone: Optional[str] = None) -> str:
         if s.tags:
             result += f"\n**Tags:** {', '.join(s.tags)}\n"
         
-        return result
+        return result + staleness_note(as_of)
         
     except Exception as e:
         error_msg = f"Failed to get instance: {str(e)}"
@@ -152,36 +268,34 @@ async def get_instance(instance_id: str, zone: Optional[str] = None) -> str:
 
 
 @mcp.tool()
+@instrument_tool
+@implements("create_instance")
 async def create_instance(
     name: str,
     instance_type: str,
     image_id: str,
     zone: Optional[str] = None,
-    tags: Optional[list[str]] = None
+    tags: Optional[list[str]] = None,
+    wait: bool = False
 ) -> str:
-    """Create a new compute instance.
-    
-    Args:
-        name: Name for the new instance
-        instance_type: Instance type (e.g., DEV1-S, GP1-XS, PLAY2-NANO)
-        image_id: Image ID to use for the instance
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-        tags: Optional list of tags for the instance
-    """
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Creating instance {name} in zone {target_zone}")
         
-        server = instance_api.create_server(
-            zone=target_zone,
-            name=name,
-            commercial_type=instance_type,
-            image=image_id,
-            project=client.default_project_id,
-            tags=tags or []
+        server = await write_through(
+            run_blocking(
+                instance_api.create_server,
+                zone=target_zone,
+                name=name,
+                commercial_type=instance_type,
+                image=image_id,
+                project=client.default_project_id,
+                tags=tags or []
+            ),
+            resource_tag("instance", target_zone),
         )
         
         s = server.server
@@ -192,6 +306,12 @@ async def create_instance(
         result += f"- State: {s.state}\n"
         result += f"- Zone: {target_zone}\n"
         
+        if wait:
+            outcome = await get_state_poller(instance_api.list_servers).wait_for(
+                target_zone, s.id, {"stopped", "running"}, wait_timeout()
+            )
+            result += "\n" + format_wait_result(outcome, "stopped or running")
+        
         return result
         
     except Exception as e:
@@ -201,27 +321,35 @@ async def create_instance(
 
 
 @mcp.tool()
-async def start_instance(instance_id: str, zone: Optional[str] = None) -> str:
-    """Start a stopped instance.
-    
-    Args:
-        instance_id: The ID of the instance to start
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-    """
+@instrument_tool
+@implements("start_instance")
+async def start_instance(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Starting instance {instance_id} in zone {target_zone}")
         
-        instance_api.server_action(
-            zone=target_zone,
-            server_id=instance_id,
-            action="poweron"
+        await write_through(
+            run_blocking(
+                instance_api.server_action,
+                zone=target_zone,
+                server_id=instance_id,
+                action="poweron"
+            ),
+            resource_tag("instance", target_zone),
+            resource_tag("instance", target_zone, instance_id),
         )
         
-        return f"✓ Instance {instance_id} is starting."
+        result = f"✓ Instance {instance_id} is starting."
+        if wait:
+            outcome = await get_state_poller(instance_api.list_servers).wait_for(
+                target_zone, instance_id, {"running"}, wait_timeout()
+            )
+            result += "\n" + format_wait_result(outcome, "running")
+        
+        return result
         
     except Exception as e:
         error_msg = f"Failed to start instance: {str(e)}"
@@ -230,27 +358,35 @@ async def start_instance(instance_id: str, zone: Optional[str] = None) -> str:
 
 
 @mcp.tool()
-async def stop_instance(instance_id: str, zone: Optional[str] = None) -> str:
-    """Stop a running instance.
-    
-    Args:
-        instance_id: The ID of the instance to stop
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-    """
+@instrument_tool
+@implements("stop_instance")
+async def stop_instance(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Stopping instance {instance_id} in zone {target_zone}")
         
-        instance_api.server_action(
-            zone=target_zone,
-            server_id=instance_id,
-            action="poweroff"
+        await write_through(
+            run_blocking(
+                instance_api.server_action,
+                zone=target_zone,
+                server_id=instance_id,
+                action="poweroff"
+            ),
+            resource_tag("instance", target_zone),
+            resource_tag("instance", target_zone, instance_id),
         )
         
-        return f"✓ Instance {instance_id} is stopping."
+        result = f"✓ Instance {instance_id} is stopping."
+        if wait:
+            outcome = await get_state_poller(instance_api.list_servers).wait_for(
+                target_zone, instance_id, {"stopped"}, wait_timeout()
+            )
+            result += "\n" + format_wait_result(outcome, "stopped")
+        
+        return result
         
     except Exception as e:
         error_msg = f"Failed to stop instance: {str(e)}"
@@ -259,23 +395,24 @@ async def stop_instance(instance_id: str, zone: Optional[str] = None) -> str:
 
 
 @mcp.tool()
+@instrument_tool
+@implements("delete_instance")
 async def delete_instance(instance_id: str, zone: Optional[str] = None) -> str:
-    """Delete an instance.
-    
-    Args:
-        instance_id: The ID of the instance to delete
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-    """
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        instance_api = get_api_clients().instance
         
         target_zone = zone or client.default_zone
         logger.info(f"Deleting instance {instance_id} in zone {target_zone}")
         
-        instance_api.delete_server(
-            zone=target_zone,
-            server_id=instance_id
+        await write_through(
+            run_blocking(
+                instance_api.delete_server,
+                zone=target_zone,
+                server_id=instance_id
+            ),
+            resource_tag("instance", target_zone),
+            resource_tag("instance", target_zone, instance_id),
         )
         
         return f"✓ Instance {instance_id} has been deleted."
@@ -286,39 +423,187 @@ async def delete_instance(instance_id: str, zone: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
-# ============================================================================
-# NETWORK MANAGEMENT TOOLS
-# ============================================================================
+@mcp.tool()
+@instrument_tool
+@implements("wait_for_instance_state")
+async def wait_for_instance_state(
+    instance_id: str,
+    state: str,
+    zone: Optional[str] = None,
+    timeout: float = 300
+) -> str:
+    try:
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
+        
+        target_zone = zone or client.default_zone
+        logger.info(f"Waiting for instance {instance_id} in zone {target_zone} to be {state}")
+        
+        outcome = await get_state_poller(instance_api.list_servers).wait_for(
+            target_zone, instance_id, {state}, timeout
+        )
+        
+        return ("✓ " if outcome.reached else "") + format_wait_result(outcome, state)
+        
+    except Exception as e:
+        error_msg = f"Failed to wait for instance: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
 
 @mcp.tool()
-async def list_private_networks(region: Optional[str] = None) -> str:
-    """List all private networks in a Scaleway region.
-    
-    Args:
-        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
-    """
+@instrument_tool
+@implements("bulk_start_instances")
+async def bulk_start_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False
+) -> str:
     try:
         client = get_scaleway_client()
-        vpc_api = VpcV2API(client)
+        instance_api = get_api_clients().instance
         
-        target_region = region or client.default_region
-        logger.info(f"Listing private networks in region: {target_region}")
+        target_zone = zone or client.default_zone
+        return await bulk_server_action(
+            instance_api, target_zone, "poweron", instance_ids, tags, concurrency, wait
+        )
+        
+    except Exception as e:
+        error_msg = f"Failed to start instances: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@mcp.tool()
+@instrument_tool
+@implements("bulk_stop_instances")
+async def bulk_stop_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False
+) -> str:
+    try:
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
         
-        response = vpc_api.list_private_networks(region=target_region)
-        networks = response.private_networks or []
+        target_zone = zone or client.default_zone
+        return await bulk_server_action(
+            instance_api, target_zone, "poweroff", instance_ids, tags, concurrency, wait
+        )
         
-        if not networks:
-            return f"No private networks found in region {target_region}."
+    except Exception as e:
+        error_msg = f"Failed to stop instances: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@mcp.tool()
+@instrument_tool
+@implements("bulk_delete_instances")
+async def bulk_delete_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None
+) -> str:
+    try:
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
         
-        result = f"Found {len(networks)} private network(s) in region {target_region}:\n\n"
-        for network in networks:
-            result += f"- **{network.name}** (ID: {network.id})\n"
-            result += f"  - Created: {network.created_at}\n"
-            if network.tags:
-                result += f"  - Tags: {', '.join(network.tags)}\n"
-            result += "\n"
+        target_zone = zone or client.default_zone
+        return await bulk_server_action(
+            instance_api, target_zone, "delete", instance_ids, tags, concurrency
+        )
         
-        return result
+    except Exception as e:
+        error_msg = f"Failed to delete instances: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+# ============================================================================
+# NETWORK MANAGEMENT TOOLS
+# ============================================================================
+
+def _format_private_network(network: Any) -> str:
+    """Render one private network as a markdown list entry."""
+    result = f"- **{network.name}** (ID: {network.id})\n"
+    result += f"  - Created: {network.created_at}\n"
+    if network.tags:
+        result += f"  - Tags: {', '.join(network.tags)}\n"
+    result += "\n"
+    return result
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("list_private_networks")
+async def list_private_networks(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    vpc_id: Optional[str] = None,
+    dhcp_enabled: Optional[bool] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    try:
+        output = ToolOutput("private_network", format, fields)
+        filters = private_network_filters(name, tags, vpc_id, dhcp_enabled)
+        client = get_scaleway_client()
+        vpc_api = get_api_clients().vpc
+        
+        cursor_region, page, page_size = resolve_cursor(cursor, page_size)
+        regions = [cursor_region] if cursor_region else resolve_regions(region, client.default_region)
+        logger.info(f"Listing private networks in region(s): {', '.join(regions)}")
+        
+        async def fetch(target_region: str) -> Page:
+            listing = await inventory_listing("private_network", target_region, filters, page, page_size, fresh=fresh)
+            if listing is not None:
+                return listing
+            listing = await read_through(
+                cache_key("list_private_networks", target_region, page=page, page_size=page_size, **filters.api_args),
+                "private_network",
+                lambda: fetch_listing(
+                    functools.partial(vpc_api.list_private_networks, region=target_region, **filters.api_args),
+                    "private_networks",
+                    target=target_region,
+                    page=page,
+                    page_size=page_size,
+                ),
+                tags=[resource_tag("private_network", target_region)],
+                fresh=fresh,
+            )
+            return filters.apply(listing)
+        
+        if len(regions) > 1:
+            results = await fan_out(regions, fetch)
+            if output.json:
+                return output.render_fan_out(results, "region")
+            return render_fan_out(results, "private network(s)", "region", output.format_item(_format_private_network))
+        
+        target_region = regions[0]
+        listing = await fetch(target_region)
+        
+        if output.json:
+            return output.render_listing(listing, "region")
+        
+        if not listing.items and listing.next_cursor is None:
+            return f"No private networks found in region {target_region}."
+        
+        return render_page(
+            listing_header(listing, "private network(s)", f"region {target_region}"),
+            listing,
+            output.format_item(_format_private_network),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list private networks: {str(e)}"
@@ -327,26 +612,25 @@ async def list_private_networks(region: Optional[str] = None) -> str:
 
 
 @mcp.tool()
+@instrument_tool
+@implements("create_private_network")
 async def create_private_network(name: str, region: Optional[str] = None, tags: Optional[list[str]] = None) -> str:
-    """Create a new private network.
-    
-    Args:
-        name: Name for the new private network
-        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
-        tags: Optional list of tags for the network
-    """
     try:
         client = get_scaleway_client()
-        vpc_api = VpcV2API(client)
+        vpc_api = get_api_clients().vpc
         
         target_region = region or client.default_region
         logger.info(f"Creating private network {name} in region {target_region}")
         
-        network = vpc_api.create_private_network(
-            region=target_region,
-            name=name,
-            project_id=client.default_project_id,
-            tags=tags or []
+        network = await write_through(
+            run_blocking(
+                vpc_api.create_private_network,
+                region=target_region,
+                name=name,
+                project_id=client.default_project_id,
+                tags=tags or []
+            ),
+            resource_tag("private_network", target_region),
         )
         
         result = f"✓ Private network created successfully!\n\n"
@@ -366,38 +650,86 @@ async def create_private_network(name: str, region: Optional[str] = None, tags:
 # KUBERNETES MANAGEMENT TOOLS
 # ============================================================================
 
-@mcp.tool()
-async def list_k8s_clusters(region: Optional[str] = None) -> str:
-    """List all Kubernetes clusters in a Scaleway region.
-    
-    Args:
-        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
-    """
+def _format_k8s_cluster(cluster: Any) -> str:
+    """Render one Kubernetes cluster as a markdown list entry."""
+    result = f"- **{cluster.name}** (ID: {cluster.id})\n"
+    result += f"  - Status: {cluster.status}\n"
+    result += f"  - Version: {cluster.version}\n"
+    result += f"  - CNI: {cluster.cni}\n"
+    result += f"  - Created: {cluster.created_at}\n"
+    if cluster.tags:
+        result += f"  - Tags: {', '.join(cluster.tags)}\n"
+    result += "\n"
+    return result
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("list_k8s_clusters")
+async def list_k8s_clusters(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    private_network_id: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    version: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
     try:
+        output = ToolOutput("k8s_cluster", format, fields)
+        filters = k8s_cluster_filters(name, status, type, private_network_id, tags, version)
         client = get_scaleway_client()
-        k8s_api = K8SV1API(client)
-        
-        target_region = region or client.default_region
-        logger.info(f"Listing Kubernetes clusters in region: {target_region}")
-        
-        response = k8s_api.list_clusters(region=target_region)
-        clusters = response.clusters or []
-        
-        if not clusters:
+        k8s_api = get_api_clients().k8s
+        
+        cursor_region, page, page_size = resolve_cursor(cursor, page_size)
+        regions = [cursor_region] if cursor_region else resolve_regions(region, client.default_region)
+        logger.info(f"Listing Kubernetes clusters in region(s): {', '.join(regions)}")
+        
+        async def fetch(target_region: str) -> Page:
+            listing = await inventory_listing("k8s_cluster", target_region, filters, page, page_size, fresh=fresh)
+            if listing is not None:
+                return listing
+            listing = await read_through(
+                cache_key("list_k8s_clusters", target_region, page=page, page_size=page_size, **filters.api_args),
+                "k8s_cluster",
+                lambda: fetch_listing(
+                    functools.partial(k8s_api.list_clusters, region=target_region, **filters.api_args),
+                    "clusters",
+                    target=target_region,
+                    page=page,
+                    page_size=page_size,
+                ),
+                tags=[resource_tag("k8s_cluster", target_region)],
+                fresh=fresh,
+            )
+            return filters.apply(listing)
+        
+        if len(regions) > 1:
+            results = await fan_out(regions, fetch)
+            if output.json:
+                return output.render_fan_out(results, "region")
+            return render_fan_out(results, "Kubernetes cluster(s)", "region", output.format_item(_format_k8s_cluster))
+        
+        target_region = regions[0]
+        listing = await fetch(target_region)
+        
+        if output.json:
+            return output.render_listing(listing, "region")
+        
+        if not listing.items and listing.next_cursor is None:
             return f"No Kubernetes clusters found in region {target_region}."
         
-        result = f"Found {len(clusters)} Kubernetes cluster(s) in region {target_region}:\n\n"
-        for cluster in clusters:
-            result += f"- **{cluster.name}** (ID: {cluster.id})\n"
-            result += f"  - Status: {cluster.status}\n"
-            result += f"  - Version: {cluster.version}\n"
-            result += f"  - CNI: {cluster.cni}\n"
-            result += f"  - Created: {cluster.created_at}\n"
-            if cluster.tags:
-                result += f"  - Tags: {', '.join(cluster.tags)}\n"
-            result += "\n"
-        
-        return result
+        return render_page(
+            listing_header(listing, "Kubernetes cluster(s)", f"region {target_region}"),
+            listing,
+            output.format_item(_format_k8s_cluster),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list Kubernetes clusters: {str(e)}"
@@ -405,22 +737,46 @@ async def list_k8s_clusters(region: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
-@mcp.tool()
-async def get_k8s_cluster(cluster_id: str, region: Optional[str] = None) -> str:
-    """Get detailed information about a Kubernetes cluster.
-    
-    Args:
-        cluster_id: The ID of the cluster to retrieve
-        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
-    """
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("get_k8s_cluster")
+async def get_k8s_cluster(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
     try:
+        output = ToolOutput("k8s_cluster", format, fields, listing=False)
         client = get_scaleway_client()
-        k8s_api = K8SV1API(client)
+        k8s_api = get_api_clients().k8s
         
         target_region = region or client.default_region
         logger.info(f"Getting Kubernetes cluster {cluster_id} in region {target_region}")
         
-        cluster = k8s_api.get_cluster(region=target_region, cluster_id=cluster_id)
+        found = await inventory_item("k8s_cluster", target_region, cluster_id, fresh=fresh)
+        if found is not None:
+            cluster, as_of = found
+        else:
+            cluster = await read_through(
+                cache_key("get_k8s_cluster", target_region, cluster_id=cluster_id),
+                "k8s_cluster",
+                lambda: run_blocking(k8s_api.get_cluster, region=target_region, cluster_id=cluster_id),
+                tags=[resource_tag("k8s_cluster", target_region, cluster_id)],
+                fresh=fresh,
+            )
+            as_of = None
+        
+        if output.json:
+            return output.render_item(cluster, as_of)
+        if output.requested:
+            return (
+                f"**Kubernetes Cluster Details: {cluster.name}**\n\n"
+                + output.format_item(_format_k8s_cluster)(cluster)
+                + staleness_note(as_of)
+            )
         
         result = f"**Kubernetes Cluster Details: {cluster.name}**\n\n"
         result += f"- ID: {cluster.id}\n"
@@ -436,7 +792,7 @@ async def get_k8s_cluster(cluster_id: str, region: Optional[str] = None) -> str:
         if cluster.tags:
             result += f"\n**Tags:** {', '.join(cluster.tags)}\n"
         
-        return result
+        return result + staleness_note(as_of)
         
     except Exception as e:
         error_msg = f"Failed to get Kubernetes cluster: {str(e)}"
@@ -444,44 +800,178 @@ async def get_k8s_cluster(cluster_id: str, region: Optional[str] = None) -> str:
         return f"Error: {error_msg}"
 
 
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("describe_k8s_cluster")
+async def describe_k8s_cluster(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    try:
+        client = get_scaleway_client()
+        k8s_api = get_api_clients().k8s
+        
+        target_region = region or client.default_region
+        logger.info(f"Describing Kubernetes cluster {cluster_id} in region {target_region}")
+        
+        return await describe_cluster(k8s_api, target_region, cluster_id, fresh, format)
+        
+    except Exception as e:
+        error_msg = f"Failed to describe Kubernetes cluster: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
 # ============================================================================
-# IMAGE MANAGEMENT TOOLS
+# TOPOLOGY TOOLS
 # ============================================================================
 
-@mcp.tool()
-async def list_images(zone: Optional[str] = None, arch: Optional[str] = None) -> str:
-    """List available instance images.
-    
-    Args:
-        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
-        arch: Filter by architecture (x86_64 or arm64). If not provided, shows all.
-    """
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("get_network_members")
+async def get_network_members(
+    private_network_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
     try:
         client = get_scaleway_client()
-        instance_api = InstanceV1API(client)
+        target_region = region or client.default_region
+        logger.info(f"Getting members of private network {private_network_id} in region {target_region}")
+        
+        return await network_members_report(get_api_clients(), target_region, private_network_id, fresh, format)
         
+    except Exception as e:
+        error_msg = f"Failed to get network members: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("get_instance_topology")
+async def get_instance_topology(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    try:
+        client = get_scaleway_client()
         target_zone = zone or client.default_zone
-        logger.info(f"Listing images in zone: {target_zone}")
+        logger.info(f"Getting topology of instance {instance_id} in zone {target_zone}")
         
-        response = instance_api.list_images(zone=target_zone, arch=arch)
-        images = response.images or []
+        return await instance_topology_report(get_api_clients(), target_zone, instance_id, fresh, format)
         
-        if not images:
-            return f"No images found in zone {target_zone}."
+    except Exception as e:
+        error_msg = f"Failed to get instance topology: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("get_k8s_cluster_topology")
+async def get_k8s_cluster_topology(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    try:
+        client = get_scaleway_client()
+        target_region = region or client.default_region
+        logger.info(f"Getting topology of Kubernetes cluster {cluster_id} in region {target_region}")
         
-        result = f"Found {len(images)} image(s) in zone {target_zone}:\n\n"
-        for image in images[:20]:  # Limit to first 20 to avoid overwhelming output
-            result += f"- **{image.name}** (ID: {image.id})\n"
-            result += f"  - Arch: {image.arch}\n"
-            result += f"  - Public: {image.public}\n"
-            if image.creation_date:
-                result += f"  - Created: {image.creation_date}\n"
-            result += "\n"
+        return await cluster_topology_report(get_api_clients(), target_region, cluster_id, fresh, format)
         
-        if len(images) > 20:
-            result += f"\n... and {len(images) - 20} more images.\n"
+    except Exception as e:
+        error_msg = f"Failed to get Kubernetes cluster topology: {str(e)}"
+        logger.error(error_msg)
+        return f"Error: {error_msg}"
+
+
+# ============================================================================
+# IMAGE MANAGEMENT TOOLS
+# ============================================================================
+
+def _format_image(image: Any) -> str:
+    """Render one image as a markdown list entry."""
+    result = f"- **{image.name}** (ID: {image.id})\n"
+    result += f"  - Arch: {image.arch}\n"
+    result += f"  - Public: {image.public}\n"
+    if image.creation_date:
+        result += f"  - Created: {image.creation_date}\n"
+    result += "\n"
+    return result
+
+
+@mcp.tool(structured_output=False)
+@instrument_tool
+@structured_tool
+@implements("list_images")
+async def list_images(
+    zone: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    try:
+        output = ToolOutput("image", format, fields)
+        client = get_scaleway_client()
+        instance_api = get_api_clients().instance
+        
+        # Images are only ever shown a page at a time to avoid overwhelming output
+        cursor_zone, page, page_size = resolve_cursor(cursor, page_size or DEFAULT_IMAGE_PAGE_SIZE)
+        zones = [cursor_zone] if cursor_zone else resolve_zones(zone, client.default_zone)
+        logger.info(f"Listing images in zone(s): {', '.join(zones)}")
+        
+        async def fetch(target_zone: str) -> Page:
+            return await read_through(
+                cache_key("list_images", target_zone, arch=arch, page=page, page_size=page_size),
+                "image",
+                lambda: fetch_listing(
+                    functools.partial(instance_api.list_images, zone=target_zone, arch=arch),
+                    "images",
+                    target=target_zone,
+                    page=page,
+                    page_size=page_size,
+                    size_param="per_page",
+                ),
+                tags=[resource_tag("image", target_zone)],
+                fresh=fresh,
+            )
+        
+        if len(zones) > 1:
+            results = await fan_out(zones, fetch)
+            if output.json:
+                return output.render_fan_out(results, "zone")
+            return render_fan_out(results, "image(s)", "zone", output.format_item(_format_image))
+        
+        target_zone = zones[0]
+        listing = await fetch(target_zone)
+        
+        if output.json:
+            return output.render_listing(listing, "zone")
+        
+        if not listing.items:
+            return f"No images found in zone {target_zone}."
         
-        return result
+        return render_page(
+            f"Found {listing.total_count} image(s) in zone {target_zone}:\n\n",
+            listing,
+            output.format_item(_format_image),
+        )
         
     except Exception as e:
         error_msg = f"Failed to list images: {str(e)}"
@@ -489,6 +979,17 @@ async def list_images(zone: Optional[str] = None, arch: Optional[str] = None) ->
         return f"Error: {error_msg}"
 
 
+# ============================================================================
+# SERVER TOOLS
+# ============================================================================
+
+@mcp.tool()
+@instrument_tool
+@implements("get_server_stats")
+async def get_server_stats(prometheus: bool = False) -> str:
+    return render_metrics() if prometheus else stats_summary()
+
+
 # ============================================================================
 # SERVER MAIN
 # ============================================================================
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Streaming Listings
+Turns upstream pages into output records as they arrive, across one or more
+zones/regions, so the HTTP server can stream a listing as NDJSON while later
+pages are still being fetched. Each page is read through the same cache
+entry as the paged list tools, unless the call asks for fresh data.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+from typing import Any, AsyncIterator, Callable
+
+from scaleway_cache import cache_key, read_through, resource_tag
+from scaleway_output import ToolOutput
+from scaleway_pagination import Page, fetch_listing
+from scaleway_progress import report_progress
+
+logger = logging.getLogger("scaleway-mcp.streaming")
+
+# Pages buffered per listing before fetching pauses for the client to catch up
+MAX_BUFFERED_PAGES = 4
+
+
+class InvalidArguments(ValueError):
+    """Arguments a stream cannot honour, reported as JSON-RPC invalid params."""
+
+
+def check_stream_format(format: str) -> None:
+    """Streams only produce JSON records."""
+    if format != "json":
+        raise InvalidArguments(
+            f"Format '{format}' cannot be streamed as NDJSON; "
+            "use format \"json\" or call without Accept: application/x-ndjson"
+        )
+
+
+async def cached_pages(
+    list_call: Callable[..., Any],
+    key: str,
+    *,
+    tool: str,
+    resource_type: str,
+    target: str,
+    page: int,
+    page_size: int,
+    api_args: dict,
+    size_param: str = "page_size",
+    fresh: bool = False,
+) -> AsyncIterator[Page]:
+    """Walk a listing page by page, each page read through the cache entry ``tool`` uses for it.
+
+    ``list_call`` has the zone/region and ``api_args`` already bound; ``fresh``
+    skips the cache and reads every page from the API.
+    """
+    while True:
+        listing = await read_through(
+            cache_key(tool, target, page=page, page_size=page_size, **api_args),
+            resource_type,
+            functools.partial(
+                fetch_listing, list_call, key, target=target, page=page, page_size=page_size, size_param=size_param
+            ),
+            tags=[resource_tag(resource_type, target)],
+            fresh=fresh,
+        )
+        yield listing
+        if listing.next_cursor is None:
+            return
+        page += 1
+
+
+async def merge_pages(
+    targets: list[str],
+    open_pages: Callable[[str], AsyncIterator[Page]],
+) -> AsyncIterator[tuple[str, Any]]:
+    """Walk the pages of every target concurrently, yielding them as they arrive.
+
+    Yields ``(target, page)`` for each page, ``(target, exception)`` when a
+    target fails and ``(target, None)`` once a target is exhausted.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_BUFFERED_PAGES * len(targets))
+
+    async def pump(target: str) -> None:
+        try:
+            async for page in open_pages(target):
+                await queue.put((target, page))
+        except Exception as e:
+            logger.warning(f"Streaming listing failed for {target}: {e}")
+            await queue.put((target, e))
+            return
+        await queue.put((target, None))
+
+    tasks = [asyncio.create_task(pump(target)) for target in targets]
+    remaining = len(targets)
+    try:
+        while remaining:
+            target, page = await queue.get()
+            if not isinstance(page, Page):
+                remaining -= 1
+            yield target, page
+    finally:
+        # The client went away or a consumer stopped early
+        for task in tasks:
+            task.cancel()
+
+
+async def stream_listing(
+    targets: list[str],
+    open_pages: Callable[[str], AsyncIterator[Page]],
+    output: ToolOutput,
+    scope: str,
+) -> AsyncIterator[list[dict]]:
+    """Project listing items into records, yielding one batch of records per upstream page.
+
+    Item records look like ``{"zone": ..., "item": {...}}``. Each target ends
+    with ``{"zone": ..., "count": N}`` or ``{"zone": ..., "error": "..."}``.
+    """
+    counts = {target: 0 for target in targets}
+    finished = 0
+    async for target, page in merge_pages(targets, open_pages):
+        if isinstance(page, Page):
+            counts[target] += len(page.items)
+            yield [{scope: target, "item": output.project(item)} for item in page.items]
+            continue
+
+        finished += 1
+        await report_progress(finished, len(targets), f"{target}: {counts[target]} item(s)")
+        if page is None:
+            yield [{scope: target, "count": counts[target]}]
+        else:
+            yield [{scope: target, "error": str(page)}]
+
+
+def ndjson_lines(records: list[dict]) -> bytes:
+    """Encode records as newline-delimited JSON."""
+    return "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+    ).encode("utf-8")
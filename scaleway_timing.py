@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Request Timing
+Per-request breakdown of where a tool call spends its time (request parsing,
+executor queueing, Scaleway HTTP round trips, SDK (de)serialization, the
+tool itself and response encoding). Reported by the HTTP server as a
+Server-Timing header and as ``_meta.timing`` on tool results.
+"""
+
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Phases in the order they are reported. Phases recorded from concurrent
+# calls (e.g. a multi-zone fan-out) are summed, so they can exceed "total".
+PHASES = {
+    "parse": "Request JSON parsing",
+    "queue": "Waiting for an executor worker",
+    "upstream": "Scaleway API HTTP round trips",
+    "sdk": "SDK request building and response deserialization",
+    "tool": "Tool execution including rendering",
+    "serialize": "Response JSON encoding",
+}
+
+
+class RequestTimer:
+    """Accumulates phase durations for one request, and for its parent request if any."""
+
+    def __init__(self, parent: Optional["RequestTimer"] = None):
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+        if self.parent is not None:
+            self.parent.record(phase, seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> dict[str, float]:
+        """Phase durations in milliseconds, with "sdk" excluding the HTTP round trips."""
+        with self._lock:
+            phases = dict(self.phases)
+        blocking = phases.pop("blocking", None)
+        if blocking is not None:
+            phases["sdk"] = max(0.0, blocking - phases.get("upstream", 0.0))
+        timing = {name: round(phases[name] * 1000, 3) for name in PHASES if name in phases}
+        timing["total"] = round(self.elapsed() * 1000, 3)
+        return timing
+
+    def server_timing(self) -> str:
+        """Render the breakdown as a Server-Timing header value."""
+        entries = []
+        for name, duration in self.breakdown().items():
+            entry = f"{name};dur={duration}"
+            if name == "upstream":
+                entry += f';desc="{self.counts.get("upstream", 0)} request(s)"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+_timer: ContextVar[Optional[RequestTimer]] = ContextVar("scaleway_request_timer", default=None)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _timer.get()
+
+
+@contextlib.contextmanager
+def request_timer() -> Iterator[RequestTimer]:
+    """Time the code running in this context, rolling phases up into any enclosing timer."""
+    timer = RequestTimer(parent=_timer.get())
+    token = _timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _timer.reset(token)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add ``seconds`` to ``phase`` of the current request, if one is being timed."""
+    timer = _timer.get()
+    if timer is not None:
+        timer.record(phase, seconds)
+
+
+@contextlib.contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Record the duration of the enclosed block as ``phase`` of the current request."""
+    timer = _timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(phase, time.perf_counter() - start)
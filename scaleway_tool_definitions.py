@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Tool Definitions
+The name, arguments and description of every tool, without implementations.
+Both servers implement these definitions (see :func:`implements`), and the
+HTTP server's catalog is built from them. Importing this module has no side
+effects and loads neither the MCP SDK nor the Scaleway SDK.
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def list_instances(
+    zone: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    state: Optional[str] = None,
+    commercial_type: Optional[str] = None,
+    private_network: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """List all compute instances in one or more Scaleway zones.
+
+    Args:
+        zone: Scaleway zone (e.g., fr-par-1, nl-ams-1), a comma-separated list of zones, or "all" to query every zone concurrently. If not provided, uses default zone.
+        name: Only instances whose name contains this string.
+        tags: Only instances carrying all of these tags.
+        state: Only instances in this state (e.g., running, stopped), or a comma-separated list of states.
+        commercial_type: Only instances of this commercial type (e.g., GP1-S), or a prefix ending in "*" (e.g., GP1-*).
+        private_network: Only instances attached to this private network ID.
+        arch: Only instances of this architecture (x86_64 or arm64).
+        page_size: Number of instances to return per zone (1-100). If not provided, all instances are returned.
+        cursor: Cursor returned by a previous call, to fetch the next page. Takes precedence over zone and page_size. Pass the same filters again.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, state, commercial_type, zone, arch, public_ip, private_ip, ipv6, image, protected, tags, volumes, creation_date, modification_date.
+    """
+
+
+
+def get_instance(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """Get detailed information about a specific instance.
+
+    Args:
+        instance_id: The ID of the instance to retrieve
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, state, commercial_type, zone, arch, public_ip, private_ip, ipv6, image, protected, tags, volumes, creation_date, modification_date.
+    """
+
+
+
+def create_instance(
+    name: str,
+    instance_type: str,
+    image_id: str,
+    zone: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    wait: bool = False
+) -> str:
+    """Create a new compute instance.
+
+    Args:
+        name: Name for the new instance
+        instance_type: Instance type (e.g., DEV1-S, GP1-XS, PLAY2-NANO)
+        image_id: Image ID to use for the instance
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        tags: Optional list of tags for the instance
+        wait: Wait until the new instance has settled in the stopped or running state.
+    """
+
+
+
+def start_instance(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
+    """Start a stopped instance.
+
+    Args:
+        instance_id: The ID of the instance to start
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        wait: Wait until the instance is running before returning.
+    """
+
+
+
+def stop_instance(instance_id: str, zone: Optional[str] = None, wait: bool = False) -> str:
+    """Stop a running instance.
+
+    Args:
+        instance_id: The ID of the instance to stop
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        wait: Wait until the instance is stopped before returning.
+    """
+
+
+
+def delete_instance(instance_id: str, zone: Optional[str] = None) -> str:
+    """Delete an instance.
+
+    Args:
+        instance_id: The ID of the instance to delete
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+    """
+
+
+
+def wait_for_instance_state(
+    instance_id: str,
+    state: str,
+    zone: Optional[str] = None,
+    timeout: float = 300
+) -> str:
+    """Wait until an instance reaches a given state.
+
+    Waits are polled together with other pending waits in the same zone, so
+    this is much cheaper than calling get_instance in a loop.
+
+    Args:
+        instance_id: The ID of the instance to wait for
+        state: Target state: running, stopped, stopped_in_place or deleted
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        timeout: Maximum number of seconds to wait (default 300)
+    """
+
+
+
+def bulk_start_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False
+) -> str:
+    """Start many instances at once.
+
+    Args:
+        instance_ids: IDs of the instances to start
+        tags: Start every instance carrying all of these tags (combined with instance_ids, only matching listed instances are started)
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        concurrency: Maximum number of instances acted on at the same time. Defaults to SCW_MCP_BULK_CONCURRENCY.
+        wait: Wait until every instance is running before returning.
+    """
+
+
+
+def bulk_stop_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    wait: bool = False
+) -> str:
+    """Stop many instances at once.
+
+    Args:
+        instance_ids: IDs of the instances to stop
+        tags: Stop every instance carrying all of these tags (combined with instance_ids, only matching listed instances are stopped)
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        concurrency: Maximum number of instances acted on at the same time. Defaults to SCW_MCP_BULK_CONCURRENCY.
+        wait: Wait until every instance is stopped before returning.
+    """
+
+
+
+def bulk_delete_instances(
+    instance_ids: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+    zone: Optional[str] = None,
+    concurrency: Optional[int] = None
+) -> str:
+    """Delete many instances at once.
+
+    Args:
+        instance_ids: IDs of the instances to delete
+        tags: Delete every instance carrying all of these tags (combined with instance_ids, only matching listed instances are deleted)
+        zone: Scaleway zone (e.g., fr-par-1). If not provided, uses default zone.
+        concurrency: Maximum number of instances acted on at the same time. Defaults to SCW_MCP_BULK_CONCURRENCY.
+    """
+
+
+
+def list_private_networks(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    vpc_id: Optional[str] = None,
+    dhcp_enabled: Optional[bool] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """List all private networks in one or more Scaleway regions.
+
+    Args:
+        region: Scaleway region (e.g., fr-par, nl-ams), a comma-separated list of regions, or "all" to query every region concurrently. If not provided, uses default region.
+        name: Only private networks whose name contains this string.
+        tags: Only private networks carrying all of these tags.
+        vpc_id: Only private networks of this VPC.
+        dhcp_enabled: Only private networks with (true) or without (false) DHCP enabled.
+        page_size: Number of private networks to return per region (1-100). If not provided, all private networks are returned.
+        cursor: Cursor returned by a previous call, to fetch the next page. Takes precedence over region and page_size. Pass the same filters again.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, region, vpc_id, subnets, dhcp_enabled, tags, created_at, updated_at.
+    """
+
+
+
+def create_private_network(name: str, region: Optional[str] = None, tags: Optional[list[str]] = None) -> str:
+    """Create a new private network.
+
+    Args:
+        name: Name for the new private network
+        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
+        tags: Optional list of tags for the network
+    """
+
+
+
+def list_k8s_clusters(
+    region: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    private_network_id: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    version: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """List all Kubernetes clusters in one or more Scaleway regions.
+
+    Args:
+        region: Scaleway region (e.g., fr-par, nl-ams), a comma-separated list of regions, or "all" to query every region concurrently. If not provided, uses default region.
+        name: Only clusters whose name contains this string.
+        status: Only clusters in this status (e.g., ready, updating), or a comma-separated list of statuses.
+        type: Only clusters of this type (e.g., kapsule, multicloud).
+        private_network_id: Only clusters attached to this private network ID.
+        tags: Only clusters carrying all of these tags.
+        version: Only clusters running this Kubernetes version, or a minor version prefix (e.g., 1.30).
+        page_size: Number of clusters to return per region (1-100). If not provided, all clusters are returned.
+        cursor: Cursor returned by a previous call, to fetch the next page. Takes precedence over region and page_size. Pass the same filters again.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, status, version, cni, type, region, description, cluster_url, private_network_id, tags, created_at, updated_at.
+    """
+
+
+
+def get_k8s_cluster(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """Get detailed information about a Kubernetes cluster.
+
+    Args:
+        cluster_id: The ID of the cluster to retrieve
+        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, status, version, cni, type, region, description, cluster_url, private_network_id, tags, created_at, updated_at.
+    """
+
+
+
+def describe_k8s_cluster(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    """Describe a Kubernetes cluster with all of its pools and nodes: node counts, autoscaling bounds and unhealthy nodes per pool.
+
+    Args:
+        cluster_id: The ID of the cluster to describe
+        region: Scaleway region (e.g., fr-par, nl-ams). If not provided, uses default region.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+    """
+
+
+
+def get_network_members(
+    private_network_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    """List the instances and Kubernetes clusters attached to a private network.
+
+    Args:
+        private_network_id: The ID of the private network
+        region: Scaleway region of the private network (e.g., fr-par). If not provided, uses default region.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+    """
+
+
+
+def get_instance_topology(
+    instance_id: str,
+    zone: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    """Show an instance's private networks and the other instances and Kubernetes clusters on each of them.
+
+    Args:
+        instance_id: The ID of the instance
+        zone: Scaleway zone of the instance (e.g., fr-par-1). If not provided, uses default zone.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+    """
+
+
+
+def get_k8s_cluster_topology(
+    cluster_id: str,
+    region: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text"
+) -> str:
+    """Show the private network of a Kubernetes cluster and the instances attached to it.
+
+    Args:
+        cluster_id: The ID of the cluster
+        region: Scaleway region of the cluster (e.g., fr-par). If not provided, uses default region.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+    """
+
+
+
+def list_images(
+    zone: Optional[str] = None,
+    arch: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fresh: bool = False,
+    format: str = "text",
+    fields: Optional[list[str]] = None
+) -> str:
+    """List available instance images.
+
+    Args:
+        zone: Scaleway zone (e.g., fr-par-1), a comma-separated list of zones, or "all" to query every zone concurrently. If not provided, uses default zone.
+        arch: Filter by architecture (x86_64 or arm64). If not provided, shows all.
+        page_size: Number of images to return per zone (1-100). Defaults to 20.
+        cursor: Cursor returned by a previous call, to fetch the next page. Takes precedence over zone and page_size; pass the same arch again.
+        fresh: Bypass the read cache and query the API directly.
+        format: Output format: "text" (markdown, default) or "json" (also returned as structured content).
+        fields: Only include these fields in the output. Available fields: id, name, arch, state, public, zone, tags, creation_date, modification_date.
+    """
+
+
+
+def get_server_stats(prometheus: bool = False) -> str:
+    """Show call counts, errors and latency per tool and per Scaleway API zone/region, plus cache hit ratios.
+
+    Args:
+        prometheus: Return the full metrics in the Prometheus text format instead of a summary.
+    """
+
+
+
+# Every tool, in the order the STDIO server registers them
+TOOL_DEFINITIONS: dict[str, Callable[..., Any]] = {
+    "list_instances": list_instances,
+    "get_instance": get_instance,
+    "create_instance": create_instance,
+    "start_instance": start_instance,
+    "stop_instance": stop_instance,
+    "delete_instance": delete_instance,
+    "wait_for_instance_state": wait_for_instance_state,
+    "bulk_start_instances": bulk_start_instances,
+    "bulk_stop_instances": bulk_stop_instances,
+    "bulk_delete_instances": bulk_delete_instances,
+    "list_private_networks": list_private_networks,
+    "create_private_network": create_private_network,
+    "list_k8s_clusters": list_k8s_clusters,
+    "get_k8s_cluster": get_k8s_cluster,
+    "describe_k8s_cluster": describe_k8s_cluster,
+    "get_network_members": get_network_members,
+    "get_instance_topology": get_instance_topology,
+    "get_k8s_cluster_topology": get_k8s_cluster_topology,
+    "list_images": list_images,
+    "get_server_stats": get_server_stats,
+}
+
+
+def implements(name: str) -> Callable[[F], F]:
+    """Give a tool implementation the signature and docstring of its definition.
+
+    FastMCP and the HTTP catalog then describe the tool from the definition,
+    whatever the implementation's own docstring says.
+
+    Raises:
+        ValueError: if the implementation does not take the same arguments, with
+            the same defaults, as the definition.
+    """
+    definition = TOOL_DEFINITIONS[name]
+    signature = inspect.signature(definition)
+
+    def decorate(func: F) -> F:
+        expected = [(param.name, param.default) for param in signature.parameters.values()]
+        actual = [(param.name, param.default) for param in inspect.signature(func).parameters.values()]
+        if actual != expected:
+            raise ValueError(
+                f"Tool {name} takes ({', '.join(n for n, _ in actual)}) "
+                f"but is defined with ({', '.join(n for n, _ in expected)})"
+            )
+        func.__doc__ = definition.__doc__
+        func.__signature__ = signature
+        return func
+
+    return decorate
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Topology Index
+Maps the instances, private NICs, private networks and Kubernetes clusters
+of a region to each other, so questions such as "what is attached to this
+private network" take one tool call. The index is built from full listings
+fetched concurrently (through the inventory and read cache when possible)
+and cached until its TTL expires or a write touches the region.
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Optional
+
+from scaleway_cache import cache_key, read_through, resource_tag
+from scaleway_fanout import fan_out, region_zones, zone_region
+from scaleway_filters import FilterPlan
+from scaleway_inventory import RESOURCES, inventory_listing
+from scaleway_output import StructuredText, check_format, staleness_fields
+from scaleway_pagination import Page, fetch_listing, staleness_note
+
+logger = logging.getLogger("scaleway-mcp.topology")
+
+# List tool whose cached full listings the index reuses, per resource type
+LIST_TOOLS = {
+    "instance": "list_instances",
+    "private_network": "list_private_networks",
+    "k8s_cluster": "list_k8s_clusters",
+}
+
+NO_FILTERS = FilterPlan({})
+
+
+class TopologyIndex:
+    """Instances, private networks and Kubernetes clusters of one region, indexed by their links."""
+
+    def __init__(self, region: str, servers: list, networks: list, clusters: list, errors: Optional[dict] = None):
+        self.region = region
+        self.servers = {server.id: server for server in servers}
+        self.networks = {network.id: network for network in networks}
+        self.clusters = {cluster.id: cluster for cluster in clusters}
+        # Zone/region -> error message, for listings that failed
+        self.errors = errors or {}
+        self.as_of: Optional[float] = None
+
+        # private network ID -> server ID -> private NICs of that server in the network
+        self.attachments: dict[str, dict[str, list]] = {}
+        for server in servers:
+            for nic in server.private_nics or []:
+                self.attachments.setdefault(nic.private_network_id, {}).setdefault(server.id, []).append(nic)
+
+        # private network ID -> IDs of the clusters using it
+        self.cluster_networks: dict[str, list[str]] = {}
+        for cluster in clusters:
+            if cluster.private_network_id:
+                self.cluster_networks.setdefault(cluster.private_network_id, []).append(cluster.id)
+
+    def members(self, network_id: str) -> dict[str, list]:
+        """Server ID -> private NICs, for every server attached to a private network."""
+        return self.attachments.get(network_id, {})
+
+    def network_clusters(self, network_id: str) -> list:
+        return [self.clusters[cluster_id] for cluster_id in self.cluster_networks.get(network_id, [])]
+
+
+async def _full_listing(api_clients: Any, resource_type: str, scope: str, fresh: bool) -> Page:
+    """Every item of a resource type in a zone/region, from the inventory or the list tools' cache entry."""
+    listing = await inventory_listing(resource_type, scope, NO_FILTERS, 1, None, fresh=fresh)
+    if listing is not None:
+        return listing
+
+    resource = RESOURCES[resource_type]
+    list_call = getattr(getattr(api_clients, resource.api), resource.method)
+    return await read_through(
+        cache_key(LIST_TOOLS[resource_type], scope, page=1, page_size=None),
+        resource_type,
+        lambda: fetch_listing(
+            functools.partial(list_call, **{resource.scope: scope}),
+            resource.key,
+            target=scope,
+            size_param=resource.size_param,
+        ),
+        tags=[resource_tag(resource_type, scope)],
+        fresh=fresh,
+    )
+
+
+async def build_topology(api_clients: Any, region: str, fresh: bool = False) -> TopologyIndex:
+    """List the region's instances (in every zone), private networks and clusters concurrently and index them."""
+    zones = region_zones(region)
+    server_results, networks, clusters = await asyncio.gather(
+        fan_out(zones, lambda zone: _full_listing(api_clients, "instance", zone, fresh)),
+        _full_listing(api_clients, "private_network", region, fresh),
+        _full_listing(api_clients, "k8s_cluster", region, fresh),
+    )
+
+    servers = [server for result in server_results for server in result.items]
+    errors = {result.target: str(result.error) for result in server_results if result.error is not None}
+    index = TopologyIndex(region, servers, networks.items, clusters.items, errors)
+
+    # Served from the inventory: the index is as old as its oldest listing
+    ages = [result.as_of for result in server_results if result.error is None]
+    ages += [networks.as_of, clusters.as_of]
+    if any(as_of is not None for as_of in ages):
+        index.as_of = min(as_of for as_of in ages if as_of is not None)
+
+    logger.debug(
+        f"Indexed {len(index.servers)} instance(s), {len(index.networks)} private network(s) "
+        f"and {len(index.clusters)} cluster(s) in {region}"
+    )
+    return index
+
+
+async def get_topology(api_clients: Any, region: str, fresh: bool = False) -> TopologyIndex:
+    """The topology index of a region, cached like an instance listing of each of its zones."""
+    tags = [resource_tag("instance", zone) for zone in region_zones(region)]
+    tags += [resource_tag("private_network", region), resource_tag("k8s_cluster", region)]
+    return await read_through(
+        cache_key("topology", region),
+        "instance",
+        lambda: build_topology(api_clients, region, fresh),
+        tags=tags,
+        fresh=fresh,
+    )
+
+
+def _instance(server: Any, nics: Optional[list] = None) -> dict:
+    record = {
+        "id": server.id,
+        "name": server.name,
+        "zone": str(server.zone),
+        "state": str(server.state),
+    }
+    if nics is not None:
+        record["nics"] = [_nic(nic) for nic in nics]
+    return record
+
+
+def _nic(nic: Any) -> dict:
+    return {"id": nic.id, "mac_address": nic.mac_address, "state": str(nic.state)}
+
+
+def _cluster(cluster: Any) -> dict:
+    return {"id": cluster.id, "name": cluster.name, "status": str(cluster.status), "version": cluster.version}
+
+
+def _network(index: TopologyIndex, network_id: str) -> dict:
+    """A private network, or just its ID if it is not in the index (e.g. in another project)."""
+    network = index.networks.get(network_id)
+    if network is None:
+        return {"id": network_id, "name": None}
+    return {
+        "id": network.id,
+        "name": network.name,
+        "vpc_id": network.vpc_id,
+        "subnets": [str(subnet.subnet) for subnet in network.subnets or []],
+    }
+
+
+def _index_fields(index: TopologyIndex) -> dict:
+    fields = {"region": index.region, **staleness_fields(index.as_of)}
+    if index.errors:
+        fields["errors"] = index.errors
+    return fields
+
+
+def network_members(index: TopologyIndex, network_id: str) -> dict:
+    """The instances (with their NICs) and clusters attached to a private network."""
+    if network_id not in index.networks:
+        raise ValueError(f"Private network {network_id} not found in region {index.region}")
+    return {
+        "private_network": _network(index, network_id),
+        "instances": [_instance(index.servers[server_id], nics) for server_id, nics in index.members(network_id).items()],
+        "k8s_clusters": [_cluster(cluster) for cluster in index.network_clusters(network_id)],
+        **_index_fields(index),
+    }
+
+
+def instance_topology(index: TopologyIndex, instance_id: str) -> dict:
+    """An instance, its private networks and what else is attached to each of them."""
+    server = index.servers.get(instance_id)
+    if server is None:
+        raise ValueError(f"Instance {instance_id} not found in region {index.region}")
+    networks = []
+    for nic in server.private_nics or []:
+        network_id = nic.private_network_id
+        networks.append({
+            **_network(index, network_id),
+            "nic": _nic(nic),
+            "peers": [
+                _instance(index.servers[peer_id])
+                for peer_id in index.members(network_id)
+                if peer_id != server.id
+            ],
+            "k8s_clusters": [_cluster(cluster) for cluster in index.network_clusters(network_id)],
+        })
+    return {
+        "instance": {
+            **_instance(server),
+            "public_ip": server.public_ip.address if server.public_ip else None,
+            "private_ip": server.private_ip,
+        },
+        "private_networks": networks,
+        **_index_fields(index),
+    }
+
+
+def cluster_topology(index: TopologyIndex, cluster_id: str) -> dict:
+    """A Kubernetes cluster, its private network and the instances attached to it (the cluster's nodes among them)."""
+    cluster = index.clusters.get(cluster_id)
+    if cluster is None:
+        raise ValueError(f"Kubernetes cluster {cluster_id} not found in region {index.region}")
+    network_id = cluster.private_network_id
+    return {
+        "k8s_cluster": _cluster(cluster),
+        "private_network": _network(index, network_id) if network_id else None,
+        "instances": [
+            _instance(index.servers[server_id], nics)
+            for server_id, nics in (index.members(network_id) if network_id else {}).items()
+        ],
+        **_index_fields(index),
+    }
+
+
+def _render_instance(record: dict, indent: str = "") -> str:
+    result = f"{indent}- **{record['name']}** (ID: {record['id']}, {record['zone']}) - {record['state']}\n"
+    for nic in record.get("nics", []):
+        result += f"{indent}  - NIC {nic['id']}: MAC {nic['mac_address']}, {nic['state']}\n"
+    return result
+
+
+def _render_cluster(record: dict, indent: str = "") -> str:
+    return f"{indent}- **{record['name']}** (ID: {record['id']}) - {record['status']}, Kubernetes {record['version']}\n"
+
+
+def _render_network(record: dict) -> str:
+    if record["name"] is None:
+        return f"private network {record['id']} (not found in this project and region)"
+    subnets = f", subnets {', '.join(record['subnets'])}" if record["subnets"] else ""
+    return f"**{record['name']}** (ID: {record['id']}{subnets})"
+
+
+def render_network_members(record: dict) -> str:
+    result = f"Private network {_render_network(record['private_network'])} in region {record['region']}\n\n"
+    result += f"**Instances ({len(record['instances'])}):**\n"
+    result += "".join(map(_render_instance, record["instances"])) or "- none\n"
+    result += f"\n**Kubernetes clusters ({len(record['k8s_clusters'])}):**\n"
+    result += "".join(map(_render_cluster, record["k8s_clusters"])) or "- none\n"
+    return result
+
+
+def render_instance_topology(record: dict) -> str:
+    instance = record["instance"]
+    result = f"Instance **{instance['name']}** (ID: {instance['id']}, {instance['zone']}) - {instance['state']}\n"
+    result += f"- Public IP: {instance['public_ip'] or 'None'}\n"
+    result += f"- Private IP: {instance['private_ip'] or 'None'}\n\n"
+    result += f"**Private networks ({len(record['private_networks'])}):**\n"
+    if not record["private_networks"]:
+        result += "- none\n"
+    for network in record["private_networks"]:
+        result += f"- {_render_network(network)} via NIC {network['nic']['id']} (MAC {network['nic']['mac_address']})\n"
+        result += f"  - Other instances ({len(network['peers'])}):\n"
+        result += "".join(_render_instance(peer, "    ") for peer in network["peers"]) or "    - none\n"
+        if network["k8s_clusters"]:
+            result += f"  - Kubernetes clusters ({len(network['k8s_clusters'])}):\n"
+            result += "".join(_render_cluster(cluster, "    ") for cluster in network["k8s_clusters"])
+    return result
+
+
+def render_cluster_topology(record: dict) -> str:
+    result = f"Kubernetes cluster {_render_cluster(record['k8s_cluster'])[2:]}"
+    if record["private_network"] is None:
+        return result + "\nNot attached to a private network.\n"
+    result += f"\nPrivate network: {_render_network(record['private_network'])}\n\n"
+    result += f"**Attached instances ({len(record['instances'])}):**\n"
+    result += "".join(map(_render_instance, record["instances"])) or "- none\n"
+    return result
+
+
+async def topology_report(
+    api_clients: Any,
+    region: str,
+    resource_id: str,
+    view: Callable[[TopologyIndex, str], dict],
+    render: Callable[[dict], str],
+    fresh: bool = False,
+    format: str = "text",
+) -> str:
+    """Run one topology query against the region's index and render it as text or JSON."""
+    json_output = check_format(format)
+    index = await get_topology(api_clients, region, fresh)
+    record = view(index, resource_id)
+    if json_output:
+        return StructuredText(record)
+    text = render(record)
+    for scope, error in index.errors.items():
+        text += f"\nIncomplete: listing instances in {scope} failed: {error}\n"
+    return text + staleness_note(index.as_of)
+
+
+async def network_members_report(api_clients: Any, region: str, network_id: str, fresh: bool = False, format: str = "text") -> str:
+    return await topology_report(api_clients, region, network_id, network_members, render_network_members, fresh, format)
+
+
+async def instance_topology_report(api_clients: Any, zone: str, instance_id: str, fresh: bool = False, format: str = "text") -> str:
+    return await topology_report(
+        api_clients, zone_region(zone), instance_id, instance_topology, render_instance_topology, fresh, format
+    )
+
+
+async def cluster_topology_report(api_clients: Any, region: str, cluster_id: str, fresh: bool = False, format: str = "text") -> str:
+    return await topology_report(api_clients, region, cluster_id, cluster_topology, render_cluster_topology, fresh, format)
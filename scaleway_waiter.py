@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Scaleway MCP Server - Instance State Waiter
+A single shared poller that waits for instances to reach a target state.
+All instances waited on in a zone are checked together with one
+``list_servers`` call per tick, backing off while nothing changes.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from scaleway_cache import get_cache, resource_tag
+from scaleway_executor import run_blocking
+from scaleway_progress import report_progress
+
+logger = logging.getLogger("scaleway-mcp.waiter")
+
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 15.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_WAIT_TIMEOUT = 300.0
+
+# Pseudo-state reported once an instance no longer exists
+DELETED_STATE = "deleted"
+
+# The Instance API's server states (ServerState), plus the pseudo-state above
+INSTANCE_STATES = ("running", "stopped", "stopped_in_place", "starting", "stopping", "locked", DELETED_STATE)
+
+# States an instance does not leave by itself: a wait for any other state ends there
+TERMINAL_FAILURE_STATES = frozenset({"locked", DELETED_STATE})
+
+# list_servers accepts at most this many IDs per page
+MAX_IDS_PER_POLL = 100
+
+# Seconds between progress notifications while waiting
+PROGRESS_INTERVAL = 5.0
+
+
+class WaitResult(NamedTuple):
+    """Outcome of waiting for one instance."""
+
+    server_id: str
+    zone: str
+    state: Optional[str]
+    reached: bool
+    elapsed: float
+    server: Any
+
+
+def check_states(states: Iterable[str]) -> frozenset:
+    """Validate instance states to wait for.
+
+    Raises:
+        ValueError: if ``states`` is empty or names an unknown state.
+    """
+    states = frozenset(states)
+    unknown = sorted(states.difference(INSTANCE_STATES))
+    if unknown or not states:
+        raise ValueError(
+            f"Unknown instance state(s): {', '.join(unknown) or 'none given'}. "
+            f"Valid states: {', '.join(INSTANCE_STATES)}"
+        )
+    return states
+
+
+class _Waiter:
+    __slots__ = ("server_id", "targets", "failures", "started", "deadline", "future", "state", "server")
+
+    def __init__(
+        self,
+        server_id: str,
+        targets: frozenset,
+        failures: frozenset,
+        started: float,
+        deadline: float,
+        future: asyncio.Future,
+    ):
+        self.server_id = server_id
+        self.targets = targets
+        self.failures = failures
+        self.started = started
+        self.deadline = deadline
+        self.future = future
+        self.state: Optional[str] = None
+        self.server: Any = None
+
+
+class InstanceStatePoller:
+    """Coalesces concurrent waits into one batched poll per zone."""
+
+    def __init__(
+        self,
+        list_servers: Callable[..., Any],
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        self._list_servers = list_servers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._waiters: dict[str, list[_Waiter]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.polls = 0
+
+    async def wait_for(
+        self,
+        zone: str,
+        server_id: str,
+        states: set[str],
+        timeout: float,
+        failures: Iterable[str] = TERMINAL_FAILURE_STATES,
+    ) -> WaitResult:
+        """Wait until ``server_id`` is in one of ``states`` or ``timeout`` seconds have passed.
+
+        Use the "deleted" state to wait for an instance to disappear. The wait
+        also ends, unsuccessfully, once the instance is in one of ``failures``
+        (other than ``states``).
+
+        Raises:
+            ValueError: if ``states`` or ``failures`` name an unknown state, before polling.
+        """
+        targets = check_states(states)
+        failures = check_states(failures) - targets if failures else frozenset()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        waiter = _Waiter(server_id, targets, failures, now, now + timeout, loop.create_future())
+        self._waiters.setdefault(zone, []).append(waiter)
+        if zone not in self._tasks:
+            self._tasks[zone] = asyncio.create_task(self._poll_zone(zone))
+
+        reported_state = None
+        try:
+            while True:
+                try:
+                    return await asyncio.wait_for(asyncio.shield(waiter.future), timeout=PROGRESS_INTERVAL)
+                except asyncio.TimeoutError:
+                    if waiter.state != reported_state:
+                        reported_state = waiter.state
+                        await report_progress(
+                            round(loop.time() - now, 1), timeout, f"{server_id} is {reported_state}"
+                        )
+        finally:
+            if not waiter.future.done():
+                waiter.future.cancel()
+
+    async def _poll_zone(self, zone: str) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.min_interval
+        try:
+            while self._waiters.get(zone):
+                next_deadline = min(w.deadline for w in self._waiters[zone])
+                await asyncio.sleep(max(0.0, min(interval, next_deadline - loop.time())))
+
+                waiters = [w for w in self._waiters.get(zone, []) if not w.future.done()]
+                self._waiters[zone] = waiters
+                if not waiters:
+                    break
+
+                servers = await self._fetch(zone, sorted({w.server_id for w in waiters}))
+                changed = False
+                now = loop.time()
+                for w in waiters:
+                    if servers is not None:
+                        server = servers.get(w.server_id)
+                        state = str(server.state) if server is not None else DELETED_STATE
+                        if state != w.state:
+                            changed = True
+                            w.state, w.server = state, server
+                            # Cached reads of this instance are now known to be stale
+                            await get_cache().invalidate_async(
+                                resource_tag("instance", zone), resource_tag("instance", zone, w.server_id)
+                            )
+                        if state in w.targets:
+                            w.future.set_result(WaitResult(w.server_id, zone, state, True, now - w.started, server))
+                            continue
+                        if state in w.failures:
+                            w.future.set_result(WaitResult(w.server_id, zone, state, False, now - w.started, server))
+                            continue
+                    if now >= w.deadline:
+                        w.future.set_result(WaitResult(w.server_id, zone, w.state, False, now - w.started, w.server))
+
+                self._waiters[zone] = [w for w in waiters if not w.future.done()]
+                interval = self.min_interval if changed else min(interval * self.backoff, self.max_interval)
+        finally:
+            self._tasks.pop(zone, None)
+            for w in self._waiters.pop(zone, []):
+                if not w.future.done():
+                    w.future.set_exception(RuntimeError(f"State poller for {zone} stopped"))
+
+    async def _fetch(self, zone: str, server_ids: list[str]) -> Optional[dict]:
+        """Return the current servers by ID, or None if the poll failed."""
+        servers = {}
+        try:
+            for i in range(0, len(server_ids), MAX_IDS_PER_POLL):
+                chunk = server_ids[i:i + MAX_IDS_PER_POLL]
+                response = await run_blocking(self._list_servers, zone=zone, servers=chunk, per_page=MAX_IDS_PER_POLL)
+                self.polls += 1
+                servers.update((server.id, server) for server in response.servers or [])
+        except Exception as e:
+            logger.warning(f"Polling {len(server_ids)} instance(s) in {zone} failed: {e}")
+            return None
+        return servers
+
+    def stats(self) -> dict:
+        return {
+            "waiting": sum(len(waiters) for waiters in self._waiters.values()),
+            "zones": len(self._tasks),
+            "polls": self.polls,
+        }
+
+
+# Global poller shared by every tool in the process
+state_poller: Optional[InstanceStatePoller] = None
+
+
+def get_state_poller(list_servers: Callable[..., Any]) -> InstanceStatePoller:
+    """Get or create the shared poller.
+
+    Args:
+        list_servers: The Instance API's ``list_servers`` method
+    """
+    global state_poller
+
+    if state_poller is not None:
+        return state_poller
+
+    min_interval = float(os.getenv("SCW_MCP_WAIT_MIN_INTERVAL", DEFAULT_MIN_INTERVAL))
+    max_interval = float(os.getenv("SCW_MCP_WAIT_MAX_INTERVAL", DEFAULT_MAX_INTERVAL))
+
+    logger.info(f"Initializing instance state poller with interval={min_interval}-{max_interval}s")
+
+    state_poller = InstanceStatePoller(list_servers, min_interval=min_interval, max_interval=max_interval)
+    return state_poller
+
+
+def wait_timeout() -> float:
+    """Default number of seconds lifecycle tools wait when called with wait=true."""
+    return float(os.getenv("SCW_MCP_WAIT_TIMEOUT", DEFAULT_WAIT_TIMEOUT))
+
+
+def format_wait_result(result: WaitResult, target: str) -> str:
+    """Render the outcome of a wait as one line of tool output."""
+    if result.reached:
+        return f"Instance {result.server_id} reached state {result.state} after {result.elapsed:.0f}s."
+    if result.state in TERMINAL_FAILURE_STATES:
+        return (
+            f"Instance {result.server_id} is {result.state} after {result.elapsed:.0f}s "
+            f"and will not reach {target}."
+        )
+    return (
+        f"Timed out after {result.elapsed:.0f}s waiting for instance {result.server_id} "
+        f"to reach {target} (last seen: {result.state or 'unknown'})."
+    )
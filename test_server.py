@@ -62,6 +62,1657 @@ def test_client_initialization():
         print(f"✗ Client initialization failed: {e}")
         return False
 
+def test_executor_offloading():
+    """Test that blocking calls run concurrently off the event loop and time out."""
+    print("\nTesting blocking executor...")
+    import asyncio
+    import time
+    from scaleway_executor import BlockingExecutor, UpstreamTimeoutError
+
+    executor = BlockingExecutor(max_workers=4, call_timeout=5)
+
+    async def scenario():
+        started = time.perf_counter()
+        await asyncio.gather(*(executor.run(time.sleep, 0.2) for _ in range(4)))
+        elapsed = time.perf_counter() - started
+
+        timed_out = False
+        try:
+            await executor.run(time.sleep, 0.5, timeout=0.05)
+        except UpstreamTimeoutError:
+            timed_out = True
+        return elapsed, timed_out
+
+    elapsed, timed_out = asyncio.run(scenario())
+    stats = executor.stats()
+    executor.shutdown(wait=True)
+
+    assert elapsed < 0.6, f"calls were serialized ({elapsed:.2f}s)"
+    assert timed_out, "timeout was not enforced"
+    assert stats["timed_out"] == 1
+    print("✓ Blocking calls run concurrently and honour timeouts")
+    print(f"  Executor stats: {stats}")
+
+def test_zone_fan_out():
+    """Test that multi-zone listings run concurrently and report partial failures."""
+    print("\nTesting zone fan-out...")
+    import asyncio
+    import time
+    from scaleway_fanout import fan_out, render_fan_out, resolve_zones
+
+    zones = resolve_zones("all", "fr-par-1")
+    assert len(zones) > 1 and "fr-par-1" in zones
+    assert resolve_zones("fr-par-1, nl-ams-1", "fr-par-1") == ["fr-par-1", "nl-ams-1"]
+    assert resolve_zones(None, "fr-par-2") == ["fr-par-2"]
+
+    async def fetch(zone):
+        await asyncio.sleep(0.2)
+        if zone == "nl-ams-1":
+            raise RuntimeError("zone unavailable")
+        return [zone]
+
+    started = time.perf_counter()
+    results = asyncio.run(fan_out(zones, fetch))
+    elapsed = time.perf_counter() - started
+    text = render_fan_out(results, "item(s)", "zone", lambda item: f"- {item}\n")
+
+    assert elapsed < 0.2 * len(zones) / 2, f"zones were queried sequentially ({elapsed:.2f}s)"
+    assert [r.target for r in results] == zones
+    assert "1 zone(s) failed" in text and "nl-ams-1: Error: zone unavailable" in text
+    print(f"✓ {len(zones)} zones fanned out in {elapsed:.2f}s with partial failure reported")
+
+def test_pagination():
+    """Test lazy page iteration and cursor round-trips."""
+    print("\nTesting pagination...")
+    import asyncio
+    from types import SimpleNamespace
+    from scaleway_pagination import decode_cursor, fetch_listing, iter_pages, resolve_cursor
+
+    calls = []
+
+    def list_servers(page=1, per_page=50):
+        calls.append(page)
+        servers = list(range(250))[(page - 1) * per_page:page * per_page]
+        return SimpleNamespace(servers=servers, total_count=250)
+
+    async def scenario():
+        everything = await fetch_listing(list_servers, "servers", target="fr-par-1", size_param="per_page")
+        pages_before_break = len(calls)
+        async for page in iter_pages(list_servers, "servers", target="fr-par-1", page_size=100, size_param="per_page"):
+            break
+        first = await fetch_listing(list_servers, "servers", target="fr-par-1", page_size=100, size_param="per_page")
+        return everything, pages_before_break, first
+
+    everything, pages_before_break, first = asyncio.run(scenario())
+    assert len(everything.items) == 250 and everything.next_cursor is None
+    assert pages_before_break == 3
+    assert calls[3:] == [1, 1], f"pages were fetched eagerly: {calls}"
+
+    target, page, page_size = resolve_cursor(first.next_cursor, None)
+    assert (target, page, page_size) == ("fr-par-1", 2, 100)
+    assert decode_cursor(first.next_cursor) == ("fr-par-1", 2, 100)
+
+    # Pages capped below the size asked for, and a deletion while pages are fetched
+    servers = list(range(250))
+
+    def capped(page=1, per_page=50):
+        per_page = min(per_page, 40)
+        return SimpleNamespace(servers=servers[(page - 1) * per_page:page * per_page], total_count=len(servers))
+
+    def shrinking(page=1, per_page=50):
+        result = SimpleNamespace(servers=servers[(page - 1) * per_page:page * per_page], total_count=len(servers))
+        if page == 1 and len(servers) == 250:
+            servers.remove(0)
+        return result
+
+    capped_listing = asyncio.run(fetch_listing(capped, "servers", target="fr-par-1", size_param="per_page"))
+    assert capped_listing.items == list(range(250)), f"{len(capped_listing.items)} items"
+    shrunk = asyncio.run(fetch_listing(shrinking, "servers", target="fr-par-1", size_param="per_page"))
+    assert shrunk.items == list(range(1, 250)), f"{len(shrunk.items)} items, {len(set(shrunk.items))} distinct"
+    print("✓ Pages are fetched lazily and cursors resume at the next page; short or shifted pages are re-read")
+
+def test_response_cache():
+    """Test TTL/LRU behaviour and write-through invalidation of the read cache."""
+    print("\nTesting response cache...")
+    import asyncio
+    import scaleway_cache
+    from scaleway_cache import ResponseCache, cache_key, read_through, resource_tag, write_through
+    from scaleway_cache_backends import CacheBackend, MemoryBackend
+
+    scaleway_cache.response_cache = ResponseCache(max_entries=2)
+    loads = []
+
+    async def load(value):
+        loads.append(value)
+        return value
+
+    async def scenario():
+        zone_tag = resource_tag("instance", "fr-par-1")
+        key = cache_key("list_instances", "fr-par-1", page=1)
+        await read_through(key, "instance", lambda: load("a"), tags=[zone_tag])
+        await read_through(key, "instance", lambda: load("b"), tags=[zone_tag])
+        await read_through(key, "instance", lambda: load("c"), tags=[zone_tag], fresh=True)
+        await write_through(load("write"), zone_tag)
+        await read_through(key, "instance", lambda: load("d"), tags=[zone_tag])
+        for i in range(3):
+            await read_through(cache_key("get_instance", "fr-par-1", instance_id=i), "instance", lambda: load(i))
+
+    asyncio.run(scenario())
+    stats = scaleway_cache.response_cache.stats()
+    scaleway_cache.response_cache = None
+
+    assert loads[:4] == ["a", "c", "write", "d"], f"unexpected loads {loads}"
+    assert stats["hits"] == 1 and stats["invalidations"] == 1
+    assert stats["entries"] == 2 and stats["evictions"] == 2
+
+    # Generations of tags without entries are forgotten, without ever going back
+    backend = MemoryBackend(max_entries=4)
+    before = backend.generation(("instance:fr-par-2",))
+    backend.invalidate(frozenset({"instance:fr-par-1", "instance:fr-par-2"}))
+    invalidated = backend.generation(("instance:fr-par-1", "instance:fr-par-2"))
+    backend.set("kept", "value", 60, frozenset({"instance:fr-par-1"}))
+    for i in range(100):
+        backend.invalidate(frozenset({f"instance:srv-{i}"}))
+    assert len(backend._generations) <= 8, f"{len(backend._generations)} generations kept"
+    assert backend.generation(("instance:fr-par-1",)) == invalidated[:1]
+    assert backend.generation(("instance:fr-par-2",)) not in (before, invalidated[1:])
+    try:
+        CacheBackend()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("CacheBackend is instantiable")
+    print("✓ Cache hits, bypasses, invalidates and evicts as expected")
+    print(f"  Cache stats: {stats}")
+
+def test_single_flight():
+    """Test that identical concurrent reads share one upstream call."""
+    print("\nTesting single-flight reads...")
+    import asyncio
+    import scaleway_cache
+    from scaleway_cache import ResponseCache, cache_key, read_through, resource_tag, write_through
+
+    # TTLs of zero disable caching, so only in-flight sharing can dedupe
+    scaleway_cache.response_cache = ResponseCache(ttls={"instance": 0})
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        if value == "boom":
+            raise RuntimeError("upstream failed")
+        return value
+
+    async def scenario():
+        key = cache_key("list_instances", "fr-par-1")
+        reads = [read_through(key, "instance", lambda: load("a")) for _ in range(5)]
+        shared = await asyncio.gather(*reads)
+
+        # The first caller giving up must not cancel the load for the others
+        leader = asyncio.ensure_future(read_through(key, "instance", lambda: load("b")))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(read_through(key, "instance", lambda: load("c")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        survived = await follower
+
+        failed = await asyncio.gather(
+            *(read_through(key, "instance", lambda: load("boom")) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        # A read arriving after a write must not join a load started before it
+        zone_tag = resource_tag("instance", "fr-par-1")
+        before_write = asyncio.ensure_future(read_through(key, "instance", lambda: load("running"), tags=[zone_tag]))
+        await asyncio.sleep(0)
+        await write_through(load("stop"), zone_tag)
+        after_write = await read_through(key, "instance", lambda: load("stopped"), tags=[zone_tag])
+        return shared, survived, failed, await before_write, after_write
+
+    shared, survived, failed, before_write, after_write = asyncio.run(scenario())
+    stats = scaleway_cache.response_cache.stats()
+    scaleway_cache.response_cache = None
+
+    assert shared == ["a"] * 5 and survived == "b"
+    assert all(isinstance(e, RuntimeError) for e in failed)
+    assert (before_write, after_write) == ("running", "stopped"), (before_write, after_write)
+    assert calls[:3] == ["a", "b", "boom"] and sorted(calls[3:]) == ["running", "stop", "stopped"], (
+        f"unexpected upstream calls {calls}"
+    )
+    assert stats["coalesced"] == 7 and stats["in_flight"] == 0
+    print("✓ 11 concurrent reads made 3 upstream calls")
+
+def test_client_reuse():
+    """Test that API objects are long-lived and SDK requests share keep-alive connections."""
+    print("\nTesting API client reuse...")
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import urllib3.util.connection
+    from scaleway import Client
+    from scaleway_clients import ClientManager, dns_cache
+
+    connections = set()
+    create_connection = urllib3.util.connection.create_connection
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            connections.add(self.client_address)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            body = json.dumps({"servers": [], "total_count": 0}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = Client(
+        access_key="SCWXXXXXXXXXXXXXXXXX",
+        secret_key="11111111-1111-1111-1111-111111111111",
+        default_project_id="11111111-1111-1111-1111-111111111111",
+        default_zone="fr-par-1",
+        api_url=f"http://localhost:{server.server_port}",
+    )
+    manager = ClientManager(client, pool_size=4)
+    manager.install()
+    # The SDK must still send through the requests module scaleway_core.api
+    # imports, which install() replaces; anything else bypasses the session
+    sent = []
+    manager.session.hooks["response"].append(lambda response, **kwargs: sent.append(response.url))
+    lookups = dns_cache.hits + dns_cache.misses
+
+    assert manager.instance is manager.instance
+    for _ in range(5):
+        manager.instance.list_servers()
+    server.shutdown()
+    manager.close()
+
+    assert len(sent) == 5, f"{len(sent)} of 5 SDK requests went through the pooled session"
+    assert len(connections) == 1, f"opened {len(connections)} connections for 5 calls"
+    # The DNS cache serves the session's connections without patching urllib3 for the whole process
+    assert dns_cache.hits + dns_cache.misses == lookups + 1
+    assert urllib3.util.connection.create_connection is create_connection
+    print("✓ API objects are reused and 5 calls shared 1 connection")
+
+def test_jsonrpc_batch():
+    """Test that /mcp accepts JSON-RPC batches and runs tool calls concurrently."""
+    print("\nTesting JSON-RPC batch requests...")
+    import asyncio
+    import time
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+
+    async def slow_tool(**arguments):
+        await asyncio.sleep(0.2)
+        return f"done {arguments}"
+
+    original = dict(scaleway_http_server.TOOL_REGISTRY)
+    scaleway_http_server.TOOL_REGISTRY.update(list_instances=slow_tool, list_k8s_clusters=slow_tool)
+    try:
+        client = TestClient(scaleway_http_server.app)
+        batch = [
+            {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "list_instances", "arguments": {"zone": "fr-par-1"}}},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "list_k8s_clusters", "arguments": {}}},
+            {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "no_such_tool"}},
+        ]
+        started = time.perf_counter()
+        response = client.post("/mcp", json=batch)
+        elapsed = time.perf_counter() - started
+        only_notifications = client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "notifications/initialized"}])
+    finally:
+        scaleway_http_server.TOOL_REGISTRY.clear()
+        scaleway_http_server.TOOL_REGISTRY.update(original)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [message["id"] for message in body] == [1, 2, 3]
+    assert "fr-par-1" in body[0]["result"]["content"][0]["text"]
+    assert body[2]["error"]["code"] == -32603
+    assert elapsed < 0.4, f"batch entries were serialized ({elapsed:.2f}s)"
+    assert only_notifications.status_code == 202
+    print(f"✓ Batch answered in order in {elapsed:.2f}s with notifications omitted")
+
+def test_streamable_http_progress():
+    """Test that tools/call streams progress notifications over SSE."""
+    print("\nTesting Streamable HTTP progress...")
+    import asyncio
+    import json
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+    from scaleway_fanout import fan_out
+
+    async def fan_out_tool(**arguments):
+        async def fetch(zone):
+            await asyncio.sleep(0.05)
+            return [zone]
+        results = await fan_out(["fr-par-1", "nl-ams-1", "pl-waw-1"], fetch)
+        return f"{len(results)} zones"
+
+    original = dict(scaleway_http_server.TOOL_REGISTRY)
+    scaleway_http_server.TOOL_REGISTRY["list_instances"] = fan_out_tool
+    try:
+        client = TestClient(scaleway_http_server.app)
+        message = {
+            "jsonrpc": "2.0",
+            "id": 7,
+            "method": "tools/call",
+            "params": {"name": "list_instances", "arguments": {}, "_meta": {"progressToken": "tok"}},
+        }
+        response = client.post("/mcp", json=message, headers={"Accept": "application/json, text/event-stream"})
+        plain = client.post("/mcp", json=message)
+    finally:
+        scaleway_http_server.TOOL_REGISTRY.clear()
+        scaleway_http_server.TOOL_REGISTRY.update(original)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    progress = [event for event in events if event.get("method") == "notifications/progress"]
+    assert len(progress) == 3 and progress[-1]["params"]["progress"] == 3
+    assert all(event["params"]["progressToken"] == "tok" for event in progress)
+    assert events[-1]["id"] == 7 and events[-1]["result"]["content"][0]["text"] == "3 zones"
+    assert plain.headers["content-type"].startswith("application/json")
+    print(f"✓ Streamed {len(progress)} progress notification(s) before the result")
+
+def test_state_waiter():
+    """Test that concurrent waits in one zone share a single poll per tick."""
+    print("\nTesting coalesced state waits...")
+    import asyncio
+    from types import SimpleNamespace
+    from scaleway_waiter import InstanceStatePoller
+
+    calls = []
+
+    def list_servers(zone, servers, per_page):
+        calls.append(list(servers))
+        state = "running" if len(calls) >= 3 else "starting"
+        return SimpleNamespace(servers=[
+            SimpleNamespace(id=server_id, state=state)
+            for server_id in servers if server_id != "gone"
+        ])
+
+    async def run():
+        poller = InstanceStatePoller(list_servers, min_interval=0.01, max_interval=0.02)
+        waits = [poller.wait_for("fr-par-1", f"srv-{i}", {"running"}, 5) for i in range(5)]
+        waits.append(poller.wait_for("fr-par-1", "gone", {"deleted"}, 5))
+        waits.append(poller.wait_for("fr-par-1", "srv-0", {"stopped"}, 0.1))
+        return await asyncio.gather(*waits), poller
+
+    results, poller = asyncio.run(run())
+
+    assert all(r.reached and r.state == "running" for r in results[:5])
+    assert results[5].reached and results[5].state == "deleted"
+    assert not results[6].reached and results[6].state == "running"
+    assert len(calls[0]) == 6 and len(calls) == poller.polls
+    assert poller.stats()["waiting"] == 0 and poller.stats()["zones"] == 0
+    print(f"✓ 7 waits resolved with {len(calls)} batched poll(s)")
+
+def test_waiter_state_validation():
+    """Test that waits reject unknown states before polling and stop at terminal failure states."""
+    print("\nTesting state validation of waits...")
+    import asyncio
+    from types import SimpleNamespace
+    from scaleway.instance.v1.types import ServerState
+    from scaleway_waiter import DELETED_STATE, INSTANCE_STATES, InstanceStatePoller, format_wait_result
+
+    assert set(INSTANCE_STATES) == {state.value for state in ServerState} | {DELETED_STATE}
+    calls = []
+
+    def list_servers(zone, servers, per_page):
+        calls.append(list(servers))
+        return SimpleNamespace(servers=[SimpleNamespace(id=server_id, state="locked") for server_id in servers])
+
+    async def run():
+        poller = InstanceStatePoller(list_servers, min_interval=0.01, max_interval=0.02)
+        for states in ({"runing"}, set()):
+            try:
+                await poller.wait_for("fr-par-1", "srv-1", states, 300)
+            except ValueError as e:
+                assert "Valid states: running" in str(e)
+            else:
+                raise AssertionError(f"waited for {states}")
+        assert calls == [] and poller.stats()["zones"] == 0
+        return await poller.wait_for("fr-par-1", "srv-1", {"running"}, 300)
+
+    result = asyncio.run(run())
+    assert not result.reached and result.state == "locked" and result.elapsed < 5
+    assert "will not reach running" in format_wait_result(result, "running")
+    print(f"✓ Unknown states refused without polling; a locked instance ended its wait after {len(calls)} poll(s)")
+
+def test_bulk_actions():
+    """Test bulk lifecycle actions under a parallelism cap."""
+    print("\nTesting bulk instance actions...")
+    import asyncio
+    import time
+    from types import SimpleNamespace
+    from scaleway_bulk import bulk_server_action
+
+    active = 0
+    peak = 0
+    acted = []
+
+    def server_action(zone, server_id, action):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        time.sleep(0.05)
+        active -= 1
+        if server_id == "srv-3":
+            raise RuntimeError("instance is locked")
+        acted.append((server_id, action))
+
+    def list_servers(zone, tags=None, page=1, per_page=100, servers=None):
+        tagged = [SimpleNamespace(id=f"srv-{i}") for i in range(4) if tags == ["batch"]]
+        return SimpleNamespace(servers=tagged, total_count=len(tagged))
+
+    instance_api = SimpleNamespace(server_action=server_action, list_servers=list_servers)
+
+    by_id = asyncio.run(bulk_server_action(
+        instance_api, "fr-par-1", "poweroff", [f"srv-{i}" for i in range(8)], None, concurrency=3
+    ))
+    capped_peak = peak
+    by_tag = asyncio.run(bulk_server_action(instance_api, "fr-par-1", "poweron", None, ["batch"]))
+
+    assert capped_peak <= 3, f"expected at most 3 concurrent actions, saw {capped_peak}"
+    assert "Stopped 7/8 instance(s)" in by_id and "| srv-3 | ✗ instance is locked |" in by_id
+    assert "| srv-0 | ✓ stopped |" in by_id
+    assert "Started 3/4 instance(s)" in by_tag
+    assert sorted(a for _, a in acted).count("poweron") == 3
+    print(f"✓ 12 bulk actions ran with at most {capped_peak} in flight under a cap of 3")
+
+def test_bulk_wait_outside_cap():
+    """Test that bulk waits for state changes run concurrently, outside the action parallelism cap."""
+    print("\nTesting bulk waits outside the parallelism cap...")
+    import asyncio
+    import time
+    from types import SimpleNamespace
+    import scaleway_bulk
+    from scaleway_waiter import WaitResult
+
+    active = {"actions": 0, "peak_actions": 0, "waits": 0, "peak_waits": 0}
+
+    def server_action(zone, server_id, action):
+        active["actions"] += 1
+        active["peak_actions"] = max(active["peak_actions"], active["actions"])
+        time.sleep(0.02)
+        active["actions"] -= 1
+
+    class Poller:
+        async def wait_for(self, zone, server_id, states, timeout):
+            active["waits"] += 1
+            active["peak_waits"] = max(active["peak_waits"], active["waits"])
+            await asyncio.sleep(0.3)
+            active["waits"] -= 1
+            return WaitResult(server_id, zone, "running", True, 0.3, None)
+
+    instance_api = SimpleNamespace(server_action=server_action, list_servers=None)
+    original = scaleway_bulk.get_state_poller
+    scaleway_bulk.get_state_poller = lambda list_servers: Poller()
+    try:
+        start = time.perf_counter()
+        result = asyncio.run(scaleway_bulk.bulk_server_action(
+            instance_api, "fr-par-1", "poweron", [f"srv-{i}" for i in range(8)], None, concurrency=2, wait=True
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        scaleway_bulk.get_state_poller = original
+
+    assert "Started 8/8 instance(s)" in result and "| srv-7 | ✓ running after 0s |" in result, result
+    assert active["peak_actions"] <= 2, f"{active['peak_actions']} actions in flight under a cap of 2"
+    # Holding a slot through each wait would take 4 waves of 0.3s
+    assert active["peak_waits"] > 2 and elapsed < 0.9, f"waits ran in waves ({elapsed:.2f}s)"
+    print(f"✓ 8 waits overlapped ({active['peak_waits']} at once) in {elapsed:.2f}s with 2 action slots")
+
+def test_rate_limiter():
+    """Test the per-family token bucket and jittered retries on 429/5xx."""
+    print("\nTesting upstream rate limiter...")
+    import time
+    from types import SimpleNamespace
+    from scaleway_ratelimit import RetryPolicy, TokenBucket, UpstreamLimiter, api_family
+
+    statuses = {"GET": [429, 503, 200], "POST": [500, 200]}
+    sent = []
+
+    def send(method, url, **kwargs):
+        sent.append(method)
+        status = statuses[method].pop(0)
+        headers = {"Retry-After": "0"} if status == 429 else {}
+        return SimpleNamespace(status_code=status, headers=headers, close=lambda: None)
+
+    limiter = UpstreamLimiter(rates={"instance": 1000.0}, policy=RetryPolicy(max_retries=3, base_delay=0.01))
+    get = limiter.send(send, "GET", "https://api.scaleway.com/instance/v1/zones/fr-par-1/servers")
+    post = limiter.send(send, "POST", "https://api.scaleway.com/instance/v1/zones/fr-par-1/servers")
+
+    assert get.status_code == 200 and sent.count("GET") == 3
+    assert post.status_code == 500 and sent.count("POST") == 1, "non-idempotent 500 must not be retried"
+    assert limiter.stats()["retries"] == 2 and limiter.stats()["rate_limited"] == 1
+    assert api_family("https://api.scaleway.com/k8s/v1/regions/fr-par/clusters") == "k8s"
+
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 0.07 and bucket.throttled == 4, f"5 requests at 50/s took {elapsed:.3f}s"
+    print(f"✓ Retried 429/503 with backoff and throttled 5 requests to {elapsed:.2f}s at 50/s")
+
+def test_gateway_errors_not_retried_for_posts():
+    """Test that a POST answered 502/504 is not retried, on the sync and the async path."""
+    print("\nTesting retries of non-idempotent requests...")
+    import asyncio
+    from types import SimpleNamespace
+    from scaleway_ratelimit import RetryPolicy, UpstreamLimiter
+
+    url = "https://api.scaleway.com/instance/v1/zones/fr-par-1/servers"
+    limiter = UpstreamLimiter(rates={"instance": 0}, policy=RetryPolicy(max_retries=3, base_delay=0.001))
+
+    def responses(*answers):
+        answers = list(answers)
+        sent = []
+
+        async def aclose():
+            pass
+
+        def send(method, url, **kwargs):
+            sent.append(method)
+            status, headers = answers.pop(0)
+            return SimpleNamespace(status_code=status, headers=headers, close=lambda: None, aclose=aclose)
+
+        async def send_async(method, url, **kwargs):
+            return send(method, url, **kwargs)
+
+        return sent, send, send_async
+
+    for status in (502, 504):
+        sent, send, _ = responses((status, {}), (201, {}))
+        assert limiter.send(send, "POST", url).status_code == status and sent == ["POST"]
+        sent, _, send_async = responses((status, {}), (201, {}))
+        assert asyncio.run(limiter.send_async(send_async, "POST", url)).status_code == status and sent == ["POST"]
+        sent, send, _ = responses((status, {}), (200, {}))
+        assert limiter.send(send, "GET", url).status_code == 200 and sent == ["GET", "GET"]
+
+    # Rejected before being processed: safe to send again whatever the method
+    sent, send, _ = responses((429, {}), (503, {"Retry-After": "0"}), (201, {}))
+    assert limiter.send(send, "POST", url).status_code == 201 and len(sent) == 3
+    sent, _, send_async = responses((503, {}), (201, {}))
+    assert asyncio.run(limiter.send_async(send_async, "POST", url)).status_code == 503 and len(sent) == 1
+
+    # A Retry-After beyond the backoff cap is handed back, not retried early
+    sent, send, _ = responses((429, {"Retry-After": "60"}), (200, {}))
+    assert limiter.send(send, "GET", url).status_code == 429 and len(sent) == 1
+    sent, _, send_async = responses((429, {"Retry-After": "60"}), (200, {}))
+    assert asyncio.run(limiter.send_async(send_async, "GET", url)).status_code == 429 and len(sent) == 1
+    assert RetryPolicy(max_delay=10.0).delay(0, retry_after=8.0) == 8.0
+    print("✓ POSTs are only retried on 429 and on 503 with Retry-After, and never sooner than it asks")
+
+def test_metrics():
+    """Test the /metrics endpoint and the STDIO stats tool."""
+    print("\nTesting metrics...")
+    import asyncio
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+    import scaleway_server
+    from scaleway_metrics import TOOL_CALLS, TOOL_DURATION, TOOL_ERRORS, track_upstream, upstream_scope
+
+    async def ok_tool(**arguments):
+        return "ok"
+
+    async def failing_tool(**arguments):
+        return "Error: upstream said no"
+
+    calls = TOOL_CALLS.value(tool="list_instances")
+    timed = TOOL_DURATION.count(tool="list_instances")
+    errors = TOOL_ERRORS.value(tool="get_instance")
+    original = dict(scaleway_http_server.TOOL_REGISTRY)
+    scaleway_http_server.TOOL_REGISTRY.update({"list_instances": ok_tool, "get_instance": failing_tool})
+    try:
+        client = TestClient(scaleway_http_server.app)
+        for name in ("list_instances", "list_instances", "get_instance"):
+            client.post("/mcp", json={
+                "jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": name, "arguments": {}},
+            })
+        with track_upstream("GET", "https://api.scaleway.com/instance/v1/zones/nl-ams-1/servers") as outcome:
+            outcome["status"] = 200
+        response = client.get("/metrics")
+    finally:
+        scaleway_http_server.TOOL_REGISTRY.clear()
+        scaleway_http_server.TOOL_REGISTRY.update(original)
+
+    body = response.text
+    assert response.headers["content-type"].startswith("text/plain")
+    assert f'scaleway_mcp_tool_calls_total{{tool="list_instances"}} {calls + 2:.0f}' in body
+    assert f'scaleway_mcp_tool_errors_total{{tool="get_instance"}} {errors + 1:.0f}' in body
+    assert f'scaleway_mcp_tool_duration_seconds_count{{tool="list_instances"}} {timed + 2}' in body
+    assert 'scaleway_mcp_upstream_duration_seconds_count{family="instance",zone="nl-ams-1"}' in body
+    assert "scaleway_mcp_cache_hit_ratio" in body
+    assert upstream_scope("https://api.scaleway.com/k8s/v1/regions/fr-par/clusters") == "fr-par"
+
+    before = TOOL_CALLS.value(tool="get_server_stats")
+    asyncio.run(scaleway_server.mcp.call_tool("get_server_stats", {}))
+    assert TOOL_CALLS.value(tool="get_server_stats") == before + 1
+    assert TOOL_ERRORS.value(tool="get_server_stats") == 0
+
+    # Structured tools are counted too, failures included
+    def no_client():
+        raise ValueError("no credentials")
+
+    calls, errors = TOOL_CALLS.value(tool="list_images"), TOOL_ERRORS.value(tool="list_images")
+    original_client = scaleway_server.get_scaleway_client
+    scaleway_server.get_scaleway_client = no_client
+    try:
+        asyncio.run(scaleway_server.mcp.call_tool("list_images", {}))
+    finally:
+        scaleway_server.get_scaleway_client = original_client
+    assert TOOL_CALLS.value(tool="list_images") == calls + 1
+    assert TOOL_ERRORS.value(tool="list_images") == errors + 1
+    print(f"✓ /metrics exposes tool and upstream series ({len(body.splitlines())} lines)")
+
+def test_request_timing():
+    """Test Server-Timing/_meta.timing breakdowns and the opt-in profiler."""
+    print("\nTesting request timing and profiling...")
+    import os
+    import time
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+    from scaleway_executor import run_blocking
+    from scaleway_timing import timed_phase
+
+    def sdk_call():
+        with timed_phase("upstream"):
+            time.sleep(0.03)
+        time.sleep(0.01)
+        return "done"
+
+    async def slow_tool(**arguments):
+        return await run_blocking(sdk_call)
+
+    original = dict(scaleway_http_server.TOOL_REGISTRY)
+    scaleway_http_server.TOOL_REGISTRY["list_instances"] = slow_tool
+    message = {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "list_instances", "arguments": {}}}
+    try:
+        client = TestClient(scaleway_http_server.app)
+        response = client.post("/mcp", json=message)
+        disabled = client.post("/debug/profile?requests=1")
+
+        os.environ["SCW_MCP_ENABLE_PROFILER"] = "1"
+        try:
+            armed = client.post("/debug/profile?requests=1")
+            client.post("/mcp", json=message)
+            profile = client.get("/debug/profile")
+        finally:
+            del os.environ["SCW_MCP_ENABLE_PROFILER"]
+    finally:
+        scaleway_http_server.TOOL_REGISTRY.clear()
+        scaleway_http_server.TOOL_REGISTRY.update(original)
+
+    header = response.headers["server-timing"]
+    timing = response.json()["result"]["_meta"]["timing"]
+    for phase in ("parse", "queue", "upstream", "sdk", "tool", "serialize", "total"):
+        assert f"{phase};dur=" in header, f"{phase} missing from Server-Timing: {header}"
+    assert timing["upstream"] >= 30 and timing["sdk"] >= 10 and timing["tool"] >= 40
+    assert "parse" not in timing and timing["total"] >= timing["tool"]
+
+    assert disabled.status_code == 404 and armed.json()["remaining"] == 1
+    stacks = profile.text.splitlines()
+    assert profile.headers["x-profile-remaining"] == "0"
+    assert stacks and any(line.split(" ")[0].endswith(":sdk_call") for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    print(f"✓ Server-Timing: {header}")
+    print(f"✓ Profiler captured {len(stacks)} distinct stack(s)")
+
+def test_structured_output():
+    """Test format=json, field projection and MCP structured content."""
+    print("\nTesting structured output...")
+    import asyncio
+    import json
+    from types import SimpleNamespace
+    import scaleway_server
+
+    class Server:
+        def __init__(self, i):
+            self.id, self.name, self.state = f"srv-{i}", f"node-{i}", "running"
+
+        @property
+        def volumes(self):
+            raise AssertionError("volumes were rendered but not requested")
+
+    def list_servers(zone, page=1, per_page=100):
+        return SimpleNamespace(servers=[Server(i) for i in range(3)], total_count=3)
+
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="fr-par-1")
+    scaleway_server.get_api_clients = lambda: SimpleNamespace(instance=SimpleNamespace(list_servers=list_servers))
+    try:
+        result = asyncio.run(scaleway_server.mcp.call_tool(
+            "list_instances", {"format": "json", "fields": ["id", "state"], "fresh": True}
+        ))
+        text = asyncio.run(scaleway_server.mcp.call_tool(
+            "list_instances", {"fields": ["name"], "fresh": True}
+        ))
+        invalid = asyncio.run(scaleway_server.mcp.call_tool(
+            "list_instances", {"format": "json", "fields": ["volume"], "fresh": True}
+        ))
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+
+    payload = result.structuredContent
+    assert payload["zone"] == "fr-par-1" and payload["total_count"] == 3
+    assert payload["items"][0] == {"id": "srv-0", "state": "running"}
+    assert json.loads(result.content[0].text) == payload
+    assert "- **name**: node-2" in text[0].text
+    assert text[0].text.startswith("Found 3 instance(s)")
+    assert "Unknown field(s) volume" in invalid[0].text
+    print(f"✓ JSON projection: {result.content[0].text[:60]}...")
+
+def test_ndjson_streaming():
+    """Test that listings stream as NDJSON while later pages are fetched."""
+    print("\nTesting NDJSON listing stream...")
+    import asyncio
+    import json
+    import time
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+
+    calls = []
+
+    def list_servers(zone, page=1, per_page=100):
+        calls.append((zone, page))
+        if zone == "pl-waw-1":
+            raise RuntimeError("zone unavailable")
+        time.sleep(0.1)
+        servers = [SimpleNamespace(id=f"{zone}-{page}-{i}", name=f"node-{i}") for i in range(per_page)]
+        return SimpleNamespace(servers=servers, total_count=per_page * 3)
+
+    original = scaleway_http_server.get_scaleway_client, scaleway_http_server.get_api_clients
+    scaleway_http_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="fr-par-1")
+    scaleway_http_server.get_api_clients = lambda: SimpleNamespace(instance=SimpleNamespace(list_servers=list_servers))
+    try:
+        client = TestClient(scaleway_http_server.app)
+        message = {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "tools/call",
+            "params": {
+                "name": "list_instances",
+                "arguments": {"zone": "fr-par-1,nl-ams-1,pl-waw-1", "page_size": 2, "fields": ["id"], "fresh": True},
+            },
+        }
+        response = client.post("/mcp", json=message, headers={"Accept": "application/x-ndjson"})
+
+        # The test client buffers the body, so time the chunks at the source
+        async def consume(message):
+            start = time.monotonic()
+            return [
+                (time.monotonic() - start, chunk)
+                async for chunk in scaleway_http_server.stream_ndjson(message)
+            ]
+        chunks = asyncio.run(consume(message))
+
+        # Without fresh, pages come from the cache entries the list tools use
+        calls.clear()
+        cached = {**message, "params": {**message["params"], "arguments": {**message["params"]["arguments"], "fresh": False}}}
+        asyncio.run(consume(cached))
+        cached_calls = [call for call in calls if call[0] != "pl-waw-1"]
+
+        markdown = {**message, "params": {**message["params"], "arguments": {"format": "markdown"}}}
+        rejected = json.loads(client.post("/mcp", json=markdown, headers={"Accept": "application/x-ndjson"}).text.splitlines()[-1])
+    finally:
+        scaleway_http_server.get_scaleway_client, scaleway_http_server.get_api_clients = original
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    items = [record for record in records if "item" in record]
+    final = records[-1]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(items) == 12 and items[0]["item"].keys() == {"id"}
+    assert {"zone": "pl-waw-1", "error": "zone unavailable"} in records
+    assert {"zone": "fr-par-1", "count": 6} in records
+    assert final["id"] == 3 and final["result"]["structuredContent"]["total_count"] == 12
+    first_item = next(at for at, chunk in chunks if b'"item"' in chunk)
+    done = chunks[-1][0]
+    assert first_item < done - 0.1, "first page was not streamed before the last one"
+    assert cached_calls == [], f"cached pages fetched again: {cached_calls}"
+    assert rejected["error"]["code"] == -32602 and "markdown" in rejected["error"]["data"]
+    print(f"✓ Streamed {len(items)} items; first page after {first_item:.2f}s, done after {done:.2f}s")
+
+def test_filter_pushdown():
+    """Test that list filters go to the API and unsupported ones are applied locally."""
+    print("\nTesting filter pushdown...")
+    import asyncio
+    import json
+    from types import SimpleNamespace
+    import scaleway_server
+    from scaleway_filters import instance_filters
+
+    plan = instance_filters(tags=["prod"], state="running", commercial_type="GP1-S")
+    assert plan.api_args == {"tags": ["prod"], "state": "running", "commercial_type": "GP1-S"}
+    assert plan.local == ()
+    try:
+        instance_filters(state="sleeping")
+        raise AssertionError("unknown state was accepted")
+    except ValueError as e:
+        assert "Valid values" in str(e)
+
+    calls = []
+    servers = [
+        SimpleNamespace(id="srv-0", state="running", commercial_type="GP1-S", tags=["prod"]),
+        SimpleNamespace(id="srv-1", state="running", commercial_type="DEV1-S", tags=["prod"]),
+        SimpleNamespace(id="srv-2", state="running", commercial_type="GP1-M", tags=["prod"]),
+    ]
+
+    def list_servers(zone, page=1, per_page=100, **filters):
+        calls.append(filters)
+        return SimpleNamespace(servers=servers, total_count=len(servers))
+
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="fr-par-1")
+    scaleway_server.get_api_clients = lambda: SimpleNamespace(instance=SimpleNamespace(list_servers=list_servers))
+    try:
+        result = asyncio.run(scaleway_server.mcp.call_tool("list_instances", {
+            "tags": ["prod"], "state": "running", "commercial_type": "GP1-*",
+            "format": "json", "fields": ["id"], "fresh": True,
+        }))
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+
+    payload = json.loads(result.content[0].text)
+    assert calls == [{"tags": ["prod"], "state": "running"}], calls
+    assert [item["id"] for item in payload["items"]] == ["srv-0", "srv-2"]
+    assert payload["total_count"] == 2
+    print(f"✓ Pushed down {calls[0]}; filtered GP1-* locally to {payload['total_count']} instance(s)")
+
+def test_paged_local_filter():
+    """Test that a page thinned out by a local filter keeps its cursor and counts only its matches."""
+    print("\nTesting paged local filters...")
+    import asyncio
+    import json
+    from types import SimpleNamespace
+    import scaleway_server
+
+    # One arm64 instance among 250; it sits on the second page of 4
+    servers = [
+        SimpleNamespace(
+            id=f"srv-{i}", name=f"srv-{i}", state="running", commercial_type="DEV1-S", arch="arm64" if i == 5 else "x86_64",
+            zone="fr-par-1", public_ip=None, private_ip=None, creation_date=None, tags=[],
+        )
+        for i in range(250)
+    ]
+
+    def list_servers(zone, page=1, per_page=100, **filters):
+        return SimpleNamespace(servers=servers[(page - 1) * per_page:page * per_page], total_count=len(servers))
+
+    networks = [SimpleNamespace(id=f"pn-{i}", name=f"pn-{i}", created_at=None, tags=[]) for i in range(3)]
+
+    def list_private_networks(region, page=1, page_size=100, **filters):
+        return SimpleNamespace(private_networks=networks[(page - 1) * page_size:page * page_size], total_count=len(networks))
+
+    def call(arguments):
+        return asyncio.run(scaleway_server.mcp.call_tool("list_instances", {"arch": "arm64", "fresh": True, **arguments}))
+
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="fr-par-1", default_region="fr-par")
+    scaleway_server.get_api_clients = lambda: SimpleNamespace(
+        instance=SimpleNamespace(list_servers=list_servers),
+        vpc=SimpleNamespace(list_private_networks=list_private_networks),
+    )
+    try:
+        first = call({"page_size": 4})[0].text
+        cursor = first.split('cursor="')[1].split('"')[0]
+        second = call({"cursor": cursor})[0].text
+        payload = json.loads(call({"cursor": cursor, "format": "json"}).content[0].text)
+        everything = call({})[0].text
+        network_page = asyncio.run(scaleway_server.mcp.call_tool("list_private_networks", {"page_size": 2, "fresh": True}))[0].text
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+
+    assert "No instances found" not in first, first
+    assert "0 match(es) on this page, more pages remain." in first
+    assert "Found 1 matching instance(s) on page 2 in zone fr-par-1" in second, second
+    assert "**srv-5**" in second and "250" not in second and "cursor=" in second
+    assert payload["total_count"] == 1 and payload["filtered"] is True and payload["next_cursor"]
+    assert "Found 1 instance(s) in zone fr-par-1" in everything
+    # Private networks share the header and continuation of the other list tools
+    assert network_page.startswith("Found 3 private network(s) in region fr-par:"), network_page
+    assert "Showing 1-2 of 3." in network_page and "cursor=" in network_page
+    print("✓ Filtered pages keep their cursor and report their own matches")
+
+def test_tool_catalog():
+    """Test the prebuilt tools/list catalog and its ETag revalidation."""
+    print("\nTesting tool catalog...")
+    import json
+    import os
+    import subprocess
+    import sys
+    from typing import Optional
+    from fastapi.testclient import TestClient
+    import scaleway_http_server
+    from scaleway_catalog import parse_docstring
+    from scaleway_tool_definitions import implements
+
+    summary, args = parse_docstring("""Do a thing.
+
+    Args:
+        zone: Scaleway zone,
+            or "all".
+        fresh: Bypass the cache.
+    """)
+    assert summary == "Do a thing" and args == {"zone": 'Scaleway zone, or "all".', "fresh": "Bypass the cache."}
+
+    catalog = scaleway_http_server.get_tool_catalog()
+    tools = {tool["name"]: tool for tool in catalog.result["tools"]}
+    assert list(tools) == list(scaleway_http_server.TOOL_REGISTRY)
+    schema = tools["get_instance"]["inputSchema"]
+    assert schema["required"] == ["instance_id"]
+    assert schema["properties"]["zone"]["type"] == "string"
+    assert "default zone" in schema["properties"]["zone"]["description"]
+
+    client = TestClient(scaleway_http_server.app)
+    message = {"jsonrpc": "2.0", "id": "a1", "method": "tools/list", "params": {}}
+    first = client.post("/mcp", json=message)
+    etag = first.headers["etag"]
+    assert first.json() == {"jsonrpc": "2.0", "id": "a1", "result": catalog.result}
+    revalidated = client.post("/mcp", json=message, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    stale = client.post("/mcp", json=message, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200 and stale.headers["etag"] == etag
+    batch = client.post("/mcp", json=[message])
+    assert batch.json()[0]["result"] == catalog.result
+
+    # Building the catalog reads the tool definitions, not the STDIO server
+    code = (
+        "import json, sys, scaleway_http_server; scaleway_http_server.get_tool_catalog(); "
+        "print(json.dumps([m for m in ('scaleway_server', 'scaleway') if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert loaded == [], f"imported to build the catalog: {loaded}"
+
+    try:
+        @implements("get_instance")
+        async def get_instance(instance_id: str, zone: Optional[str] = "fr-par-1") -> str:
+            return instance_id
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("implementation with different arguments accepted")
+    print(f"✓ {len(tools)} tools, {len(catalog.encoded)} bytes, ETag {etag}; revalidation returned 304")
+
+def test_cold_start_imports():
+    """Test that importing the HTTP server defers the MCP models and the Scaleway SDK."""
+    print("\nTesting cold-start imports...")
+    import json
+    import os
+    import subprocess
+    import sys
+
+    deferred = ["mcp.types", "mcp.server.fastmcp", "scaleway", "scaleway.instance.v1.api", "requests", "scaleway_server"]
+    code = (
+        "import json, sys, time; start = time.perf_counter(); import scaleway_http_server; "
+        f"print(json.dumps([time.perf_counter() - start, [m for m in {deferred!r} if m in sys.modules]]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert loaded == [], f"imported at startup: {loaded}"
+    print(f"✓ HTTP server imported in {elapsed:.2f}s without the MCP models or the Scaleway SDK")
+
+def test_shared_cache_backends():
+    """Test the SQLite and Redis-compatible cache backends shared by worker processes."""
+    print("\nTesting shared cache backends...")
+    import json
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    import time
+    import fnmatch
+    from fastapi.testclient import TestClient
+    import scaleway_cache
+    import scaleway_http_server
+    from scaleway_cache import ResponseCache
+    from scaleway_cache_backends import RedisBackend, SQLiteBackend
+
+    class StandInRedis:
+        """The subset of redis-py used by RedisBackend, kept in a dict."""
+
+        def __init__(self):
+            self.data = {}
+
+        def _live(self, name):
+            value, expires_at = self.data.get(name, (None, None))
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.data[name]
+                return None
+            return value
+
+        def get(self, name):
+            return self._live(name)
+
+        def set(self, name, value, px=None, nx=False):
+            if nx and self._live(name) is not None:
+                return None
+            self.data[name] = (value, time.monotonic() + px / 1000 if px else None)
+            return True
+
+        def mget(self, names):
+            return [self._live(name) for name in names]
+
+        def delete(self, *names):
+            return sum(1 for name in names if self.data.pop(name, None) is not None)
+
+        def exists(self, name):
+            return int(self._live(name) is not None)
+
+        def incr(self, name):
+            value = int(self._live(name) or 0) + 1
+            self.data[name] = (value, None)
+            return value
+
+        def sadd(self, name, member):
+            members = self._live(name) or set()
+            members.add(member)
+            self.data[name] = (members, self.data.get(name, (None, None))[1])
+
+        def smembers(self, name):
+            return self._live(name) or set()
+
+        def pexpire(self, name, ms):
+            if name in self.data:
+                self.data[name] = (self.data[name][0], time.monotonic() + ms / 1000)
+
+        def scan_iter(self, match, count=None):
+            return [name for name in list(self.data) if fnmatch.fnmatchcase(name, match) and self._live(name) is not None]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        for make_backend in (lambda: SQLiteBackend(path, 16), lambda redis=StandInRedis(): RedisBackend(redis)):
+            # Two caches on one store stand in for two worker processes
+            first, second = ResponseCache(max_entries=16, backend=make_backend()), ResponseCache(max_entries=16, backend=make_backend())
+            key = ("list_instances", "fr-par-1", ())
+            first.set(key, {"servers": ["srv-1"]}, "instance", ["instance:fr-par-1"])
+            assert second.get(key) == (True, {"servers": ["srv-1"]})
+            before = first.generation(["instance:fr-par-1"])
+            assert second.invalidate("instance:fr-par-1") == 1
+            assert first.get(key) == (False, None)
+            assert first.generation(["instance:fr-par-1"]) != before
+            assert first.backend.acquire(key, 5) and not second.backend.acquire(key, 5)
+            assert second.backend.leased(key)
+            first.backend.release(key)
+            assert second.backend.acquire(key, 5)
+            second.backend.release(key)
+
+        # Two worker processes missing on the same key make one upstream call
+        calls = os.path.join(tmp, "calls")
+        worker = (
+            "import asyncio, json, time, scaleway_cache\n"
+            "async def loader():\n"
+            f"    open({calls!r}, 'a').write('call\\n')\n"
+            "    await asyncio.sleep(1.0)\n"
+            "    return {'servers': ['srv-1']}\n"
+            "value = asyncio.run(scaleway_cache.read_through(('list_instances', 'fr-par-1', ()), 'instance', loader))\n"
+            "print(json.dumps([value, scaleway_cache.cache_stats()['shared_coalesced']]))\n"
+        )
+        env = {**os.environ, "SCW_MCP_CACHE_BACKEND": "sqlite", "SCW_MCP_CACHE_PATH": os.path.join(tmp, "workers.sqlite")}
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-c", worker],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            for _ in range(2)
+        ]
+        results = [json.loads(process.communicate(timeout=60)[0].strip().splitlines()[-1]) for process in workers]
+        upstream_calls = len(open(calls).read().splitlines())
+
+    assert all(value == {"servers": ["srv-1"]} for value, _ in results)
+    assert upstream_calls == 1, f"{upstream_calls} upstream calls"
+    assert sorted(coalesced for _, coalesced in results) == [0, 1]
+
+    # /metrics reports the cache whatever its backend
+    previous = scaleway_cache.response_cache
+    scaleway_cache.response_cache = ResponseCache(max_entries=16, backend=RedisBackend(StandInRedis()))
+    try:
+        scaleway_cache.response_cache.set(("list_instances", "fr-par-1", ()), {"servers": []}, "instance")
+        response = TestClient(scaleway_http_server.app).get("/metrics")
+    finally:
+        scaleway_cache.response_cache = previous
+    assert response.status_code == 200
+    assert "scaleway_mcp_cache_entries 1" in response.text, response.text
+    assert "scaleway_mcp_executor_active" in response.text
+    print(f"✓ SQLite and Redis stand-in share entries; 2 workers made {upstream_calls} upstream call")
+
+def test_shared_cache_codec():
+    """Test that shared cache values round-trip as JSON, cannot run code, and are read off the event loop."""
+    print("\nTesting shared cache codec...")
+    import asyncio
+    import threading
+    from datetime import datetime, timezone
+    import scaleway_cache
+    import scaleway_cache_codec
+    from scaleway.instance.v1.types import ServerIp, ServerIpIpFamily, ServerIpProvisioningMode, ServerIpState
+    from scaleway_cache import ResponseCache, read_through
+    from scaleway_cache_backends import MemoryBackend
+    from scaleway_cache_codec import CodecError
+    from scaleway_pagination import Page
+
+    ip = ServerIp(
+        id="ip-1", address="10.0.0.2", gateway="10.0.0.1", netmask="24", family=ServerIpIpFamily.INET,
+        dynamic=False, provisioning_mode=ServerIpProvisioningMode.MANUAL, tags=["web"], ipam_id="ipam-1",
+        state=ServerIpState.ATTACHED,
+    )
+    page = Page("fr-par-1", [ip], 1, 100, 1, None, datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+    decoded = scaleway_cache_codec.loads(scaleway_cache_codec.dumps(page))
+    assert decoded == page and type(decoded.items[0]) is ServerIp
+    assert decoded.items[0].family is ServerIpIpFamily.INET
+
+    # Payloads naming anything but SDK or server classes are refused, not instantiated
+    hostile = [
+        b'{"$object":"os:_wrap_close","state":{}}',
+        b'{"$object":"subprocess:Popen","state":{}}',
+        b'{"$namedtuple":"scaleway_cache:os.terminal_size","items":[1,2]}',
+        b'{"$enum":"builtins:type","value":1}',
+        b"\x80\x04\x95",
+    ]
+    for payload in hostile:
+        try:
+            scaleway_cache_codec.loads(payload)
+        except CodecError:
+            continue
+        raise AssertionError(f"decoded {payload!r}")
+
+    class SharedBackend(MemoryBackend):
+        """A process-local backend flagged as shared, recording the threads it is called on."""
+
+        shared = True
+
+        def __init__(self):
+            super().__init__(16)
+            self.threads = set()
+
+        def get(self, key):
+            self.threads.add(threading.get_ident())
+            return super().get(key)
+
+    async def loader():
+        return {"servers": ["srv-1"]}
+
+    previous = scaleway_cache.response_cache
+    scaleway_cache.response_cache = ResponseCache(max_entries=16, backend=SharedBackend())
+    try:
+        async def read():
+            return await read_through(("list_instances", "fr-par-1", ()), "instance", loader), threading.get_ident()
+
+        value, loop_thread = asyncio.run(read())
+        threads = scaleway_cache.response_cache.backend.threads
+    finally:
+        scaleway_cache.response_cache = previous
+
+    assert value == {"servers": ["srv-1"]}
+    assert threads and loop_thread not in threads, "shared backend called on the event loop"
+    print(f"✓ SDK models round-trip, {len(hostile)} hostile payloads refused, shared backend read off the loop")
+
+def test_background_inventory():
+    """Test incremental inventory syncs and list/get answers served from the inventory."""
+    print("\nTesting background inventory...")
+    import asyncio
+    import json
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+    import scaleway_inventory
+    import scaleway_server
+    from scaleway_cache import get_cache
+    from scaleway_inventory import Inventory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def server(i, modified):
+        return SimpleNamespace(
+            id=f"srv-{i}", name=f"web-{i}", state="running" if i % 2 == 0 else "stopped",
+            commercial_type="GP1-S", tags=[], private_nics=[], arch="x86_64",
+            creation_date=start + timedelta(minutes=i), modification_date=start + timedelta(minutes=modified),
+            public_ip=None, private_ip=None, ipv6=None, bootscript=None, protected=False, volumes={},
+        )
+
+    servers = {f"srv-{i}": server(i, i) for i in range(4)}
+    calls = []
+
+    def list_servers(zone, page=1, per_page=100, order=None, **filters):
+        calls.append(order)
+        items = sorted(servers.values(), key=lambda s: s.modification_date, reverse=True) if order else list(servers.values())
+        return SimpleNamespace(servers=items[(page - 1) * per_page:page * per_page], total_count=len(items))
+
+    api = SimpleNamespace(instance=SimpleNamespace(list_servers=list_servers))
+    inventory = Inventory(["fr-par-3"], [], max_staleness=60)
+    collection = inventory.collections["instance", "fr-par-3"]
+
+    asyncio.run(inventory.sync(api))
+    assert collection.full_syncs == 1 and len(collection.items) == 4 and calls == [None]
+    assert [s.id for s in collection.ordered] == ["srv-3", "srv-2", "srv-1", "srv-0"]
+
+    calls.clear()
+    servers["srv-1"] = server(1, 10)
+    asyncio.run(inventory.sync(api))
+    assert calls == ["modification_date_desc"], calls
+    assert collection.incremental_syncs == 1 and collection.items["srv-1"].modification_date == servers["srv-1"].modification_date
+
+    calls.clear()
+    del servers["srv-2"]
+    asyncio.run(inventory.sync(api))
+    assert calls == ["modification_date_desc", None], calls
+    assert collection.full_syncs == 2 and collection.removed == 1 and "srv-2" not in collection.items
+
+    calls.clear()
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    previous = scaleway_inventory.inventory, scaleway_inventory._configured
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="fr-par-3")
+    scaleway_server.get_api_clients = lambda: api
+    scaleway_inventory.inventory, scaleway_inventory._configured = inventory, True
+    try:
+        listed = asyncio.run(scaleway_server.mcp.call_tool("list_instances", {
+            "state": "running", "format": "json", "fields": ["id"],
+        }))
+        got = asyncio.run(scaleway_server.mcp.call_tool("get_instance", {"instance_id": "srv-1"}))
+        assert calls == [], calls
+
+        get_cache().invalidate("instance:fr-par-3")
+        asyncio.run(scaleway_server.mcp.call_tool("list_instances", {"format": "json"}))
+        assert calls == [None] and inventory.fallbacks == 1
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+        scaleway_inventory.inventory, scaleway_inventory._configured = previous
+
+    payload = json.loads(listed.content[0].text)
+    assert [item["id"] for item in payload["items"]] == ["srv-0"], payload
+    assert payload["staleness_seconds"] < 60 and "as_of" in payload
+    assert "From the background inventory" in got[0].text
+    print(
+        f"✓ Full, incremental and deletion-triggered syncs; {inventory.served} answer(s) served, "
+        f"{inventory.fallbacks} fallback after a write"
+    )
+
+def test_inventory_leader():
+    """Test that only the worker holding the leader lease syncs the inventory with the API."""
+    print("\nTesting inventory leader election...")
+    import asyncio
+    import os
+    import tempfile
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+    import scaleway_cache
+    import scaleway_cache_backends
+    from scaleway_cache import ResponseCache
+    from scaleway_cache_backends import SQLiteBackend
+    from scaleway_filters import FilterPlan
+    from scaleway_inventory import Inventory
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    servers = [
+        SimpleNamespace(id=f"srv-{i}", creation_date=start + timedelta(minutes=i), modification_date=start)
+        for i in range(3)
+    ]
+    calls = []
+
+    def list_servers(zone, page=1, per_page=100, **kwargs):
+        calls.append(zone)
+        return SimpleNamespace(servers=servers[(page - 1) * per_page:page * per_page], total_count=len(servers))
+
+    api = SimpleNamespace(instance=SimpleNamespace(list_servers=list_servers))
+    workers = [Inventory(["fr-par-1"], [], interval=0.05, max_staleness=60) for _ in range(2)]
+    owner, previous = scaleway_cache_backends._owner, scaleway_cache.response_cache
+
+    def as_worker(name):
+        """Stand in for one of two worker processes sharing the backend."""
+        scaleway_cache_backends._owner = lambda: name
+
+    async def run_workers(path):
+        scaleway_cache.response_cache = ResponseCache(max_entries=16, backend=SQLiteBackend(path, 16))
+        leader, follower = workers
+        as_worker("host:1")
+        assert await leader.lead()
+        await leader.sync(api)
+        await leader.publish()
+        as_worker("host:2")
+        assert not await follower.lead()
+        await follower.load()
+        listing = await follower.listing("instance", "fr-par-1", FilterPlan({}), 1, None)
+        # Stepping down on shutdown lets the other worker take over at once
+        as_worker("host:1")
+        await leader.stop()
+        as_worker("host:2")
+        assert await follower.lead()
+        return listing
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            listing = asyncio.run(run_workers(os.path.join(tmp, "cache.sqlite")))
+        finally:
+            scaleway_cache_backends._owner, scaleway_cache.response_cache = owner, previous
+
+    leader, follower = workers
+    assert calls == ["fr-par-1"], calls
+    assert follower.leader and follower.loaded == 1
+    assert [item.id for item in listing.items] == ["srv-2", "srv-1", "srv-0"]
+    print(f"✓ {len(calls)} upstream listing for 2 workers; the follower answered from the published snapshot")
+
+def test_topology_index():
+    """Test network membership and instance/cluster topology answered from one index."""
+    print("\nTesting topology index...")
+    import asyncio
+    from types import SimpleNamespace
+    import scaleway_server
+
+    def nic(i, network):
+        return SimpleNamespace(id=f"nic-{i}", private_network_id=network, mac_address=f"02:00:00:00:00:0{i}", state="available")
+
+    def server(i, zone, networks):
+        return SimpleNamespace(
+            id=f"srv-{i}", name=f"node-{i}", zone=zone, state="running", public_ip=None, private_ip=None,
+            private_nics=[nic(i, network) for network in networks],
+        )
+
+    servers = {"pl-waw-1": [server(1, "pl-waw-1", ["pn-app"]), server(2, "pl-waw-1", ["pn-app", "pn-db"])]}
+    networks = [
+        SimpleNamespace(id="pn-app", name="app", vpc_id="vpc-1", subnets=[SimpleNamespace(subnet="172.16.0.0/22")]),
+        SimpleNamespace(id="pn-db", name="db", vpc_id="vpc-1", subnets=[]),
+    ]
+    clusters = [SimpleNamespace(id="k8s-1", name="prod", status="ready", version="1.30.2", private_network_id="pn-app")]
+    calls = []
+
+    def list_servers(zone, page=1, per_page=100):
+        calls.append(zone)
+        if zone == "pl-waw-2":
+            raise RuntimeError("zone unavailable")
+        return SimpleNamespace(servers=servers.get(zone, []), total_count=len(servers.get(zone, [])))
+
+    def list_private_networks(region, page=1, page_size=100):
+        calls.append("vpc")
+        return SimpleNamespace(private_networks=networks, total_count=len(networks))
+
+    def list_clusters(region, page=1, page_size=100):
+        calls.append("k8s")
+        return SimpleNamespace(clusters=clusters, total_count=len(clusters))
+
+    api = SimpleNamespace(
+        instance=SimpleNamespace(list_servers=list_servers),
+        vpc=SimpleNamespace(list_private_networks=list_private_networks),
+        k8s=SimpleNamespace(list_clusters=list_clusters),
+    )
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_zone="pl-waw-1", default_region="pl-waw")
+    scaleway_server.get_api_clients = lambda: api
+    try:
+        members = asyncio.run(scaleway_server.mcp.call_tool("get_network_members", {"private_network_id": "pn-app", "format": "json"}))
+        listed = sorted(map(str, calls))
+        topology = asyncio.run(scaleway_server.mcp.call_tool("get_instance_topology", {"instance_id": "srv-2"}))
+        cluster = asyncio.run(scaleway_server.mcp.call_tool("get_k8s_cluster_topology", {"cluster_id": "k8s-1", "format": "json"}))
+        missing = asyncio.run(scaleway_server.mcp.call_tool("get_network_members", {"private_network_id": "pn-x"}))
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+
+    payload = members.structuredContent
+    assert [i["id"] for i in payload["instances"]] == ["srv-1", "srv-2"], payload
+    assert payload["instances"][1]["nics"][0]["id"] == "nic-2"
+    assert [c["name"] for c in payload["k8s_clusters"]] == ["prod"]
+    assert payload["errors"] == {"pl-waw-2": "zone unavailable"}
+    assert listed == ["k8s", "pl-waw-1", "pl-waw-2", "vpc"], listed
+    assert len(calls) == len(listed), f"index rebuilt: {calls}"
+
+    text = topology[0].text
+    assert "**app** (ID: pn-app, subnets 172.16.0.0/22)" in text and "**db** (ID: pn-db)" in text
+    assert "node-1" in text and "**prod**" in text
+    assert "Incomplete: listing instances in pl-waw-2 failed" in text
+    assert cluster.structuredContent["private_network"]["name"] == "app"
+    assert len(cluster.structuredContent["instances"]) == 2
+    assert "Private network pn-x not found in region pl-waw" in missing[0].text
+    print(f"✓ 3 topology queries and a miss answered from one index built with {len(calls)} listing(s)")
+
+def test_describe_k8s_cluster():
+    """Test that a cluster, its pools and every node page are fetched concurrently and summarized."""
+    print("\nTesting Kubernetes cluster description...")
+    import asyncio
+    import threading
+    import time
+    from types import SimpleNamespace
+    import scaleway_server
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+    calls = []
+
+    def api_call(name, result):
+        def call(**kwargs):
+            with lock:
+                calls.append((name, kwargs.get("page")))
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return result(**kwargs)
+        return call
+
+    nodes = [
+        SimpleNamespace(
+            id=f"node-{i}", name=f"node-{i}", pool_id="pool-a" if i < 150 else "pool-b",
+            status="not_ready" if i in (3, 160) else "ready", error_message=None,
+            conditions={"Ready": "False", "DiskPressure": "False"} if i in (3, 160) else {"Ready": "True"},
+        )
+        for i in range(250)
+    ]
+    pools = [
+        SimpleNamespace(
+            id="pool-a", name="default", status="ready", node_type="DEV1-M", version="1.30.2", zone="fr-par-1",
+            size=150, autoscaling=True, min_size=50, max_size=150, autohealing=True,
+        ),
+        SimpleNamespace(
+            id="pool-b", name="gpu", status="ready", node_type="GPU-3070-S", version="1.30.2", zone="fr-par-2",
+            size=100, autoscaling=False, min_size=100, max_size=100, autohealing=False,
+        ),
+    ]
+    cluster = SimpleNamespace(
+        id="k8s-deep", name="prod", status="ready", version="1.30.2", type_="kapsule", cni="cilium", region="fr-par",
+    )
+    k8s = SimpleNamespace(
+        get_cluster=api_call("cluster", lambda **kwargs: cluster),
+        list_pools=api_call("pools", lambda page, page_size, **kwargs: SimpleNamespace(pools=pools, total_count=2)),
+        list_nodes=api_call("nodes", lambda page, page_size, **kwargs: SimpleNamespace(
+            nodes=nodes[(page - 1) * page_size:page * page_size], total_count=len(nodes)
+        )),
+    )
+
+    original = scaleway_server.get_scaleway_client, scaleway_server.get_api_clients
+    scaleway_server.get_scaleway_client = lambda: SimpleNamespace(default_region="fr-par")
+    scaleway_server.get_api_clients = lambda: SimpleNamespace(k8s=k8s)
+    try:
+        start = time.perf_counter()
+        result = asyncio.run(scaleway_server.mcp.call_tool(
+            "describe_k8s_cluster", {"cluster_id": "k8s-deep", "format": "json", "fresh": True}
+        ))
+        elapsed = time.perf_counter() - start
+        text = asyncio.run(scaleway_server.mcp.call_tool("describe_k8s_cluster", {"cluster_id": "k8s-deep"}))
+    finally:
+        scaleway_server.get_scaleway_client, scaleway_server.get_api_clients = original
+
+    payload = result.structuredContent
+    assert sorted(calls, key=str) == sorted(
+        [("cluster", None), ("pools", 1), ("nodes", 1), ("nodes", 2), ("nodes", 3)], key=str
+    ), f"unexpected or uncached calls: {calls}"
+    assert active["max"] >= 3, f"at most {active['max']} call(s) in flight"
+    assert payload["node_count"] == 250 and payload["ready_nodes"] == 248 and payload["unhealthy_nodes"] == 2
+    default, gpu = payload["pools"]
+    assert default["nodes"] == 150 and default["node_statuses"] == {"not_ready": 1, "ready": 149}
+    assert [node["id"] for node in gpu["unhealthy_nodes"]] == ["node-160"]
+    assert gpu["unhealthy_nodes"][0]["failing_conditions"] == {"Ready": "False"}
+    assert "Autoscaling: 50-150 nodes (at its maximum)" in text[0].text
+    assert "**node-3** (ID: node-3) - not_ready; Ready=False" in text[0].text
+    print(f"✓ 250 nodes in 2 pools described in {elapsed:.2f}s with up to {active['max']} concurrent API calls")
+
+def test_offline_benchmark():
+    """Test the benchmark suite against the mock Scaleway API, over STDIO."""
+    print("\nTesting offline benchmark suite...")
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+    from mock_api import MockScalewayAPI
+    from suite import ServerUnderTest, run_scenario
+
+    api = MockScalewayAPI(servers=250, clusters=1, nodes_per_cluster=10).start()
+    try:
+        with ServerUnderTest("stdio", api.url, {}, timeout=60) as server:
+            listing = run_scenario(server, api, "list_instances", requests=4, concurrency=2, fresh=True)
+            lookups = run_scenario(server, api, "get_instance", requests=4, concurrency=2)
+            cluster = run_scenario(server, api, "describe_k8s_cluster", requests=4, concurrency=2)
+    finally:
+        api.stop()
+
+    for result in (listing, lookups, cluster):
+        assert result["errors"] == 0, result
+        assert set(result["latency_ms"]) == {"p50", "p90", "p95", "p99", "max"}
+    # 250 servers in pages of 100; every fresh listing fetches them all
+    assert listing["upstream_by_endpoint"] == {"list_servers": 12}, listing["upstream_by_endpoint"]
+    # A different instance on every call, then one cluster served from the cache
+    assert lookups["upstream_by_endpoint"] == {"get_server": 4}, lookups["upstream_by_endpoint"]
+    assert cluster["upstream_calls"] == 0, cluster["upstream_by_endpoint"]
+    print(f"✓ Fresh listing p50 {listing['latency_ms']['p50']}ms, 3 upstream requests per call")
+
+def test_load_test_gate():
+    """Test a short load test run and the baseline comparison."""
+    print("\nTesting load test and regression gate...")
+    import contextlib
+    import io
+    import json
+    import os
+    import sys
+    import tempfile
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+    import loadtest
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "baseline.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = loadtest.main([
+                "run", "--clients", "20", "--duration", "1.5", "--warm-up", "0.5", "--ramp-up", "0.2",
+                "--latency", "0", "--save", path,
+            ])
+            assert status == 0
+            with open(path) as source:
+                baseline = json.load(source)
+            # A run compared with itself passes the gate
+            assert loadtest.main(["compare", path, path]) == 0
+
+    operations = baseline["operations"]
+    for operation in ("initialize", "notifications/initialized", "tools/list", "tools/call:get_instance"):
+        assert operations[operation]["count"] > 0, operation
+    assert operations["all"]["error_rate"] == 0, baseline["error_kinds"]
+    assert set(operations["all"]["latency_ms"]) >= {"p50", "p95", "p99"}
+
+    # Slower beyond the threshold, or failing more often, is a regression; small noise is not
+    def results(p99: float, error_rate: float = 0.0) -> dict:
+        latency = {"p50": 10.0, "p95": 20.0, "p99": p99}
+        return {"operations": {"tools/list": {"error_rate": error_rate, "latency_ms": latency}}}
+
+    assert loadtest.compare(results(30.0), results(31.0)) == []
+    assert loadtest.compare(results(1.0), results(1.5)) == []
+    assert len(loadtest.compare(results(30.0), results(40.0))) == 1
+    assert len(loadtest.compare(results(30.0), results(30.0, error_rate=0.05))) == 1
+    assert loadtest.compare(results(30.0), {"operations": {}}) == ["tools/list: missing from the current run"]
+    print(f"✓ {operations['all']['count']} messages from 20 clients, {baseline['throughput_rps']} req/s; gate flags regressions")
+
+def test_async_http_transport():
+    """Test that served SDK methods run on the event loop over httpx and return the SDK's models."""
+    print("\nTesting async HTTP transport...")
+    import asyncio
+    import functools
+    import os
+    import sys
+    from scaleway import Client, ScalewayException
+    from scaleway.instance.v1 import InstanceV1API
+    import scaleway_ratelimit
+    from scaleway_async_http import AsyncAPI, AsyncTransport
+    from scaleway_executor import executor_stats, run_blocking
+    from scaleway_pagination import fetch_listing
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+    from mock_api import MockScalewayAPI, server_id
+
+    api = MockScalewayAPI(servers=250, latency=0.05).start()
+    client = Client(
+        access_key="SCWXXXXXXXXXXXXXXXXX", secret_key="00000000-0000-0000-0000-000000000000",
+        api_url=api.url, default_zone="fr-par-1",
+    )
+    sync_api = InstanceV1API(client)
+    transport = AsyncTransport(max_connections=16, http2=False)
+    async_api = AsyncAPI(sync_api, transport)
+    previous = scaleway_ratelimit.upstream_limiter
+    scaleway_ratelimit.upstream_limiter = scaleway_ratelimit.UpstreamLimiter(rates={"instance": 0})
+
+    async def scenario():
+        before = executor_stats()
+        servers = await asyncio.gather(*(
+            run_blocking(async_api.get_server, zone="fr-par-1", server_id=server_id(i)) for i in range(200)
+        ))
+        after = executor_stats()
+        listing = await fetch_listing(
+            functools.partial(async_api.list_servers, zone="fr-par-1"), "servers",
+            target="fr-par-1", size_param="per_page",
+        )
+        try:
+            await run_blocking(async_api.get_server, zone="fr-par-1", server_id=server_id(999))
+            missing = None
+        except ScalewayException as e:
+            missing = e
+        await transport.aclose()
+        return servers, before, after, listing, missing
+
+    try:
+        servers, before, after, listing, missing = asyncio.run(scenario())
+        expected = sync_api.get_server(zone="fr-par-1", server_id=server_id(7))
+    finally:
+        scaleway_ratelimit.upstream_limiter = previous
+        api.stop()
+
+    assert servers[7] == expected, "async and sync paths returned different models"
+    assert {result.server.id for result in servers} == {server_id(i) for i in range(200)}
+    # No worker thread was involved, and the calls overlapped on the event loop
+    assert after["completed"] == before["completed"] and after["awaited"] - before["awaited"] == 200
+    assert transport.peak_in_flight == 200, transport.stats()
+    assert len(listing.items) == 250 and listing.items[0].id == server_id(0)
+    assert missing is not None and missing.status_code == 404
+    assert async_api.get_server.__name__ == "get_server" and async_api.list_server_actions == sync_api.list_server_actions
+    print(f"✓ 200 concurrent get_server calls on the event loop, peak {transport.peak_in_flight} in flight")
+
+def run_test(test):
+    """Run one test: it fails by returning False or by raising (assert-based tests)."""
+    try:
+        return test() is not False
+    except Exception as e:
+        print(f"✗ {test.__name__} failed: {e!r}")
+        return False
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -72,11 +1723,42 @@ def main():
         test_imports,
         test_server_initialization,
         test_client_initialization,
+        test_executor_offloading,
+        test_zone_fan_out,
+        test_pagination,
+        test_response_cache,
+        test_single_flight,
+        test_client_reuse,
+        test_jsonrpc_batch,
+        test_streamable_http_progress,
+        test_state_waiter,
+        test_waiter_state_validation,
+        test_bulk_actions,
+        test_bulk_wait_outside_cap,
+        test_rate_limiter,
+        test_gateway_errors_not_retried_for_posts,
+        test_metrics,
+        test_request_timing,
+        test_structured_output,
+        test_ndjson_streaming,
+        test_filter_pushdown,
+        test_paged_local_filter,
+        test_tool_catalog,
+        test_cold_start_imports,
+        test_shared_cache_backends,
+        test_shared_cache_codec,
+        test_background_inventory,
+        test_inventory_leader,
+        test_topology_index,
+        test_describe_k8s_cluster,
+        test_offline_benchmark,
+        test_load_test_gate,
+        test_async_http_transport,
     ]
     
     results = []
     for test in tests:
-        results.append(test())
+        results.append(run_test(test))
     
     print("\n" + "=" * 60)
     print("Test Results")